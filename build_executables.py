@@ -74,7 +74,6 @@ excludes = [
             "pillow",
             "pil",
             "PyQt4",
-            "multiprocessing",
             "bz2",
             "coverage",
             "zmq",
@@ -109,7 +108,7 @@ build_exe_opts = {
 # ---------------------------------------------------------------------------
 ### Executable Definitions
 # ---------------------------------------------------------------------------
-file_to_build = "owt_wm_view\\owt_wafer_map_viewer.py"
+file_to_build = "owt_wm_view\\cli.py"
 
 # Application Base
 base = None
@@ -7,10 +7,13 @@ View wafer map files for the OWT program. Also plots histograms by radius.
 
 """
 ### Imports #################################################################
+import atexit
+import collections
 import datetime
 import os.path
 import logging
-from logging.handlers import TimedRotatingFileHandler as TRFHandler
+import queue
+import threading
 
 ### Constants ###############################################################
 __version__ = "0.2.0"
@@ -20,17 +23,65 @@ __description__ = "Wafer Map Viewer and Editor for the Transphorm OWT program."
 __long_descr__ = __doc__
 __released__ = "2015-11-13"
 
-LOG_LEVEL_BASE = logging.DEBUG
-LOG_LEVEL_FILE = LOG_LEVEL_BASE
+LOG_LEVEL_BASE = logging.INFO
+LOG_LEVEL_FILE = LOG_LEVEL_BASE     # DEBUG if $OWT_LOG_DEBUG is set
 LOG_LEVEL_CONSOLE = LOG_LEVEL_BASE
 LOG_LEVEL_GUI = LOG_LEVEL_BASE
+LOG_RING_SIZE = 2000                # lines kept for the in-app log viewer
 
+_log_listener = None
+_ring_handler = None
 
-def _setup_logging():
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the last ``capacity`` formatted log lines in memory.
+
+    Used by the GUI to show recent log messages without reading the
+    log file.
+    """
+    def __init__(self, capacity=LOG_RING_SIZE):
+        logging.Handler.__init__(self)
+        self.lines = collections.deque(maxlen=capacity)
+        self._lines_lock = threading.Lock()
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._lines_lock:
+            self.lines.append(line)
+
+    def get_lines(self):
+        """ Returns a copy of the buffered lines, oldest first """
+        with self._lines_lock:
+            return list(self.lines)
+
+
+def get_ring_buffer():
+    """ Returns the RingBufferHandler, or None if logging isn't set up """
+    return _ring_handler
+
+
+def setup_logging():
     """
     Set up logging for the entire package.
 
-    Log strings are sent to both the console and a log file.
+    Called by the GUI module. Importing the package (for example just for
+    ``owt_wm_view.core``) doesn't touch logging. Calling it again does
+    nothing.
+
+    Log strings are sent to the console, a log file and an in-memory ring
+    buffer (for the GUI log viewer). Everything logs at INFO and above,
+    except that the file also gets DEBUG messages if the environment
+    variable OWT_LOG_DEBUG is set (to anything but "" or "0").
+
+    The only handler on the root logger is a QueueHandler. It merges the
+    message and its arguments (``msg % args``) on the calling thread and
+    puts the record on a queue; a QueueListener thread then runs the
+    Formatters and does the writing.
 
     The file is a TimedRotatingFileHandler set up to create a new log file
     every Sunday at midnight. This should keep the log files small-ish
@@ -96,9 +147,24 @@ def _setup_logging():
               )
     datefmt = "%Y-%m-%d %H:%M:%S"
 
+    global _log_listener, _ring_handler
+
+    if _log_listener is not None:
+        return
+
+    # Imported here so that importing the package stays cheap.
+    from logging.handlers import TimedRotatingFileHandler as TRFHandler
+    from logging.handlers import QueueHandler, QueueListener
+
+    file_level = LOG_LEVEL_FILE
+    if os.environ.get("OWT_LOG_DEBUG", "0") not in ("", "0"):
+        file_level = logging.DEBUG
+
     # Create the logger
     logger = logging.getLogger()
-    logger.setLevel(LOG_LEVEL_CONSOLE)
+    logger.setLevel(min(LOG_LEVEL_CONSOLE, file_level, LOG_LEVEL_GUI))
+
+    handlers = []
 
     ### Console Handler #####################################################
     handler = logging.StreamHandler()
@@ -106,9 +172,16 @@ def _setup_logging():
     formatter = logging.Formatter(logfmt, datefmt)
     handler.setFormatter(formatter)
     handler.set_name("Console Handler")
-    logger.addHandler(handler)
+    handlers.append(handler)
 
-    logging.info("Console logging initialized")
+    ### Ring Buffer Handler #################################################
+    handler = RingBufferHandler()
+    handler.setLevel(LOG_LEVEL_GUI)
+    formatter = logging.Formatter(logfmt, datefmt)
+    handler.setFormatter(formatter)
+    handler.set_name("Ring Buffer Handler")
+    handlers.append(handler)
+    _ring_handler = handler
 
 
     ### File Handler ########################################################
@@ -144,13 +217,24 @@ def _setup_logging():
                          atTime=rollover_time,
                          #delay=True,
                          )
-    handler.setLevel(LOG_LEVEL_FILE)
+    handler.setLevel(file_level)
     formatter = logging.Formatter(logfmt, datefmt)
     handler.setFormatter(formatter)
     handler.set_name("File Handler")
+    handlers.append(handler)
+
+    ### Queue Handler #######################################################
+    # Everything above is run by the listener thread.
+    log_queue = queue.Queue(-1)
+    handler = QueueHandler(log_queue)
+    handler.set_name("Queue Handler")
     logger.addHandler(handler)
 
-    logging.info("File logging initialized")
+    _log_listener = QueueListener(log_queue,
+                                  *handlers,
+                                  respect_handler_level=True,
+                                  )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 
-### Module Executions #######################################################
-_setup_logging()
+    logging.info("Logging initialized")
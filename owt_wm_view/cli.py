@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          cli.py
+@created:       Mon Oct 19 12:31:06 2026
+
+Usage:
+    cli.py
+    cli.py validate [--jobs=N] [--output=FILE] [<root>...]
+    cli.py serve [--host=HOST] [--port=PORT] [--workers=N]
+    cli.py export [--full] [--no-sync] <file>
+    cli.py library [--budget=MB] [--no-sync]
+
+Options:
+    -h --help           # Show this screen.
+    --version           # Show version.
+    --jobs=N            # Number of worker processes. Default is CPU count.
+    --output=FILE       # Write the report to FILE instead of stdout.
+    --host=HOST         # Address to serve on [default: 127.0.0.1].
+    --port=PORT         # Port to serve on [default: 8050].
+    --workers=N         # Request handler threads [default: 8].
+    --full              # Re-read every mask instead of only changed ones.
+    --no-sync           # Use the mirrored masks without syncing them first.
+    --budget=MB         # RAM budget for the loaded library, in MB.
+
+Description:
+    Entry point of the OWT Wafer Map Viewer. With no command, the GUI
+    (``owt_wafer_map_viewer``) is started. The commands don't need wx;
+    the GUI module, and with it wx, is only imported to run the GUI.
+
+    validate            Headless check of every mask file under the mask
+                        roots (or the given <root> directories). Writes a
+                        JSON report and exits non-zero if any file fails.
+
+    serve               Serves masks, maps, die lists (JSON) and rendered
+                        map PNGs over HTTP. See server.py for the routes.
+
+    export              Writes every die of every map in the mask library
+                        to a columnar die table <file>. The mirror is
+                        synced first; only masks that changed since the
+                        last export are re-read. See die_table.py for the
+                        format and reader.
+
+    library             Syncs the mirror, then loads every mask in compact
+                        form, up to a RAM budget (default
+                        $OWT_LIBRARY_BUDGET_MB or 512), and prints a
+                        JSON memory report per mask. Exits non-zero if
+                        any mask wasn't loaded.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import multiprocessing
+import sys
+
+# Third-Party
+from docopt import docopt
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import compact
+    from . import die_table
+    from . import mask_validator
+    from . import server
+    from . import (__version__,
+                   setup_logging,
+                   )
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import compact
+        import die_table
+        import mask_validator
+        import server
+        from __init__ import (__version__,
+                              setup_logging,
+                              )
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import compact
+        from owt_wm_view import die_table
+        from owt_wm_view import mask_validator
+        from owt_wm_view import server
+        from owt_wm_view import (__version__,
+                                 setup_logging,
+                                 )
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def run_gui():
+    """ Imports the GUI module (and wx) and runs the GUI """
+    try:
+        from . import owt_wafer_map_viewer
+    except SystemError:
+        try:
+            import owt_wafer_map_viewer
+        except ImportError:
+            from owt_wm_view import owt_wafer_map_viewer
+    owt_wafer_map_viewer.main()
+
+
+def main():
+    """ Main Code """
+    args = docopt(__doc__, version=__version__)
+    setup_logging()
+    if args['validate']:
+        jobs = int(args['--jobs']) if args['--jobs'] else None
+        sys.exit(mask_validator.main(args['<root>'], jobs, args['--output']))
+    if args['export']:
+        sys.exit(die_table.main(args['<file>'], args['--full'],
+                                not args['--no-sync']))
+    if args['library']:
+        budget = float(args['--budget']) if args['--budget'] else None
+        sys.exit(compact.main(budget, not args['--no-sync']))
+    if args['serve']:
+        server.serve(args['--host'], int(args['--port']),
+                     int(args['--workers']))
+        return
+    run_gui()
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()        # for the cx_freeze executable
+    main()
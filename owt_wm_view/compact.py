@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          compact.py
+@created:       Thu Oct 22 09:47:12 2026
+
+Description:
+    Compact, read-only storage of masks for library-wide analysis.
+
+    A ``core.Mask`` keeps every map as a list of (row, col) int tuples,
+    about 120 bytes per die. Here each map is a bit-packed bool grid
+    (one bit per grid position) in a ``__slots__`` object, and the
+    [Mask] and [Devices] headers are stored with interned strings, so the
+    keys and the common values are shared by every mask in the library.
+
+    Maps are decoded from the file straight into grids; the tuple lists
+    are never built.
+
+    ``load_library`` loads every mask in the mirror, in compact form,
+    until a RAM budget is reached. ``memory_report`` sizes a ``Mask`` or a
+    ``CompactMask``, so the two can be compared.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import json
+import logging
+import os
+import sys
+import time
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import core
+    from . import mask_mirror
+    from . import mask_reader
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import core
+        import mask_mirror
+        import mask_reader
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import core
+        from owt_wm_view import mask_mirror
+        from owt_wm_view import mask_reader
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+DEFAULT_BUDGET_MB = 512
+MB = 1024 * 1024
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class CompactMap(object):
+    """
+    One map as a bit-packed bool grid.
+
+    Parameters:
+    -----------
+    grid : (rows, cols) bool array
+        The die in the map, indexed ``[row - 1, col - 1]``.
+    """
+    __slots__ = ("shape", "count", "bits")
+
+    def __init__(self, grid):
+        grid = np.asarray(grid, dtype=bool)
+        self.shape = grid.shape
+        self.count = int(np.count_nonzero(grid))
+        self.bits = np.packbits(grid, axis=None)
+
+    def __len__(self):
+        return self.count
+
+    @classmethod
+    def from_exclusions(cls, pairs, shape=None):
+        """
+        Builds a map from an (n, 2) array of excluded (row, col) pairs.
+
+        Same rules as ``mask_reader.exclusion_grid``.
+        """
+        return cls(mask_reader.exclusion_grid(pairs, shape))
+
+    @classmethod
+    def from_rc(cls, rc_list):
+        """ Builds a map from a list of (row, col) tuples """
+        rc = np.asarray(rc_list, dtype=np.intp).reshape(-1, 2)
+        rc = rc[(rc[:, 0] >= 1) & (rc[:, 1] >= 1)]
+        if not rc.size:
+            return cls(np.zeros((0, 0), dtype=bool))
+        grid = np.zeros(rc.max(axis=0), dtype=bool)
+        grid[rc[:, 0] - 1, rc[:, 1] - 1] = True
+        return cls(grid)
+
+    @property
+    def nbytes(self):
+        """ Bytes used by the packed grid """
+        return self.bits.nbytes
+
+    def grid(self, rows=None, cols=None):
+        """
+        Returns the unpacked bool grid.
+
+        If given, the grid is cropped or zero-padded to ``rows`` x
+        ``cols``.
+        """
+        n_rows, n_cols = self.shape
+        grid = np.unpackbits(self.bits, count=n_rows * n_cols)
+        grid = grid.view(bool).reshape(self.shape)
+        if rows is None and cols is None:
+            return grid
+        rows = n_rows if rows is None else rows
+        cols = n_cols if cols is None else cols
+        result = np.zeros((rows, cols), dtype=bool)
+        keep_r = min(rows, n_rows)
+        keep_c = min(cols, n_cols)
+        result[:keep_r, :keep_c] = grid[:keep_r, :keep_c]
+        return result
+
+    def rc_list(self):
+        """ Returns the sorted (row, col) tuples, like ``Mask.maps`` """
+        rows, cols = np.nonzero(self.grid())
+        return list(zip((rows + 1).tolist(), (cols + 1).tolist()))
+
+
+class PackedMask(core.Mask):
+    """
+    A ``core.Mask`` that decodes each map into a ``CompactMap``.
+
+    Only used while loading; see ``CompactMask.load``.
+    """
+    def _decode_map(self, buf, shape):
+        return CompactMap.from_exclusions(mask_reader.decode_map_buffer(buf),
+                                          shape)
+
+
+class CompactMask(object):
+    """
+    A read-only mask with bit-packed maps and interned headers.
+
+    Build one with ``load`` (from the mask file) or ``from_mask`` (from a
+    loaded ``core.Mask``). The geometry attributes have the same names
+    and values as on ``core.Mask``; maps are read with ``grid``,
+    ``rc_list`` or ``stack``.
+    """
+    __slots__ = ("mask", "mask_info", "devices", "dia", "die_xy",
+                 "center_xy", "flat_loc", "row_count", "col_count",
+                 "home_row", "home_col", "start_row", "start_col",
+                 "map_names", "maps")
+
+    @classmethod
+    def load(cls, mask, mask_class=PackedMask):
+        """ Reads a mask file straight into compact form """
+        return cls.from_mask(mask_class(mask))
+
+    @classmethod
+    def from_mask(cls, mask):
+        """
+        Converts a loaded mask.
+
+        Maps may be lists of (row, col) tuples (``core.Mask``) or
+        ``CompactMap`` objects (``PackedMask``).
+        """
+        self = cls.__new__(cls)
+        self.mask = sys.intern(mask.mask)
+        self.mask_info = _intern_dict(mask.mask_info)
+        self.devices = _intern_dict(mask.devices)
+        self.dia = mask.dia
+        self.die_xy = mask.die_xy
+        self.center_xy = mask.center_xy
+        self.flat_loc = mask.flat_loc
+        for name in ("row_count", "col_count", "home_row", "home_col",
+                     "start_row", "start_col"):
+            setattr(self, name, sys.intern(str(getattr(mask, name))))
+        self.map_names = tuple(sys.intern(_n) for _n in mask.map_names)
+        self.maps = {}
+        for name in self.map_names:
+            value = mask.maps[name]
+            if not isinstance(value, CompactMap):
+                value = CompactMap.from_rc(value)
+            self.maps[name] = value
+        return self
+
+    @property
+    def mask_info_names(self):
+        return sorted(self.mask_info.keys())
+
+    @property
+    def device_names(self):
+        return sorted(self.devices.keys())
+
+    def grid(self, name):
+        """ Returns one map as a (Rows, Cols) bool grid """
+        return self.maps[name].grid(int(self.row_count), int(self.col_count))
+
+    def rc_list(self, name):
+        """ Returns one map as (row, col) tuples, like ``Mask.maps`` """
+        return self.maps[name].rc_list()
+
+    def stack(self, names=None):
+        """
+        Returns maps as a (n_maps, Rows, Cols) bool array.
+
+        Same layout as ``map_summary.map_stack``. Defaults to every map.
+        """
+        names = self.map_names if names is None else names
+        rows = int(self.row_count)
+        cols = int(self.col_count)
+        stack = np.zeros((len(names), rows, cols), dtype=bool)
+        for layer, name in enumerate(names):
+            stack[layer] = self.maps[name].grid(rows, cols)
+        return stack
+
+    def die_count(self):
+        """ Returns the total number of die over every map """
+        return sum(len(_m) for _m in self.maps.values())
+
+
+class MaskLibrary(object):
+    """
+    Every mask of the library that fit in the budget, in compact form.
+
+    Attributes:
+    -----------
+    masks : dict of {str: CompactMask}
+    skipped : list of str
+        Masks that weren't loaded because the budget was reached.
+    failed : list of str
+        Masks that couldn't be read.
+    nbytes : int
+        Memory used by ``masks``; shared strings are counted once.
+    budget : int
+        The budget, in bytes.
+    """
+    def __init__(self, budget):
+        self.masks = {}
+        self.skipped = []
+        self.failed = []
+        self.nbytes = 0
+        self.budget = budget
+        self._sizes = {}
+        self._seen = set()
+
+    def __len__(self):
+        return len(self.masks)
+
+    def __getitem__(self, name):
+        return self.masks[name]
+
+    def add(self, mask):
+        """
+        Adds a CompactMask if it fits in the budget.
+
+        Returns:
+        --------
+        added : bool
+        """
+        seen = set()
+        size = deep_sizeof(mask, seen, known=self._seen)
+        if self.nbytes + size > self.budget:
+            return False
+        self._seen |= seen
+        self.masks[mask.mask] = mask
+        self._sizes[mask.mask] = size
+        self.nbytes += size
+        return True
+
+    def report(self):
+        """ Returns a list of per-mask dicts, plus the library totals """
+        masks = []
+        for name, mask in self.masks.items():
+            masks.append({"name": name,
+                          "maps": len(mask.map_names),
+                          "die": mask.die_count(),
+                          "bytes": self._sizes[name],
+                          })
+        return {"masks": masks,
+                "loaded": len(self.masks),
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "bytes": self.nbytes,
+                "budget": self.budget,
+                }
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def _intern_dict(dictionary):
+    """ Copies a dict of strings, interning keys and string values """
+    return {sys.intern(_k): sys.intern(_v) if isinstance(_v, str) else _v
+            for _k, _v in dictionary.items()}
+
+
+def deep_sizeof(obj, seen=None, known=()):
+    """
+    Returns the memory used by an object and everything it contains.
+
+    Follows dicts, lists, tuples, sets, the attributes of masks and
+    compact maps; numpy arrays count their data. Objects whose id is
+    already in ``seen`` are skipped, so sharing a ``seen`` set across
+    calls counts shared (e.g. interned) objects once. Ids in ``known``
+    are skipped too, but ``known`` isn't changed.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    todo = [obj]
+    while todo:
+        item = todo.pop()
+        if id(item) in seen or id(item) in known:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            todo.extend(item.keys())
+            todo.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            todo.extend(item)
+        elif isinstance(item, (CompactMap, CompactMask)):
+            todo.extend(getattr(item, _s) for _s in item.__slots__)
+        elif isinstance(item, core.Mask):
+            todo.append(vars(item))
+    return total
+
+
+def memory_report(mask):
+    """
+    Returns the memory used by a mask, in bytes, by part.
+
+    Works for ``core.Mask`` and ``CompactMask``. Objects shared between
+    parts are counted in the first part only.
+
+    Returns:
+    --------
+    report : dict
+        ``maps``, ``info`` (the [Mask] header), ``devices``, ``other``
+        (the mask object and its remaining attributes) and ``total``.
+    """
+    seen = set()
+    parts = (("maps", (mask.maps, mask.map_names)),
+             ("info", (mask.mask_info, mask.mask_info_names)),
+             ("devices", (mask.devices, mask.device_names)),
+             )
+    report = {}
+    for part, objs in parts:
+        report[part] = sum(deep_sizeof(_o, seen) for _o in objs)
+    report["other"] = deep_sizeof(mask, seen)
+    report["total"] = sum(report.values())
+    return report
+
+
+def library_budget():
+    """ Returns the configured library budget in MB """
+    try:
+        return float(os.environ.get("OWT_LIBRARY_BUDGET_MB",
+                                    DEFAULT_BUDGET_MB))
+    except ValueError:
+        return DEFAULT_BUDGET_MB
+
+
+def load_library(budget_mb=None, masks=None, mirror=None,
+                 mask_class=PackedMask, progress=None, cancel=None):
+    """
+    Loads the mask library in compact form, up to a memory budget.
+
+    Masks are loaded in name order. When the next mask doesn't fit, it and
+    every mask after it are listed in ``skipped``. Only one mask is ever
+    held in full (``mask_class``) form, so peak memory is the budget plus
+    one mask.
+
+    Parameters:
+    -----------
+    budget_mb : float, optional
+        Defaults to ``library_budget()``.
+    masks : list of str, optional
+        Mask names to load. Defaults to every mask in the mirror.
+    mirror : MaskMirror, optional
+        Defaults to ``mask_mirror.get_mirror()``.
+    mask_class : class
+        Used to read each mask; see ``CompactMask.load``.
+    progress : callable, optional
+        Called as ``progress(done, total)`` after each mask, including
+        masks that fail to load; ``done`` reaches ``total`` even if the
+        budget stops loading early.
+    cancel : threading.Event, optional
+        If set, loading stops with ``core.LoadCancelled``.
+
+    Returns:
+    --------
+    library : MaskLibrary
+    """
+    if budget_mb is None:
+        budget_mb = library_budget()
+    if masks is None:
+        mirror = mirror or mask_mirror.get_mirror()
+        masks = mirror.list_masks()
+    library = MaskLibrary(int(budget_mb * MB))
+
+    for n, name in enumerate(masks):
+        if cancel is not None and cancel.is_set():
+            raise core.LoadCancelled()
+        try:
+            mask = CompactMask.load(name, mask_class)
+        except Exception as err:
+            logging.error("Unable to load mask %s: %s", name, err)
+            library.failed.append(name)
+        else:
+            if not library.add(mask):
+                library.skipped = list(masks[n:])
+                logging.warning("Library budget of %g MB reached; %d masks "
+                                "not loaded", budget_mb, len(library.skipped))
+                if progress is not None:
+                    progress(len(masks), len(masks))
+                break
+        if progress is not None:
+            progress(n + 1, len(masks))
+
+    logging.info("Loaded %d masks in %.1f MB", len(library),
+                 library.nbytes / MB)
+    return library
+
+
+def main(budget_mb=None, sync=True):
+    """
+    Loads the library from the command line and prints its report.
+
+    The mirror is synced with the mask roots first, unless ``sync`` is
+    False. If the roots are unreachable the mirrored copies are loaded.
+
+    Returns:
+    --------
+    exit_code : int
+        0 if every mask was loaded, 1 otherwise.
+    """
+    start = time.time()
+    if sync:
+        mask_mirror.get_mirror().sync()
+    library = load_library(budget_mb)
+    report = library.report()
+    report["elapsed_s"] = round(time.time() - start, 3)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 1 if library.skipped or library.failed else 0
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          core.py
+@created:       Tue Oct 20 16:40:19 2026
+
+Description:
+    The GUI-independent mask and map model.
+
+    Everything needed to read, edit and write OWT mask files without wx,
+    for scripts, batch jobs and the map server. The GUI in
+    ``owt_wafer_map_viewer`` is built on top of this module.
+
+    Public API::
+
+        Mask                    a mask file: info, maps, devices
+        LoadCancelled           raised when a Mask load is cancelled
+        convert_map_list        OWT map string -> inclusion list
+        invert_wafer_map        exclusion list <-> inclusion list
+        format_map_list         inclusion list -> OWT map string
+        dictpop
+        xyd_dict_to_xyd_tuple
+
+    Grid geometry lives in ``geometry``; this module and its imports
+    don't load wx.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import configparser
+import logging
+import os.path as osp
+
+# Third-Party
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import mask_constants
+    from . import mask_mirror
+    from . import mask_reader
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import mask_constants
+        import mask_mirror
+        import mask_reader
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import mask_constants
+        from owt_wm_view import mask_mirror
+        from owt_wm_view import mask_reader
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+__all__ = ["Mask",
+           "LoadCancelled",
+           "convert_map_list",
+           "invert_wafer_map",
+           "format_map_list",
+           "dictpop",
+           "xyd_dict_to_xyd_tuple",
+           ]
+
+MAP_INFO_KEYS = ("Rows", "Cols", "Home Row", "Home Col",
+                 "Start Row", "Start Col")
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class LoadCancelled(Exception):
+    """ Raised inside a load when it has been cancelled """
+    pass
+
+
+# TODO: too many attributes
+class Mask(object):
+    """
+    Upon init, reads an OWT mask file and stores things to memory.
+
+    ``progress``, if given, is called as ``progress(done, total)`` while the
+    maps are decoded. If ``cancel`` (a threading.Event) gets set, reading
+    stops with LoadCancelled.
+    """
+    def __init__(self, mask, progress=None, cancel=None):
+        self.mask = mask
+        self.progress = progress
+        self.cancel = cancel
+        self.mask_filename = self.mask + ".ini"
+        # All reads go through the local mirror of the mask roots.
+        self.mask_file = mask_mirror.get_mirror().path_for(self.mask_filename)
+        self.mask_path = osp.dirname(self.mask_file)
+        self.mask_info = None
+        self.mask_info_names = None
+        self.maps = None
+        self.map_names = None
+        self.devices = None
+        self.device_names = None
+
+        self.read_mask_file()
+
+    @classmethod
+    def placeholder(cls, die_xy, center_xy, dia, rows, cols):
+        """
+        Returns a Mask with no maps that isn't read from any file.
+
+        The GUI shows this until the user picks a mask, so starting up
+        never touches the mirror or the mask roots.
+        """
+        mask = cls.__new__(cls)
+        mask.mask = ""
+        mask.progress = None
+        mask.cancel = None
+        mask.mask_filename = ""
+        mask.mask_file = None
+        mask.mask_path = None
+        mask.mask_info = {}
+        mask.mask_info_names = []
+        mask.die_x, mask.die_y = die_xy
+        mask.die_xy = tuple(die_xy)
+        mask.flat_loc = 0
+        mask.center_xy = tuple(center_xy)
+        mask.dia = dia
+        mask.row_count = str(rows)
+        mask.col_count = str(cols)
+        mask.home_row = mask.home_col = "1"
+        mask.start_row = mask.start_col = "1"
+        mask.maps = {}
+        mask.map_names = []
+        mask.devices = {}
+        mask.device_names = []
+        return mask
+
+    def read_mask_file(self):
+        """
+        Reads the wafer maps from the 150mm section.
+
+        The file is scanned once by MaskFileReader; map values are decoded
+        straight from the file buffer.
+        """
+        with mask_reader.MaskFileReader(self.mask_file) as reader:
+            self._extract_mask_info(reader.items("Mask"))
+
+            # Try all of the wafer diameters. I only want the biggest size.
+            args = ["150mm", "100mm", "50mm"]
+            for arg in args:
+                if reader.has_section(arg):
+                    self._extract_maps(reader, arg)
+                    self.dia = int(arg[:-2])
+                    break
+            else:
+                error_txt = "Why are there no sections?"
+                raise configparser.NoSectionError(error_txt)
+
+            self.devices = dict(reader.items("Devices"))
+        self.device_names = sorted(self.devices.keys())
+
+    def _extract_mask_info(self, mask_info):
+        """ Extracts mask_info items from the list return by parser """
+        self.mask_info = dict(mask_info)
+        self.mask_info_names = sorted(self.mask_info.keys())
+        self.die_x = float(self.mask_info["Die X"])
+        self.die_y = float(self.mask_info["Die Y"])
+        self.die_xy = (self.die_x, self.die_y)
+        self.flat_loc = int(self.mask_info["Flat"])
+        mask_enum = mask_constants.lookup(self.mask_info['Mask'][1:-1])
+        self.center_xy = mask_enum.center_xy
+        logging.debug("Center XY: %s", self.center_xy)
+
+    def _extract_maps(self, reader, section):
+        """
+        Removes the unnecessary map info from the "150mm" section. This info
+        is the Rows, Cols, Home Row, Home Col, Start Row, Start Col. These
+        items are saved for posterity; Start Row and Start Col are where
+        the probe path begins.
+
+        Every other key is a map, decoded from its buffer in the file. Maps
+        are exclusion lists over Rows x Cols.
+        """
+        self.row_count = reader.get(section, "Rows")
+        self.col_count = reader.get(section, "Cols")
+        self.home_row = reader.get(section, "Home Row")
+        self.home_col = reader.get(section, "Home Col")
+        self.start_row = reader.get(section, "Start Row")
+        self.start_col = reader.get(section, "Start Col")
+        self.map_names = sorted(_k for _k in reader.keys(section)
+                                if _k not in MAP_INFO_KEYS)
+
+        shape = (int(self.row_count), int(self.col_count))
+        self.maps = {}
+        total = len(self.map_names)
+        for n, key in enumerate(self.map_names, 1):
+            if self.cancel is not None and self.cancel.is_set():
+                raise LoadCancelled()
+            buf = reader.buffer(section, key)
+            try:
+                self.maps[key] = self._decode_map(buf, shape)
+            finally:
+                buf.release()
+            if self.progress is not None:
+                self.progress(n, total)
+
+    def _decode_map(self, buf, shape):
+        """ Decodes one map value into a list of (row, col) tuples """
+        return mask_reader.convert_map_buffer(buf, shape)
+
+    def add_map(self, name, rc_list):
+        """
+        Adds (or replaces) a map.
+
+        ``rc_list`` is a list of (row, col) tuples, the same as the values
+        in ``self.maps``.
+        """
+        self.maps[name] = sorted(rc_list)
+        self.map_names = sorted(self.maps.keys())
+
+    def write_mask_file(self, filename):
+        """
+        Writes the mask, including any added maps, as an OWT mask file.
+
+        Maps are written back as exclusion lists over Rows x Cols.
+        """
+        rows = int(self.row_count)
+        cols = int(self.col_count)
+
+        parser = configparser.RawConfigParser()
+        parser.optionxform = str        # Make keys Case-sensitive
+        parser["Mask"] = self.mask_info
+
+        section = "{}mm".format(self.dia)
+        parser.add_section(section)
+        parser.set(section, "Rows", self.row_count)
+        parser.set(section, "Cols", self.col_count)
+        parser.set(section, "Home Row", self.home_row)
+        parser.set(section, "Home Col", self.home_col)
+        parser.set(section, "Start Row", self.start_row)
+        parser.set(section, "Start Col", self.start_col)
+        for name in self.map_names:
+            parser.set(section, name,
+                       format_map_list(self.maps[name], rows, cols))
+
+        parser["Devices"] = self.devices
+
+        with open(filename, 'w') as openf:
+            parser.write(openf)
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def invert_wafer_map(xy_list):
+    """
+    Inverts a wafer map (list of (x, y) coordinate pairs).
+
+    Needed because the OWT files use an exclusion list while everything else
+    uses an *inclusion* list.
+    """
+    # First, find the max X and Y coordinates. The grid always starts at 1.
+    max_x = max([_x for _x, _y in xy_list])
+    max_y = max([_y for _x, _y in xy_list])
+
+    # Then create two lists for all possible points
+    all_x = range(1, max_x + 1)
+    all_y = range(1, max_y + 1)
+    all_xy = {(_x, _y) for _y in all_y for _x in all_x}     # Note it's a set
+
+    # now make our original xy_list into a set and subtract it from all_xy
+    inverted = list(all_xy - set(xy_list))
+    return inverted
+
+
+def convert_map_list(string):
+    """
+    Converts a map string to a list of (X, Y) coord pairs.
+
+    The string looks like
+    "1,1; 1,2; 1,3; 1,4; 1,5; 1,6; 1,7; 1,8; 1,9; 1,10"
+    """
+    xy_list = []
+    for pair in string[1:-1].split("; "):
+        try:
+            xy_list.append(tuple(map(int, pair.split(","))))
+        except ValueError:
+            logging.error("Can't convert '%s'", pair)
+            raise
+
+    return invert_wafer_map(xy_list)
+
+
+def format_map_list(rc_list, rows, cols):
+    """
+    Converts a list of (row, col) pairs to an OWT map string.
+
+    The OWT files store an exclusion list, so every grid location in
+    Rows x Cols *not* in ``rc_list`` is written. The result is read back
+    by ``mask_reader.convert_map_buffer`` given the same (Rows, Cols);
+    ``convert_map_list`` doesn't know Rows x Cols and loses die past the
+    last excluded row or column.
+    """
+    included = set(rc_list)
+    excluded = ["{},{}".format(_r, _c)
+                for _r in range(1, rows + 1)
+                for _c in range(1, cols + 1)
+                if (_r, _c) not in included]
+    return '"{}"'.format("; ".join(excluded))
+
+
+def dictpop(dictionary, item):
+    """ Deletes an item from a dictionary and returns it. """
+    retval = dictionary[item]
+    del dictionary[item]
+    return retval
+
+
+def xyd_dict_to_xyd_tuple(d):
+    """ Converts a dict of [x{}y{} : data] values to a list of tuples """
+    t = [tuple(list(map(int, s[1:].split("y"))) + ["Every"]) for s in d.keys()]
+    return t
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          devices.py
+@created:       Mon Oct 19 17:12:10 2026
+
+Description:
+    Device-site positions from a mask's [Devices] section.
+
+    The position format is an assumption: there is no specification or
+    sample of it in this repo. Each [Devices] entry is assumed to be
+    ``Name = X, Y[, ...]`` where X and Y are the device position in um
+    relative to the die center; anything after the first two numbers is
+    ignored. Entries without two numbers, such as a map name
+    (``Dev = "Every"``), have no position and are left out of the overlay.
+
+    Positions for every device in every die of the grid are computed once
+    per mask as a single array, so drawing (or filtering) the overlay is
+    just an array selection.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import logging
+import re
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+UM_PER_MM = 1000
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class DeviceSites(object):
+    """
+    Precomputed device-site coordinates for every die on a mask grid.
+
+    Parameters:
+    -----------
+    centers_x, centers_y : (rows, cols) float arrays
+        Die-center coordinates (mm) for the whole grid, indexed
+        ``[row - 1, col - 1]``.
+    names : list of str
+        Device names, in the same order as ``offsets``.
+    offsets : (n_devices, 2) float array
+        Device position (mm) relative to the die center.
+    """
+    def __init__(self, centers_x, centers_y, names, offsets):
+        self.names = np.array(names)
+        self.shape = centers_x.shape
+        # (rows, cols, n_devices, 2)
+        self.points = np.stack([centers_x[..., None] + offsets[:, 0],
+                                centers_y[..., None] + offsets[:, 1]],
+                               axis=-1)
+
+    def select(self, die_mask, device_names=None):
+        """
+        Returns the device sites for a subset of die and devices.
+
+        Parameters:
+        -----------
+        die_mask : (rows, cols) bool array
+            The die to include.
+        device_names : iterable of str, optional
+            The devices to include. All devices if None.
+
+        Returns:
+        --------
+        points : (n, 2) float array
+        """
+        pts = self.points[die_mask]
+        if device_names is not None:
+            pts = pts[:, np.isin(self.names, list(device_names))]
+        return pts.reshape(-1, 2)
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def parse_device_offsets(devices):
+    """
+    Parses the [Devices] dict into names and offsets.
+
+    Parameters:
+    -----------
+    devices : dict of {str: str}
+        ``Mask.devices``.
+
+    Returns:
+    --------
+    names : list of str
+        Sorted device names that have a position.
+    offsets : (n_devices, 2) float array
+        Offsets from the die center, in mm.
+    """
+    names = []
+    offsets = []
+    for name in sorted(devices):
+        numbers = _NUMBER.findall(devices[name])
+        if len(numbers) < 2:
+            continue
+        names.append(name)
+        offsets.append((float(numbers[0]) / UM_PER_MM,
+                        float(numbers[1]) / UM_PER_MM))
+    if len(names) < len(devices):
+        logging.info("%d of %d devices have no 'X, Y' position",
+                     len(devices) - len(names), len(devices))
+    return names, np.array(offsets, dtype=float).reshape(-1, 2)
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          die_table.py
+@created:       Wed Oct 21 09:35:12 2026
+
+Description:
+    Columnar export of every die of every map in the mask library.
+
+    The table has one row per (mask, map, die) with the columns::
+
+        mask    uint16   index into the table's mask names
+        map     uint16   index into that mask's map names
+        x       int16    grid column
+        y       int16    grid row
+        radius  float32  distance from the wafer center, mm
+        zone    int16    ring * EXPORT_SECTORS + sector, -1 if off-wafer
+
+    File layout::
+
+        MAGIC
+        chunk, chunk, ...       one per mask; each column zlib-compressed
+        footer                  JSON index: masks, stamps, column offsets
+        footer offset (uint64) + MAGIC
+
+    Each mask is one chunk, so writing holds one mask in memory at a time
+    and reading a mask only seeks to its columns. Exports are incremental:
+    chunks of masks whose file stamp hasn't changed are copied from the
+    previous export without re-reading the mask.
+
+    The ``mask`` column isn't stored in the chunks (it's the chunk's
+    position in the index), so unchanged chunks can be copied verbatim.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import json
+import logging
+import os
+import os.path as osp
+import struct
+import sys
+import tempfile
+import time
+import zlib
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import core
+    from . import geometry
+    from . import mask_mirror
+    from . import zones
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import core
+        import geometry
+        import mask_mirror
+        import zones
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import core
+        from owt_wm_view import geometry
+        from owt_wm_view import mask_mirror
+        from owt_wm_view import zones
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+MAGIC = b"OWTDIE01"
+FORMAT_VERSION = 1
+EXPORT_RINGS = 5                # equal-area rings for the zone column
+EXPORT_SECTORS = 8
+COPY_BUFSIZE = 1024 * 1024
+COLUMNS = [("mask", "<u2"),
+           ("map", "<u2"),
+           ("x", "<i2"),
+           ("y", "<i2"),
+           ("radius", "<f4"),
+           ("zone", "<i2"),
+           ]
+STORED_COLUMNS = COLUMNS[1:]    # "mask" comes from the index
+_TRAILER = struct.Struct("<Q8s")
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class DieTableReader(object):
+    """
+    Reads a die table written by ``export_library``.
+
+    Only the footer is read when the file is opened; columns are read
+    per mask on request.
+
+    Parameters:
+    -----------
+    path : str
+        The die table file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.index = _read_index(self._file)
+        except Exception:
+            self._file.close()
+            raise
+        self.mask_names = [_m["name"] for _m in self.index["masks"]]
+        self._by_name = {_m["name"]: _n
+                         for _n, _m in enumerate(self.index["masks"])}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def __len__(self):
+        return sum(_m["rows"] for _m in self.index["masks"])
+
+    def map_names(self, mask):
+        """ Returns the map names of a mask, indexed by the map column """
+        return self.index["masks"][self._by_name[mask]]["maps"]
+
+    def read_mask(self, mask, columns=None):
+        """
+        Reads the rows of one mask.
+
+        Parameters:
+        -----------
+        mask : str
+            The mask name.
+        columns : list of str, optional
+            The columns to read. All of them if None.
+
+        Returns:
+        --------
+        table : dict of {str: array}
+        """
+        code = self._by_name[mask]
+        entry = self.index["masks"][code]
+        columns = columns or [_c for _c, _ in COLUMNS]
+        table = {}
+        for name in columns:
+            dtype = dict(COLUMNS)[name]
+            if name == "mask":
+                table[name] = np.full(entry["rows"], code, dtype=dtype)
+                continue
+            offset, length = entry["columns"][name]
+            self._file.seek(offset)
+            data = zlib.decompress(self._file.read(length))
+            table[name] = np.frombuffer(data, dtype=dtype)
+        return table
+
+    def read_all(self, columns=None):
+        """
+        Reads the whole table.
+
+        The ``map`` column is re-coded to index ``map_names``, the sorted
+        union of every mask's map names.
+
+        Returns:
+        --------
+        table : dict of {str: array}
+        map_names : list of str
+        """
+        columns = columns or [_c for _c, _ in COLUMNS]
+        map_names = sorted({_n for _m in self.index["masks"]
+                            for _n in _m["maps"]})
+        codes = {_n: _i for _i, _n in enumerate(map_names)}
+        parts = {_c: [] for _c in columns}
+        for mask in self.mask_names:
+            table = self.read_mask(mask, columns)
+            if "map" in table:
+                lookup = np.array([codes[_n] for _n in self.map_names(mask)],
+                                  dtype=np.uint16)
+                if lookup.size:
+                    table["map"] = lookup[table["map"]]
+            for name in columns:
+                parts[name].append(table[name])
+        result = {_c: (np.concatenate(parts[_c]) if parts[_c]
+                       else np.empty(0, dtype=dict(COLUMNS)[_c]))
+                  for _c in columns}
+        return result, map_names
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def _read_index(openf):
+    """ Reads the JSON footer of an open die table """
+    openf.seek(0, os.SEEK_END)
+    size = openf.tell()
+    if size < len(MAGIC) + _TRAILER.size:
+        raise ValueError("Not a die table: file too short")
+    openf.seek(0)
+    if openf.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a die table: bad header")
+    openf.seek(size - _TRAILER.size)
+    footer_offset, magic = _TRAILER.unpack(openf.read(_TRAILER.size))
+    if magic != MAGIC:
+        raise ValueError("Not a die table: bad trailer")
+    openf.seek(footer_offset)
+    index = json.loads(openf.read(size - _TRAILER.size - footer_offset)
+                       .decode("utf-8"))
+    if index.get("version") != FORMAT_VERSION:
+        raise ValueError("Unsupported die table version: {}".format(
+            index.get("version")))
+    return index
+
+
+def mask_rows(mask):
+    """
+    Builds the die table rows of one mask.
+
+    Radius and zone are computed once for the whole grid and then
+    gathered for every map.
+
+    Returns:
+    --------
+    columns : dict of {str: array}
+        The stored columns (no ``mask``).
+    map_names : list of str
+    """
+    rows = int(mask.row_count)
+    cols = int(mask.col_count)
+    col, row = np.meshgrid(np.arange(1, cols + 1), np.arange(1, rows + 1))
+    dx, dy = geometry.die_offsets(col, row, mask.die_xy, mask.center_xy)
+    radius = np.hypot(dx, dy)
+    analysis = zones.ZoneAnalysis(radius.ravel(),
+                                  zones.die_angle(dx, dy).ravel(),
+                                  mask.dia,
+                                  EXPORT_RINGS,
+                                  EXPORT_SECTORS,
+                                  )
+    zone = analysis.ring_idx * EXPORT_SECTORS + analysis.sector_idx
+    zone[(analysis.ring_idx < 0) | (analysis.sector_idx < 0)] = -1
+    zone = zone.reshape(rows, cols)
+
+    parts = {_c: [] for _c, _ in STORED_COLUMNS}
+    for code, name in enumerate(mask.map_names):
+        rc = np.asarray(mask.maps[name], dtype=np.intp).reshape(-1, 2)
+        rc = rc[(rc[:, 0] >= 1) & (rc[:, 0] <= rows)
+                & (rc[:, 1] >= 1) & (rc[:, 1] <= cols)]
+        r_idx = rc[:, 0] - 1
+        c_idx = rc[:, 1] - 1
+        parts["map"].append(np.full(len(rc), code))
+        parts["x"].append(rc[:, 1])
+        parts["y"].append(rc[:, 0])
+        parts["radius"].append(radius[r_idx, c_idx])
+        parts["zone"].append(zone[r_idx, c_idx])
+
+    columns = {}
+    for name, dtype in STORED_COLUMNS:
+        data = parts[name]
+        columns[name] = (np.concatenate(data).astype(dtype) if data
+                         else np.empty(0, dtype=dtype))
+    return columns, list(mask.map_names)
+
+
+def _write_chunk(openf, columns):
+    """ Writes one mask's columns and returns their {name: [offset, len]} """
+    offsets = {}
+    for name, dtype in STORED_COLUMNS:
+        data = zlib.compress(np.ascontiguousarray(columns[name],
+                                                  dtype=dtype).tobytes(), 6)
+        offsets[name] = [openf.tell(), len(data)]
+        openf.write(data)
+    return offsets
+
+
+def _copy_chunk(src, dst, entry):
+    """ Copies a mask's chunk from an old table, updating its offsets """
+    spans = sorted(entry["columns"].items(), key=lambda _i: _i[1][0])
+    start = spans[0][1][0]
+    end = max(_o + _n for _, (_o, _n) in spans)
+    shift = dst.tell() - start
+    src.seek(start)
+    remaining = end - start
+    while remaining:
+        block = src.read(min(COPY_BUFSIZE, remaining))
+        if not block:
+            raise ValueError("Die table is truncated")
+        dst.write(block)
+        remaining -= len(block)
+    new = dict(entry)
+    new["columns"] = {_c: [_o + shift, _n]
+                      for _c, (_o, _n) in entry["columns"].items()}
+    return new
+
+
+def export_library(path, masks=None, full=False, mirror=None,
+                   mask_class=None):
+    """
+    Writes (or updates) the die table for the mask library.
+
+    Parameters:
+    -----------
+    path : str
+        The output file. If it exists and ``full`` is False, chunks of
+        masks whose stamp hasn't changed are copied from it.
+    masks : list of str, optional
+        Mask names to export. Defaults to every mask in the mirror.
+    full : bool
+        Re-read every mask.
+    mirror : MaskMirror, optional
+        Defaults to ``mask_mirror.get_mirror()``.
+    mask_class : class, optional
+        Used to load masks. Defaults to ``core.Mask``.
+
+    Returns:
+    --------
+    summary : dict
+        Counts of ``written``, ``copied`` and ``failed`` masks, the
+        ``rows`` in the table and ``elapsed_s``.
+    """
+    start = time.time()
+    mirror = mirror or mask_mirror.get_mirror()
+    mask_class = mask_class or core.Mask
+    if masks is None:
+        masks = mirror.list_masks()
+
+    old_file = None
+    old_entries = {}
+    if not full and osp.isfile(path):
+        try:
+            old_file = open(path, 'rb')
+            old_entries = {_m["name"]: _m
+                           for _m in _read_index(old_file)["masks"]}
+        except (OSError, ValueError) as err:
+            logging.warning("Rewriting die table %s: %s", path, err)
+            if old_file is not None:
+                old_file.close()
+            old_file = None
+
+    summary = {"written": 0, "copied": 0, "failed": 0, "rows": 0}
+    entries = []
+    dirname = osp.dirname(osp.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as openf:
+            openf.write(MAGIC)
+            for name in masks:
+                try:
+                    stamp = list(mirror.stamp(name + ".ini"))
+                    old = old_entries.get(name)
+                    if old is not None and old["stamp"] == stamp:
+                        entries.append(_copy_chunk(old_file, openf, old))
+                        summary["copied"] += 1
+                    else:
+                        columns, map_names = mask_rows(mask_class(name))
+                        entries.append({"name": name,
+                                        "stamp": stamp,
+                                        "rows": len(columns["map"]),
+                                        "maps": map_names,
+                                        "columns": _write_chunk(openf,
+                                                                columns),
+                                        })
+                        summary["written"] += 1
+                except Exception as err:
+                    logging.error("Unable to export mask %s: %s", name, err)
+                    summary["failed"] += 1
+                    continue
+                summary["rows"] += entries[-1]["rows"]
+
+            index = {"version": FORMAT_VERSION,
+                     "columns": COLUMNS,
+                     "zones": {"rings": EXPORT_RINGS,
+                               "sectors": EXPORT_SECTORS,
+                               },
+                     "masks": entries,
+                     }
+            footer_offset = openf.tell()
+            openf.write(json.dumps(index).encode("utf-8"))
+            openf.write(_TRAILER.pack(footer_offset, MAGIC))
+    except BaseException:
+        os.remove(tmp)
+        raise
+    finally:
+        if old_file is not None:
+            old_file.close()
+    os.replace(tmp, path)
+
+    summary["elapsed_s"] = round(time.time() - start, 3)
+    logging.info("Exported %d masks (%d copied, %d failed), %d rows to %s",
+                 summary["written"] + summary["copied"], summary["copied"],
+                 summary["failed"], summary["rows"], path)
+    return summary
+
+
+def main(path, full=False, sync=True):
+    """
+    Runs the export from the command line.
+
+    The mirror is synced with the mask roots first, unless ``sync`` is
+    False, so that the stamp check sees changes on the share. If the
+    roots are unreachable the mirrored copies are exported.
+
+    Returns:
+    --------
+    exit_code : int
+        0 if every mask was exported, 1 otherwise.
+    """
+    if sync:
+        mask_mirror.get_mirror().sync()
+    summary = export_library(path, full=full)
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 1 if summary["failed"] else 0
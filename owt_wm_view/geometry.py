@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          geometry.py
+@created:       Mon Oct 19 14:41:52 2026
+
+Description:
+    Vectorized die-grid geometry helpers that don't depend on wx.
+
+    Grid coordinates are the 1-indexed (X, Y) = (Col, Row) pairs used in
+    the viewer's xyd lists.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class GridIndex(object):
+    """
+    A precomputed grid -> die lookup table for an xyd list.
+
+    ``index[y, x]`` is the position of die (x, y) in the xyd list, or -1 if
+    that grid location isn't in the map. Lookups are a single array read,
+    so they're cheap enough to do on every mouse-move event.
+
+    Parameters:
+    -----------
+    xyd : list of (x, y, data) tuples
+        The die in the map.
+    die_xy : (float, float)
+        The die size in mm.
+    center_xy : (float, float)
+        The grid coordinate of the wafer center.
+    """
+    def __init__(self, xyd, die_xy, center_xy):
+        self.die_xy = die_xy
+        self.center_xy = center_xy
+        self.data = [_d[2] for _d in xyd]
+        self.x = np.array([_d[0] for _d in xyd], dtype=np.intp)
+        self.y = np.array([_d[1] for _d in xyd], dtype=np.intp)
+        self.radius = die_radius(self.x, self.y, die_xy, center_xy)
+
+        # Grid coords are normally >= 1, but don't rely on it.
+        self.x_offset = min(int(self.x.min()), 0) if self.x.size else 0
+        self.y_offset = min(int(self.y.min()), 0) if self.y.size else 0
+        max_x = int(self.x.max()) if self.x.size else 0
+        max_y = int(self.y.max()) if self.y.size else 0
+        self.index = np.full((max_y - self.y_offset + 1,
+                              max_x - self.x_offset + 1),
+                             -1,
+                             dtype=np.int32,
+                             )
+        self.index[self.y - self.y_offset,
+                   self.x - self.x_offset] = np.arange(self.x.size,
+                                                       dtype=np.int32)
+
+    def lookup(self, grid_x, grid_y):
+        """ Returns the die index at (grid_x, grid_y), or -1 """
+        row = grid_y - self.y_offset
+        col = grid_x - self.x_offset
+        rows, cols = self.index.shape
+        if 0 <= row < rows and 0 <= col < cols:
+            return int(self.index[row, col])
+        return -1
+
+    def describe(self, grid_x, grid_y):
+        """
+        Returns a dict describing the die at (grid_x, grid_y).
+
+        Keys are ``grid``, ``radius``, ``in_map`` and ``value`` (None if the
+        die isn't in the map).
+        """
+        idx = self.lookup(grid_x, grid_y)
+        radius = float(die_radius(grid_x, grid_y,
+                                  self.die_xy, self.center_xy))
+        return {"grid": (grid_x, grid_y),
+                "radius": radius,
+                "in_map": idx >= 0,
+                "value": self.data[idx] if idx >= 0 else None,
+                }
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def grid_die_centers(rows, cols, origin, step, die_xy):
+    """
+    Returns canvas die-center coordinates for the whole Rows x Cols grid.
+
+    Parameters:
+    -----------
+    rows, cols : int
+        The grid size.
+    origin : (float, float)
+        Canvas coordinate of the rectangle corner of grid location (0, 0).
+    step : (float, float)
+        Change in canvas coordinate per grid step in X and Y.
+    die_xy : (float, float)
+        The die size.
+
+    ``origin`` and ``step`` come from ``wm_utils.grid_to_rect_coord`` so
+    that everything lines up with the die drawn by wafer_map.
+
+    Returns:
+    --------
+    (x, y) : tuple of (rows, cols) float arrays
+        Indexed ``[row - 1, col - 1]``.
+    """
+    col, row = np.meshgrid(np.arange(1, int(cols) + 1),
+                           np.arange(1, int(rows) + 1))
+    x = origin[0] + step[0] * col + die_xy[0] / 2
+    y = origin[1] + step[1] * row + die_xy[1] / 2
+    return x, y
+
+
+def grid_mask(x, y, rows, cols):
+    """
+    Returns a (rows, cols) bool array that is True at each (x, y) die.
+
+    Die outside the grid are ignored.
+    """
+    x = np.asarray(x, dtype=np.intp)
+    y = np.asarray(y, dtype=np.intp)
+    mask = np.zeros((int(rows), int(cols)), dtype=bool)
+    keep = (x >= 1) & (x <= cols) & (y >= 1) & (y <= rows)
+    mask[y[keep] - 1, x[keep] - 1] = True
+    return mask
+
+
+def die_offsets(x, y, die_xy, center_xy):
+    """
+    Returns the physical (dx, dy) offset (mm) of each die from the center.
+
+    +X is toward higher columns and +Y toward *lower* rows, so that row 1
+    is the top of the wafer.
+    """
+    dx = die_xy[0] * (np.asarray(x, dtype=float) - center_xy[0])
+    dy = die_xy[1] * (center_xy[1] - np.asarray(y, dtype=float))
+    return dx, dy
+
+
+def die_radius(x, y, die_xy, center_xy):
+    """
+    Returns the distance (mm) from the wafer center to each die center.
+
+    ``x`` and ``y`` may be scalars or arrays of grid coordinates.
+    """
+    dx = die_xy[0] * (center_xy[0] - np.asarray(x, dtype=float))
+    dy = die_xy[1] * (center_xy[1] - np.asarray(y, dtype=float))
+    return np.hypot(dx, dy)
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          map_generator.py
+@created:       Mon Oct 19 16:05:33 2026
+
+Description:
+    Generates wafer maps from mask geometry.
+
+    Every die on the Rows x Cols grid is classified as full, partial or
+    excluded for a given edge exclusion, using only the die size, the grid
+    center, the wafer diameter and the flat location. Everything is
+    computed as whole-grid numpy arrays so it's fast enough to re-run on
+    every slider move.
+
+    Physical coordinates are mm from the wafer center with +X toward
+    higher columns and +Y toward *lower* rows (row 1 is the top of the
+    wafer).
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import math
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import geometry
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import geometry
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import geometry
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+# SEMI primary flat lengths (mm) by wafer diameter (mm).
+FLAT_LENGTHS = {150: 57.5,
+                100: 32.5,
+                50: 15.88,
+                }
+
+EXCLUDED = 0
+PARTIAL = 1
+FULL = 2
+CLASS_NAMES = {EXCLUDED: "Excluded",
+               PARTIAL: "Partial",
+               FULL: "Full",
+               }
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def die_centers(rows, cols, die_xy, center_xy):
+    """
+    Returns the physical die-center coordinates for the whole grid.
+
+    Returns:
+    --------
+    (x, y) : tuple of (rows, cols) float arrays
+        ``x[r - 1, c - 1]`` is the X position (mm) of die (row r, col c).
+    """
+    col, row = np.meshgrid(np.arange(1, int(cols) + 1),
+                           np.arange(1, int(rows) + 1))
+    return geometry.die_offsets(col, row, die_xy, center_xy)
+
+
+def flat_normal(flat_loc):
+    """
+    Returns the unit vector pointing from the wafer center to the flat.
+
+    ``flat_loc`` is in degrees counter-clockwise from +X, so 270 is a flat
+    at the bottom of the wafer.
+    """
+    angle = math.radians(flat_loc)
+    return math.cos(angle), math.sin(angle)
+
+
+def classify_die(rows, cols, die_xy, center_xy, dia, edge_excl,
+                 flat_loc=None, flat_excl=None):
+    """
+    Classifies every die on the grid as FULL, PARTIAL or EXCLUDED.
+
+    A die is FULL if all four of its corners are inside the usable area
+    (the wafer shrunk by ``edge_excl``, and ``flat_excl`` away from the
+    flat). It's PARTIAL if it overlaps the usable area at all, and
+    EXCLUDED otherwise.
+
+    Parameters:
+    -----------
+    rows, cols : int
+        The mask grid size.
+    die_xy : (float, float)
+        Die size in mm.
+    center_xy : (float, float)
+        The grid coordinate of the wafer center.
+    dia : float
+        Wafer diameter in mm.
+    edge_excl : float
+        Edge exclusion in mm.
+    flat_loc : float, optional
+        Flat location in degrees (see ``flat_normal``). No flat if None.
+    flat_excl : float, optional
+        Exclusion from the flat in mm. Defaults to ``edge_excl``.
+
+    Returns:
+    --------
+    classes : (rows, cols) uint8 array
+    """
+    if flat_excl is None:
+        flat_excl = edge_excl
+    x, y = die_centers(rows, cols, die_xy, center_xy)
+    half_x = die_xy[0] / 2
+    half_y = die_xy[1] / 2
+    radius = dia / 2 - edge_excl
+
+    # Corner furthest from the center, and closest point of the die.
+    far_x = np.abs(x) + half_x
+    far_y = np.abs(y) + half_y
+    near_x = np.maximum(np.abs(x) - half_x, 0)
+    near_y = np.maximum(np.abs(y) - half_y, 0)
+
+    full = far_x**2 + far_y**2 <= radius**2
+    overlap = near_x**2 + near_y**2 < radius**2
+
+    flat_len = FLAT_LENGTHS.get(int(dia))
+    if flat_loc is not None and flat_len is not None:
+        n_x, n_y = flat_normal(flat_loc)
+        flat_dist = math.sqrt((dia / 2)**2 - (flat_len / 2)**2) - flat_excl
+        # Projection of the die center onto the flat normal, +/- the
+        # largest projection of any corner offset.
+        proj = x * n_x + y * n_y
+        spread = abs(n_x) * half_x + abs(n_y) * half_y
+        full &= proj + spread <= flat_dist
+        overlap &= proj - spread < flat_dist
+
+    classes = np.full(x.shape, EXCLUDED, dtype=np.uint8)
+    classes[overlap] = PARTIAL
+    classes[full] = FULL
+    return classes
+
+
+def classes_to_map(classes, include_partial=False):
+    """
+    Converts a classification array into a map list.
+
+    Returns:
+    --------
+    rc_list : list of (row, col) tuples
+        Same format as the values of ``Mask.maps``.
+    """
+    keep = classes == FULL
+    if include_partial:
+        keep |= classes == PARTIAL
+    rows, cols = np.nonzero(keep)
+    return [(int(_r) + 1, int(_c) + 1) for _r, _c in zip(rows, cols)]
+
+
+def classes_to_xyd(classes):
+    """
+    Converts a classification array into an xyd list for previewing.
+
+    Excluded die are left out. Data is the class name.
+    """
+    rows, cols = np.nonzero(classes != EXCLUDED)
+    return [(int(_c) + 1, int(_r) + 1, CLASS_NAMES[int(classes[_r, _c])])
+            for _r, _c in zip(rows, cols)]
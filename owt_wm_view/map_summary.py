@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          map_summary.py
+@created:       Wed Oct 21 16:02:37 2026
+
+Description:
+    Per-map summary statistics for every map in a mask.
+
+    All of a mask's maps are stacked into one (n_maps, rows, cols) bool
+    array and every statistic is a reduction or a matrix-vector product
+    over that stack, so the table for hundreds of maps is a handful of
+    numpy calls.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import itertools
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import geometry
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import geometry
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import geometry
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+EDGE_RING_MM = 10               # width of the edge ring, from the wafer edge
+EVERY_MAP = "Every"
+COLUMNS = [("name", "Map"),
+           ("count", "Die"),
+           ("every_fraction", "% of Every"),
+           ("mean_radius", "Mean Radius (mm)"),
+           ("edge_count", "Edge Ring Die"),
+           ("bbox", "Rows x Cols"),
+           ]
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def map_stack(maps, names, rows, cols):
+    """
+    Stacks maps into a single bool array.
+
+    Every (row, col) of every map is flattened into one int array and
+    scattered in one indexing operation. Die outside Rows x Cols are
+    dropped.
+
+    Parameters:
+    -----------
+    maps : dict of {str: list of (row, col)}
+        ``Mask.maps``.
+    names : list of str
+        The maps to stack, in order.
+    rows, cols : int
+        The grid size.
+
+    Returns:
+    --------
+    stack : (len(names), rows, cols) bool array
+    """
+    stack = np.zeros((len(names), rows, cols), dtype=bool)
+    lengths = [len(maps[_n]) for _n in names]
+    if not sum(lengths):
+        return stack
+    flat = itertools.chain.from_iterable(
+        itertools.chain.from_iterable(maps[_n] for _n in names))
+    rc = np.fromiter(flat, dtype=np.intp,
+                     count=2 * sum(lengths)).reshape(-1, 2)
+    layer = np.repeat(np.arange(len(names)), lengths)
+    keep = ((rc[:, 0] >= 1) & (rc[:, 0] <= rows)
+            & (rc[:, 1] >= 1) & (rc[:, 1] <= cols))
+    stack[layer[keep], rc[keep, 0] - 1, rc[keep, 1] - 1] = True
+    return stack
+
+
+def summarize(stack, names, die_xy, center_xy, dia,
+              edge_ring=EDGE_RING_MM):
+    """
+    Computes the summary of every map in a stack.
+
+    Parameters:
+    -----------
+    stack : (n_maps, rows, cols) bool array
+        From ``map_stack``.
+    names : list of str
+        The map names, in stack order.
+    die_xy, center_xy : (float, float)
+        The mask's die size and grid center.
+    dia : float
+        Wafer diameter in mm.
+    edge_ring : float
+        Width (mm) of the edge ring, measured in from the wafer edge.
+
+    Returns:
+    --------
+    summary : dict of {str: array}
+        One entry per map for each of ``COLUMNS``. ``every_fraction`` is
+        NaN if the mask has no "Every" map, ``mean_radius`` is NaN for
+        empty maps, and ``bbox`` is (min_row, max_row, min_col, max_col),
+        all 0 for empty maps.
+    """
+    n_maps, rows, cols = stack.shape
+    col, row = np.meshgrid(np.arange(1, cols + 1), np.arange(1, rows + 1))
+    radius = geometry.die_radius(col, row, die_xy, center_xy)
+    edge = radius > dia / 2 - edge_ring
+
+    flat = stack.reshape(n_maps, -1)
+    count = np.count_nonzero(flat, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_radius = (flat @ radius.ravel()) / count
+    edge_count = flat @ edge.ravel().astype(np.intp)
+
+    if EVERY_MAP in names:
+        every = count[list(names).index(EVERY_MAP)]
+        every_fraction = count / every if every else np.full(n_maps, np.nan)
+    else:
+        every_fraction = np.full(n_maps, np.nan)
+
+    return {"name": np.array(names, dtype=object),
+            "count": count,
+            "every_fraction": every_fraction,
+            "mean_radius": mean_radius,
+            "edge_count": edge_count,
+            "bbox": _bounding_boxes(stack),
+            }
+
+
+def _bounding_boxes(stack):
+    """ Returns (n_maps, 4) 1-indexed (min_row, max_row, min_col, max_col) """
+    row_any = stack.any(axis=2)
+    col_any = stack.any(axis=1)
+    rows = row_any.shape[1]
+    cols = col_any.shape[1]
+    bbox = np.column_stack([np.argmax(row_any, axis=1) + 1,
+                            rows - np.argmax(row_any[:, ::-1], axis=1),
+                            np.argmax(col_any, axis=1) + 1,
+                            cols - np.argmax(col_any[:, ::-1], axis=1),
+                            ])
+    bbox[~row_any.any(axis=1)] = 0
+    return bbox
+
+
+def mask_summary(mask, edge_ring=EDGE_RING_MM):
+    """ Returns ``summarize`` for every map of a ``Mask`` """
+    stack = map_stack(mask.maps, mask.map_names,
+                      int(mask.row_count), int(mask.col_count))
+    return summarize(stack, mask.map_names, mask.die_xy, mask.center_xy,
+                     mask.dia, edge_ring)
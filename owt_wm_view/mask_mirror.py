@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          mask_mirror.py
+@created:       Mon Oct 19 11:02:17 2026
+
+Description:
+    Local read-through mirror of the OWT mask network share(s).
+
+    All mask files are read from a local mirror directory. A background
+    thread periodically copies any mask file whose size, mtime or hash
+    has changed on one of the mask roots. If a file isn't in the mirror
+    yet it's fetched on demand. If the share is slow or unreachable, the
+    mirror keeps serving the last good copy.
+
+    The mask roots and mirror directory can be configured with the
+    environment variables::
+
+        OWT_MASK_ROOTS      os.pathsep-separated list of directories
+        OWT_MASK_MIRROR     the local mirror directory
+
+    The first root that contains a given file wins.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import hashlib
+import json
+import logging
+import os
+import os.path as osp
+import shutil
+import tempfile
+import threading
+
+# Third-Party
+
+# Package / Application
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+DEFAULT_MASK_ROOTS = ["Z:\\Software\\LabView\\OWT\\masks"]
+DEFAULT_MIRROR_PATH = osp.join(osp.expanduser("~"), ".owt_wm_view", "masks")
+MANIFEST_FILE = "_mirror_manifest.json"
+SYNC_INTERVAL = 300             # seconds
+COPY_BUFSIZE = 1024 * 1024
+# Characters that would take a file name out of the mirror or a root.
+UNSAFE_NAME_CHARS = ("/", "\\", ":", "\0")
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class MaskMirror(object):
+    """
+    Keeps a local copy of every ``.ini`` file found in the mask roots.
+
+    Parameters:
+    -----------
+    roots : list of str, optional
+        The mask roots (network shares). Defaults to ``mask_roots()``.
+    mirror_dir : str, optional
+        The local mirror directory. Defaults to ``mirror_path()``.
+    interval : float, optional
+        Seconds between background syncs.
+    """
+    def __init__(self, roots=None, mirror_dir=None, interval=SYNC_INTERVAL):
+        self.roots = list(roots) if roots is not None else mask_roots()
+        self.mirror_dir = mirror_dir or mirror_path()
+        self.interval = interval
+        self.manifest_file = osp.join(self.mirror_dir, MANIFEST_FILE)
+        self.manifest = {}
+        self._listeners = []        # called with the names a sync copied
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        os.makedirs(self.mirror_dir, exist_ok=True)
+        self._load_manifest()
+
+    def _load_manifest(self):
+        """ Reads the manifest of mirrored file stamps, if there is one """
+        try:
+            with open(self.manifest_file, 'r') as openf:
+                self.manifest = json.load(openf)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def _save_manifest(self):
+        """ Atomically writes the manifest """
+        with self._lock:
+            fd, tmp = tempfile.mkstemp(dir=self.mirror_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w') as openf:
+                json.dump(self.manifest, openf, indent=1, sort_keys=True)
+            os.replace(tmp, self.manifest_file)
+
+    def start(self):
+        """ Starts the background sync thread """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="MaskMirror",
+                                        daemon=True,
+                                        )
+        self._thread.start()
+
+    def stop(self):
+        """ Stops the background sync thread """
+        self._stop.set()
+
+    def add_sync_listener(self, func):
+        """
+        Calls ``func(copied)`` after every sync that copied any files.
+
+        ``copied`` is the list of updated filenames. ``func`` is called on
+        the thread that ran the sync, usually the background thread.
+        """
+        self._listeners.append(func)
+
+    def _run(self):
+        """ Background loop: sync, then wait ``interval`` seconds """
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception:
+                logging.exception("Mask mirror sync failed")
+            self._stop.wait(self.interval)
+
+    def sync(self):
+        """
+        Copies every new or changed mask file from the roots.
+
+        Returns:
+        --------
+        copied : list of str
+            The filenames that were updated in the mirror.
+        """
+        copied = []
+        seen = set()
+        for root in self.roots:
+            try:
+                names = os.listdir(root)
+            except OSError as err:
+                logging.warning("Mask root %s unavailable: %s", root, err)
+                continue
+            for name in sorted(names):
+                if not name.endswith(".ini") or name in seen:
+                    continue
+                seen.add(name)
+                if self._stop.is_set() and self._thread is not None:
+                    break
+                try:
+                    if self._update_file(root, name):
+                        copied.append(name)
+                except OSError as err:
+                    logging.warning("Unable to mirror %s: %s", name, err)
+
+        if copied:
+            logging.info("Mirrored %d mask file(s)", len(copied))
+        self._save_manifest()
+        if copied:
+            for func in list(self._listeners):
+                func(copied)
+        return copied
+
+    def _update_file(self, root, name):
+        """
+        Copies ``root/name`` to the mirror if it's changed.
+
+        The size and mtime are checked first. If either differs, the file
+        is copied to a temporary file while being hashed and only replaces
+        the mirrored copy if the hash changed too.
+
+        The copy is made without holding the lock, which is only taken to
+        swap in the new file and update the manifest, so a slow share
+        doesn't block other threads.
+        """
+        src = osp.join(root, name)
+        dst = osp.join(self.mirror_dir, name)
+        stat = os.stat(src)
+
+        with self._lock:
+            entry = self.manifest.get(name)
+        if (entry is not None
+                and osp.isfile(dst)
+                and entry["size"] == stat.st_size
+                and entry["mtime"] == stat.st_mtime):
+            return False
+
+        fd, tmp = tempfile.mkstemp(dir=self.mirror_dir, suffix=".tmp")
+        sha1 = hashlib.sha1()
+        try:
+            with open(src, 'rb') as fsrc, os.fdopen(fd, 'wb') as fdst:
+                while True:
+                    chunk = fsrc.read(COPY_BUFSIZE)
+                    if not chunk:
+                        break
+                    sha1.update(chunk)
+                    fdst.write(chunk)
+            digest = sha1.hexdigest()
+            shutil.copystat(src, tmp)
+
+            with self._lock:
+                entry = self.manifest.get(name)
+                changed = (entry is None
+                           or not osp.isfile(dst)
+                           or entry["sha1"] != digest)
+                if changed:
+                    os.replace(tmp, dst)
+                self.manifest[name] = {"root": root,
+                                       "size": stat.st_size,
+                                       "mtime": stat.st_mtime,
+                                       "sha1": digest,
+                                       }
+        finally:
+            if osp.exists(tmp):
+                os.remove(tmp)
+        return changed
+
+    def fetch(self, name):
+        """
+        Copies a single file from the first root that has it.
+
+        Returns True if the file was found on one of the roots. Raises
+        ValueError if ``name`` isn't a plain file name (see
+        ``is_safe_name``).
+        """
+        check_name(name)
+        for root in self.roots:
+            if not osp.isfile(osp.join(root, name)):
+                continue
+            try:
+                self._update_file(root, name)
+            except OSError as err:
+                logging.warning("Unable to fetch %s: %s", name, err)
+                continue
+            self._save_manifest()
+            return True
+        return False
+
+    def path_for(self, name):
+        """
+        Returns the local path of a mask file, fetching it if needed.
+
+        Raises FileNotFoundError if the file isn't mirrored and none of
+        the roots can provide it, and ValueError like ``fetch``.
+        """
+        check_name(name)
+        path = osp.join(self.mirror_dir, name)
+        if not osp.isfile(path):
+            self.fetch(name)
+        if not osp.isfile(path):
+            raise FileNotFoundError(path)
+        return path
+
+    def stamp(self, name):
+        """
+        Returns the (size, mtime_ns) stamp of a mirrored file.
+
+        The stamp changes whenever a sync copies a new version of the
+        file. Raises FileNotFoundError like ``path_for``.
+        """
+        stat = os.stat(self.path_for(name))
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def list_masks(self, sync=True):
+        """
+        Returns the sorted list of mask names available in the mirror.
+
+        If the mirror is empty (the first run) and ``sync`` is true, a sync
+        is done first, on the calling thread. The GUI passes False and
+        relies on the background thread and ``add_sync_listener``.
+        """
+        names = [_f for _f in os.listdir(self.mirror_dir)
+                 if _f.endswith(".ini")]
+        if not names and sync:
+            self.sync()
+            names = [_f for _f in os.listdir(self.mirror_dir)
+                     if _f.endswith(".ini")]
+        return sorted(osp.splitext(_f)[0] for _f in names)
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def mask_roots():
+    """ Returns the configured list of mask roots """
+    env = os.environ.get("OWT_MASK_ROOTS")
+    if env:
+        return [_p for _p in env.split(os.pathsep) if _p]
+    return list(DEFAULT_MASK_ROOTS)
+
+
+def is_safe_name(name):
+    """
+    Returns True if ``name`` is a plain file name.
+
+    Names with directory separators, drive letters or that are "." or
+    ".." could point outside the mirror and the roots.
+    """
+    return (bool(name)
+            and name not in (".", "..")
+            and not any(_c in name for _c in UNSAFE_NAME_CHARS))
+
+
+def check_name(name):
+    """ Raises ValueError unless ``is_safe_name(name)`` """
+    if not is_safe_name(name):
+        raise ValueError("Invalid mask file name: {!r}".format(name))
+
+
+def mirror_path():
+    """ Returns the configured local mirror directory """
+    return os.environ.get("OWT_MASK_MIRROR", DEFAULT_MIRROR_PATH)
+
+
+_MIRROR = None
+
+
+def get_mirror():
+    """ Returns the shared MaskMirror instance, creating it if needed """
+    global _MIRROR
+    if _MIRROR is None:
+        _MIRROR = MaskMirror()
+    return _MIRROR
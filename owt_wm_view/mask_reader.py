@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          mask_reader.py
+@created:       Mon Oct 19 18:03:26 2026
+
+Description:
+    Single-pass reader for OWT mask .ini files.
+
+    The file is memory-mapped and scanned once, recording the byte offsets
+    of every section and key. Small values (the [Mask] header, Rows/Cols,
+    [Devices]) are decoded to strings on request. Map values, which can be
+    hundreds of kB each, are handed to ``decode_map_buffer`` as memoryview
+    slices of the mapped file and parsed with numpy, without ever being
+    turned into Python strings.
+
+    The subset of the configparser format used by the OWT files is
+    supported: ``[section]`` headers, ``key = value`` or ``key: value``
+    lines, indented continuation lines and ``;``/``#`` comment lines.
+    Keys are case-sensitive.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import configparser
+import logging
+import mmap
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+ENCODING = "utf-8"
+_WHITESPACE = b" \t\r\f\v"
+_COMMENT_PREFIXES = (b"#", b";")
+
+# Bytes that may appear in a map value: digits, separators and quotes.
+_MAP_ALLOWED = np.zeros(256, dtype=bool)
+_MAP_ALLOWED[np.frombuffer(b"0123456789,; \t\r\n\"'", dtype=np.uint8)] = True
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class MaskFileReader(object):
+    """
+    Scans an OWT mask file once and gives access to its values.
+
+    Use as a context manager (or call ``close``) so that the memory map
+    is released::
+
+        with MaskFileReader(path) as reader:
+            info = reader.items("Mask")
+            every = decode_map_buffer(reader.buffer("150mm", "Every"))
+
+    Parameters:
+    -----------
+    path : str
+        The mask file.
+    """
+    def __init__(self, path):
+        self.path = path
+        # {section: {key: [start, end]}}, both in file order.
+        self._sections = {}
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped.
+            self._map = b""
+        self._view = memoryview(self._map)
+        self._scan()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Releases the memory map and closes the file.
+
+        If a buffer from ``buffer`` is still alive the map can't be
+        released yet; it's then left to the garbage collector, but the
+        file is always closed and no BufferError escapes.
+        """
+        try:
+            self._view.release()
+            if isinstance(self._map, mmap.mmap):
+                self._map.close()
+        except BufferError:
+            logging.warning("Map buffers of %s still in use", self.path)
+        finally:
+            self._file.close()
+
+    def _scan(self):
+        """ Records the byte offsets of every section and key """
+        data = self._map
+        size = len(data)
+        section = None
+        last = None             # [start, end] of the last value seen
+        pos = 0
+        lineno = 0
+        while pos < size:
+            nl = data.find(b"\n", pos)
+            if nl == -1:
+                nl = size
+            start, end = pos, nl
+            pos = nl + 1
+            lineno += 1
+
+            # Trim whitespace without copying the line.
+            indented = data[start:start + 1] in (b" ", b"\t")
+            while start < end and data[start:start + 1] in _WHITESPACE:
+                start += 1
+            while end > start and data[end - 1:end] in _WHITESPACE:
+                end -= 1
+            if start == end or data[start:start + 1] in _COMMENT_PREFIXES:
+                continue
+
+            if indented and last is not None:
+                # Continuation line: extend the previous value.
+                last[1] = end
+                continue
+
+            if data[start:start + 1] == b"[":
+                close = data.rfind(b"]", start, end)
+                if close == -1:
+                    raise self._parse_error(lineno, start, end)
+                section = bytes(data[start + 1:close]).decode(ENCODING)
+                if section in self._sections:
+                    raise configparser.DuplicateSectionError(section,
+                                                             self.path,
+                                                             lineno)
+                self._sections[section] = {}
+                last = None
+                continue
+
+            if section is None:
+                raise configparser.MissingSectionHeaderError(
+                    self.path, lineno, self._line(start, end))
+
+            # First '=' or ':' is the delimiter, same as configparser.
+            delims = [_i for _i in (data.find(b"=", start, end),
+                                    data.find(b":", start, end))
+                      if _i != -1]
+            if not delims:
+                raise self._parse_error(lineno, start, end)
+            delim = min(delims)
+
+            key_end = delim
+            while data[key_end - 1:key_end] in _WHITESPACE:
+                key_end -= 1
+            key = bytes(data[start:key_end]).decode(ENCODING)
+
+            val_start = delim + 1
+            while val_start < end and data[val_start] in _WHITESPACE:
+                val_start += 1
+
+            if key in self._sections[section]:
+                raise configparser.DuplicateOptionError(section, key,
+                                                        self.path, lineno)
+            last = [val_start, end]
+            self._sections[section][key] = last
+
+    def _line(self, start, end):
+        return bytes(self._map[start:end]).decode(ENCODING, 'replace')
+
+    def _parse_error(self, lineno, start, end):
+        err = configparser.ParsingError(source=self.path)
+        err.append(lineno, self._line(start, end))
+        return err
+
+    def _offsets(self, section, key):
+        try:
+            keys = self._sections[section]
+        except KeyError:
+            raise configparser.NoSectionError(section)
+        try:
+            return keys[key]
+        except KeyError:
+            raise configparser.NoOptionError(key, section)
+
+    def sections(self):
+        """ Returns the section names in file order """
+        return list(self._sections)
+
+    def has_section(self, section):
+        return section in self._sections
+
+    def keys(self, section):
+        """ Returns the keys of ``section`` in file order """
+        try:
+            return list(self._sections[section])
+        except KeyError:
+            raise configparser.NoSectionError(section)
+
+    def buffer(self, section, key):
+        """ Returns the raw value as a memoryview slice (no copy) """
+        start, end = self._offsets(section, key)
+        return self._view[start:end]
+
+    def get(self, section, key):
+        """
+        Returns a value as a string.
+
+        Continuation lines are joined with newlines and stripped, the same
+        as configparser.
+        """
+        start, end = self._offsets(section, key)
+        text = bytes(self._map[start:end]).decode(ENCODING)
+        return "\n".join(_l.strip() for _l in text.splitlines())
+
+    def items(self, section):
+        """ Returns a list of (key, string value), like parser.items """
+        return [(_k, self.get(section, _k)) for _k in self.keys(section)]
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def decode_map_buffer(buf):
+    """
+    Parses an OWT map value into an (n, 2) integer array of pairs.
+
+    The value looks like ``"1,1; 1,2; 1,3"``. Every run of digits is one
+    number and consecutive numbers are paired up. ``buf`` can be anything
+    that supports the buffer protocol; it is read in place.
+
+    Raises ValueError if the value contains anything other than digits,
+    separators and quotes, or an odd count of numbers.
+    """
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    try:
+        return _parse_map_bytes(arr)
+    except ValueError as err:
+        message = str(err)
+    # Raise outside the handler: the traceback would otherwise keep ``arr``,
+    # an export of ``buf``, alive and the caller couldn't release ``buf``.
+    del arr
+    raise ValueError(message)
+
+
+def _parse_map_bytes(arr):
+    """ ``decode_map_buffer`` on a uint8 array """
+    if not _MAP_ALLOWED[arr].all():
+        bad = bytes(arr[~_MAP_ALLOWED[arr]][:10]).decode(ENCODING, 'replace')
+        raise ValueError("Can't convert map value: "
+                         "unexpected {!r}".format(bad))
+
+    is_digit = (arr >= 48) & (arr <= 57)
+    edges = np.diff(np.concatenate(([0], is_digit.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if starts.size % 2:
+        raise ValueError("Can't convert map value: odd number of values")
+    if not starts.size:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # Weight each digit by 10**(its position from the end of its run).
+    lengths = ends - starts
+    if lengths.max() > len(_POW10):
+        raise ValueError("Can't convert map value: number too large")
+    digit_pos = np.flatnonzero(is_digit)
+    place = np.repeat(ends, lengths) - 1 - digit_pos
+    weighted = (arr[digit_pos] - 48).astype(np.int64) * _POW10[place]
+    run_offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    values = np.add.reduceat(weighted, run_offsets)
+    return values.reshape(-1, 2)
+
+
+def exclusion_grid(pairs, shape=None):
+    """
+    Returns the (rows, cols) bool grid of die *not* in an exclusion array.
+
+    If ``shape`` (the section's Rows, Cols) is given, the grid is exactly
+    that size and exclusions outside it are ignored, so an empty list is
+    every die. Otherwise the grid is 1..max of each column of the
+    exclusion list, the rule of ``invert_wafer_map``.
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if shape is None:
+        shape = tuple(pairs.max(axis=0)) if len(pairs) else (0, 0)
+    rows, cols = shape
+    grid = np.ones((rows, cols), dtype=bool)
+    keep = ((pairs[:, 0] >= 1) & (pairs[:, 0] <= rows)
+            & (pairs[:, 1] >= 1) & (pairs[:, 1] <= cols))
+    grid[pairs[keep, 0] - 1, pairs[keep, 1] - 1] = False
+    return grid
+
+
+def invert_pairs(pairs, shape=None):
+    """
+    Inverts an (n, 2) exclusion array into a sorted inclusion list.
+
+    Vectorized version of ``invert_wafer_map``. See ``exclusion_grid``
+    for how ``shape`` sets the grid.
+
+    Returns:
+    --------
+    xy_list : list of (int, int) tuples
+    """
+    first, second = np.nonzero(exclusion_grid(pairs, shape))
+    return list(zip((first + 1).tolist(), (second + 1).tolist()))
+
+
+def convert_map_buffer(buf, shape=None):
+    """
+    Buffer equivalent of ``convert_map_list``.
+
+    Pass the section's (Rows, Cols) as ``shape``; without it, die past
+    the last excluded row or column are lost (see ``exclusion_grid``).
+
+    Returns the inclusion list of (row, col) tuples, sorted.
+    """
+    return invert_pairs(decode_map_buffer(buf), shape)
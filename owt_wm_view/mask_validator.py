@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          mask_validator.py
+@created:       Mon Oct 19 13:20:05 2026
+
+Description:
+    Headless validation of the whole OWT mask library.
+
+    Every ``.ini`` file under the mask roots is read in a process pool,
+    with the same reader as ``core.Mask``, and checked for these errors:
+
+    + duplicate keys or sections, and anything else the reader rejects
+    + required sections and [Mask] keys
+    + ``mask_constants.lookup`` resolution of the mask name
+    + Rows / Cols present and numeric
+    + map values that can't be decoded
+
+    and these warnings:
+
+    + map coordinates outside Rows x Cols (ignored when loaded)
+    + duplicate coordinates within a map
+    + maps with no die and maps that are identical to another map
+
+    The result is a JSON report. See ``validate_library``.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import configparser
+import concurrent.futures
+import datetime
+import json
+import os
+import os.path as osp
+import sys
+import time
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import mask_constants
+    from . import mask_mirror
+    from . import mask_reader
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import mask_constants
+        import mask_mirror
+        import mask_reader
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import mask_constants
+        from owt_wm_view import mask_mirror
+        from owt_wm_view import mask_reader
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+WAFER_SECTIONS = ["150mm", "100mm", "50mm"]
+MASK_KEYS = ["Die X", "Die Y", "Flat", "Mask"]
+GRID_KEYS = ["Rows", "Cols", "Home Row", "Home Col", "Start Row", "Start Col"]
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def find_mask_files(roots):
+    """ Returns a sorted list of every .ini file under ``roots`` """
+    files = []
+    for root in roots:
+        for dirpath, _, filenames in os.walk(root):
+            files.extend(osp.join(dirpath, _f)
+                         for _f in filenames
+                         if _f.endswith(".ini"))
+    return sorted(files)
+
+
+def validate_mask_file(path):
+    """
+    Runs all checks on a single mask file.
+
+    The file is read with ``mask_reader.MaskFileReader`` and its maps with
+    ``decode_map_buffer``, the same as ``core.Mask``, so a file fails
+    exactly when the app would fail to load it or it's unusable (no maps,
+    non-positive die size). Anything the app loads but likely isn't
+    intended is a warning.
+
+    This is the process pool worker, so it only takes and returns plain
+    (picklable) data.
+
+    Returns:
+    --------
+    report : dict
+        ``file``, ``mask``, ``ok``, ``errors``, ``warnings``, ``maps``.
+        Each error or warning is a dict of ``check`` and ``detail``.
+    """
+    errors = []
+    warnings = []
+    report = {"file": path,
+              "mask": osp.splitext(osp.basename(path))[0],
+              "errors": errors,
+              "warnings": warnings,
+              "maps": 0,
+              }
+
+    def error(check, detail):
+        errors.append({"check": check, "detail": detail})
+
+    def warn(check, detail):
+        warnings.append({"check": check, "detail": detail})
+
+    try:
+        reader = mask_reader.MaskFileReader(path)
+    except (configparser.DuplicateSectionError,
+            configparser.DuplicateOptionError) as err:
+        error("duplicate", str(err))
+    except (OSError, configparser.Error) as err:
+        error("parse", str(err))
+    else:
+        with reader:
+            _check_mask_info(reader, error)
+            report["maps"] = _check_maps(reader, error, warn)
+
+    report["ok"] = not errors
+    return report
+
+
+def _check_mask_info(reader, error):
+    """ Checks the [Mask] and [Devices] sections """
+    if not reader.has_section("Mask"):
+        error("section", "Missing [Mask] section")
+    else:
+        info = dict(reader.items("Mask"))
+        for key in MASK_KEYS:
+            if key not in info:
+                error("mask_info", "Missing [Mask] key '{}'".format(key))
+        for key in ("Die X", "Die Y"):
+            try:
+                if float(info[key]) <= 0:
+                    error("mask_info", "'{}' must be positive".format(key))
+            except ValueError:
+                error("mask_info", "'{}' is not a number".format(key))
+            except KeyError:
+                pass
+        try:
+            int(info["Flat"])
+        except ValueError:
+            error("mask_info", "'Flat' is not an integer")
+        except KeyError:
+            pass
+        if "Mask" in info:
+            name = info["Mask"][1:-1]
+            try:
+                mask_constants.lookup(name)
+            except Exception as err:
+                error("lookup",
+                      "mask_constants.lookup({!r}) failed: {}".format(name,
+                                                                     err))
+
+    if not reader.has_section("Devices"):
+        error("section", "Missing [Devices] section")
+
+
+def _check_maps(reader, error, warn):
+    """ Checks the wafer size section and its maps; returns the map count """
+    # Same rule as Mask.read_mask_file: the biggest wafer size wins.
+    for section in WAFER_SECTIONS:
+        if reader.has_section(section):
+            break
+    else:
+        error("section",
+              "No wafer section ({})".format(", ".join(WAFER_SECTIONS)))
+        return 0
+
+    keys = reader.keys(section)
+    for key in GRID_KEYS:
+        if key not in keys:
+            error("grid", "Missing [{}] key '{}'".format(section, key))
+    try:
+        shape = (int(reader.get(section, "Rows")),
+                 int(reader.get(section, "Cols")))
+    except configparser.NoOptionError:
+        shape = None
+    except ValueError:
+        error("grid", "Rows/Cols are not integers")
+        shape = None
+
+    map_names = sorted(_k for _k in keys if _k not in GRID_KEYS)
+    if not map_names:
+        error("maps", "[{}] has no maps".format(section))
+
+    seen = {}
+    for map_name in map_names:
+        where = "{}/{}".format(section, map_name)
+        buf = reader.buffer(section, map_name)
+        try:
+            pairs = mask_reader.decode_map_buffer(buf)
+        except ValueError as err:
+            error("coords", "{}: {}".format(where, err))
+            continue
+        finally:
+            buf.release()
+
+        unique, counts = np.unique(pairs, axis=0, return_counts=True)
+        dups = unique[counts > 1]
+        if len(dups):
+            warn("duplicate",
+                 "{}: {} duplicate coordinate(s), e.g. {}".format(
+                     where, len(dups), tuple(dups[0].tolist())))
+
+        if shape is None:
+            continue
+        rows, cols = shape
+        out = ~((pairs[:, 0] >= 1) & (pairs[:, 0] <= rows)
+                & (pairs[:, 1] >= 1) & (pairs[:, 1] <= cols))
+        if out.any():
+            warn("bounds",
+                 "{}: {} coordinate(s) outside {}x{} are ignored, "
+                 "e.g. {}".format(where, int(out.sum()), rows, cols,
+                                  tuple(pairs[out][0].tolist())))
+
+        # Maps are exclusion lists: this is the map as the app loads it.
+        grid = mask_reader.exclusion_grid(pairs, shape)
+        if not grid.any():
+            warn("empty", "{}: map contains no die".format(where))
+        key = grid.tobytes()
+        if key in seen:
+            warn("duplicate",
+                 "{}: identical to map '{}'".format(where, seen[key]))
+        else:
+            seen[key] = map_name
+
+    return len(map_names)
+
+
+def validate_library(roots=None, jobs=None):
+    """
+    Validates every mask file under ``roots`` using a process pool.
+
+    Where processes are spawned (Windows), every worker re-imports the
+    ``__main__`` module, so call this from ``cli`` or another script that
+    doesn't import wx or set up logging at import.
+
+    Parameters:
+    -----------
+    roots : list of str, optional
+        Directories to search. Defaults to ``mask_mirror.mask_roots()``.
+    jobs : int, optional
+        Number of worker processes. Defaults to the CPU count.
+
+    Returns:
+    --------
+    report : dict
+        The full, JSON-serializable library report.
+    """
+    if not roots:
+        roots = mask_mirror.mask_roots()
+    start = time.time()
+    files = find_mask_files(roots)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        chunksize = max(1, len(files) // (4 * (jobs or os.cpu_count() or 1)))
+        results = list(pool.map(validate_mask_file, files,
+                                chunksize=chunksize))
+
+    failed = [_r["file"] for _r in results if not _r["ok"]]
+    return {"generated": datetime.datetime.now().isoformat(),
+            "roots": list(roots),
+            "elapsed_s": round(time.time() - start, 3),
+            "summary": {"files": len(results),
+                        "ok": len(results) - len(failed),
+                        "failed": len(failed),
+                        "warnings": sum(len(_r["warnings"])
+                                        for _r in results),
+                        },
+            "files": results,
+            }
+
+
+def main(roots=None, jobs=None, output=None):
+    """
+    Runs the validator and writes the JSON report.
+
+    The report goes to ``output`` if given, otherwise stdout.
+
+    Returns:
+    --------
+    exit_code : int
+        0 if every file passed, 1 otherwise.
+    """
+    report = validate_library(roots, jobs)
+    if output:
+        with open(output, 'w') as openf:
+            json.dump(report, openf, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 1 if report["summary"]["failed"] else 0
@@ -5,63 +5,123 @@
 @name:          owt_wafer_map_viewer.py
 @created:       Mon Feb 23 14:55:23 2015
 
-Usage:
-    owt_wafer_map_viewer.py
-
-Options:
-    -h --help           # Show this screen.
-    --version           # Show version.
-
 Description:
     Allows the user to load the various OWT wafer map files and displayes
     them.
+
+    Started by ``cli.py``, which also has the headless commands.
 """
 
 # ---------------------------------------------------------------------------
 ### Imports
 # ---------------------------------------------------------------------------
 # Standard Library
-import configparser
+import collections
 import itertools
-import math
-import os
-import os.path as osp
+import logging
+import threading
 
 # Third-Party
-from docopt import docopt
 import numpy as np
 import wafer_map.wm_core as wm_core
 import wafer_map.gen_fake_data as gen_fake_data
 import wafer_map.wm_info as wm_info
 import wafer_map.wm_utils as wm_utils
 import wx
+import wx.grid
 import wx.lib.plot as wxplot
 from wx.lib.floatcanvas import FloatCanvas
 
 # Package / Application
 try:
     # Imports used by unit test runners
-    from . import mask_constants
+    from . import devices
+    from . import geometry
+    from . import map_generator
+    from . import map_summary
+    from . import mask_mirror
+    from . import probe_path
+    from . import render
+    from . import resample
+    from . import sampling
+    from . import selection
+    from . import tiles
+    from . import yield_map
+    from . import zones
+    from .core import (LoadCancelled,
+                       Mask,
+                       convert_map_list,  # noqa: F401
+                       dictpop,  # noqa: F401
+                       format_map_list,  # noqa: F401
+                       invert_wafer_map,  # noqa: F401
+                       xyd_dict_to_xyd_tuple,
+                       )
     from . import (__project_name__,
                    __version__,
                    __released__,
+                   get_ring_buffer,
+                   setup_logging,
                    )
 #    logging.debug("Imports for UnitTests")
 except SystemError:
     try:
         # Imports used by Spyder
-        import mask_constants
+        import devices
+        import geometry
+        import map_generator
+        import map_summary
+        import mask_mirror
+        import probe_path
+        import render
+        import resample
+        import sampling
+        import selection
+        import tiles
+        import yield_map
+        import zones
+        from core import (LoadCancelled,
+                          Mask,
+                          convert_map_list,  # noqa: F401
+                          dictpop,  # noqa: F401
+                          format_map_list,  # noqa: F401
+                          invert_wafer_map,  # noqa: F401
+                          xyd_dict_to_xyd_tuple,
+                          )
         from __init__ import (__project_name__,
                               __version__,
                               __released__,
+                              get_ring_buffer,
+                              setup_logging,
                               )
 #        logging.debug("Imports for Spyder IDE")
     except ImportError:
          # Imports used by cx_freeze
-        from owt_wm_view import mask_constants
+        from owt_wm_view import devices
+        from owt_wm_view import geometry
+        from owt_wm_view import map_generator
+        from owt_wm_view import map_summary
+        from owt_wm_view import mask_mirror
+        from owt_wm_view import probe_path
+        from owt_wm_view import render
+        from owt_wm_view import resample
+        from owt_wm_view import sampling
+        from owt_wm_view import selection
+        from owt_wm_view import tiles
+        from owt_wm_view import yield_map
+        from owt_wm_view import zones
+        from owt_wm_view.core import (LoadCancelled,
+                                      Mask,
+                                      convert_map_list,  # noqa: F401
+                                      dictpop,  # noqa: F401
+                                      format_map_list,  # noqa: F401
+                                      invert_wafer_map,  # noqa: F401
+                                      xyd_dict_to_xyd_tuple,
+                                      )
         from owt_wm_view import (__project_name__,
                                  __version__,
                                  __released__,
+                                 get_ring_buffer,
+                                 setup_logging,
                                  )
 #        logging.debug("imports for Executable")
 
@@ -69,10 +129,21 @@ except SystemError:
 # ---------------------------------------------------------------------------
 ### Module Constants
 # ---------------------------------------------------------------------------
-MASK_PATH = "Z:\\Software\\LabView\\OWT\\masks"
 __window_title__ = "{} v{}   Released {}".format(__project_name__,
                                                  __version__,
                                                  __released__)
+LOG_VIEW_REFRESH_MS = 500
+PREVIEW_THROTTLE_MS = 50       # slider preview redraw throttle
+SAMPLING_DEBOUNCE_MS = 250     # resample once the settings stop changing
+SAMPLING_MAX_DIE = 2000        # largest sample the dialog will preview
+EQ_AREA_BIN_MM2 = 2000         # area of each equal-area radius bin
+HOVER_THROTTLE_MS = 30         # at most one hover update per this time
+TOOL_CLICK = "click"           # left click toggles one die
+TOOL_RECT = "rect"             # left drag selects a rectangle
+TOOL_LASSO = "lasso"           # left drag selects a freehand polygon
+TILE_CACHE_SIZE = 256          # tile bitmaps kept, not counting level 0
+TILE_REDRAW_MS = 30            # batch redraws as rendered tiles arrive
+
 
 # ---------------------------------------------------------------------------
 ### Classes
@@ -81,10 +152,13 @@ __window_title__ = "{} v{}   Released {}".format(__project_name__,
 class MainApp(object):
     """ Main Application """
     def __init__(self):
+        self.mirror = mask_mirror.get_mirror()
+        self.mirror.start()
         self.app = wx.App()
         self.frame = MainUI()
         self.frame.Show()
         self.app.MainLoop()
+        self.mirror.stop()
 
 
 class MainUI(wx.Frame):
@@ -116,7 +190,37 @@ class MainUI(wx.Frame):
 
         # Set the MenuBar and create a status bar (easy thanks to wx.Frame)
         self.SetMenuBar(self.menu_bar)
-        self.CreateStatusBar()
+        self.CreateStatusBar(2)
+        self.GetStatusBar().SetStatusWidths([-1, 150])
+
+        # Load progress gauge lives in the 2nd status bar field.
+        self.gauge = wx.Gauge(self.GetStatusBar(), wx.ID_ANY, range=100)
+        self.gauge.Hide()
+        self.GetStatusBar().Bind(wx.EVT_SIZE, self._on_statusbar_size)
+        self._on_statusbar_size(None)
+
+    def _on_statusbar_size(self, event):
+        """ Keeps the progress gauge inside its status bar field """
+        rect = self.GetStatusBar().GetFieldRect(1)
+        self.gauge.SetPosition((rect.x + 2, rect.y + 2))
+        self.gauge.SetSize((rect.width - 4, rect.height - 4))
+        if event is not None:
+            event.Skip()
+
+    def set_progress(self, done, total, text=None):
+        """
+        Shows load progress in the status bar.
+
+        ``total`` of 0 (or ``done >= total``) hides the gauge.
+        """
+        if total and done < total:
+            self.gauge.SetRange(total)
+            self.gauge.SetValue(done)
+            self.gauge.Show()
+        else:
+            self.gauge.Hide()
+        if text is not None:
+            self.SetStatusText(text, 0)
 
     def _create_menus(self):
         """ Create each menu for the menu bar """
@@ -128,6 +232,21 @@ class MainUI(wx.Frame):
     def _create_menu_items(self):
         """ Create each item for each menu """
         ### Menu: File (mf_) ###
+        self.mf_load_yield = wx.MenuItem(self.mfile,
+                                         wx.ID_ANY,
+                                         "Load &Yield Data...",
+                                         "Stack wafer pass/fail results",
+                                         )
+        self.mf_save_mask = wx.MenuItem(self.mfile,
+                                        wx.ID_ANY,
+                                        "&Save Mask As...",
+                                        "Save the mask, including new maps",
+                                        )
+        self.mf_cancel_load = wx.MenuItem(self.mfile,
+                                          wx.ID_ANY,
+                                          "Cancel &Load\tEsc",
+                                          "Stop the load in progress",
+                                          )
         self.mf_close = wx.MenuItem(self.mfile,
                                     wx.ID_ANY,
                                     "&Close\tCtrl+Q",
@@ -140,6 +259,50 @@ class MainUI(wx.Frame):
                                      "&Redraw",
                                      "Force Redraw",
                                      )
+        self.me_edge_map = wx.MenuItem(self.medit,
+                                       wx.ID_ANY,
+                                       "Generate &Edge Exclusion Map...",
+                                       "Create a map from the mask geometry",
+                                       )
+        self.me_sampling_map = wx.MenuItem(self.medit,
+                                           wx.ID_ANY,
+                                           "Generate &Sampling Map...",
+                                           "Create a sparse map to sample "
+                                           "the displayed die",
+                                           )
+        self.me_mask_overlay = wx.MenuItem(self.medit,
+                                           wx.ID_ANY,
+                                           "&Overlay Map From Mask...",
+                                           "Resample another mask's map onto "
+                                           "this mask's grid",
+                                           )
+        self.me_tool_click = wx.MenuItem(self.medit,
+                                         wx.ID_ANY,
+                                         "&Click to Toggle Die",
+                                         "Left click adds or removes one die",
+                                         wx.ITEM_RADIO,
+                                         )
+        self.me_tool_rect = wx.MenuItem(self.medit,
+                                        wx.ID_ANY,
+                                        "Rec&tangle Select\tR",
+                                        "Drag a rectangle: invert the die "
+                                        "in it (Shift adds, Ctrl removes, "
+                                        "Alt only highlights)",
+                                        wx.ITEM_RADIO,
+                                        )
+        self.me_tool_lasso = wx.MenuItem(self.medit,
+                                         wx.ID_ANY,
+                                         "L&asso Select",
+                                         "Drag a lasso: invert the die in it "
+                                         "(Shift adds, Ctrl removes, Alt "
+                                         "only highlights)",
+                                         wx.ITEM_RADIO,
+                                         )
+        self.me_ring_edit = wx.MenuItem(self.medit,
+                                        wx.ID_ANY,
+                                        "Edit Ring Ran&ge...",
+                                        "Add, remove or invert a radius range",
+                                        )
 
         ### Menu: View (mv_) ###
         self.mv_zoomfit = wx.MenuItem(self.mview,
@@ -165,6 +328,42 @@ class MainUI(wx.Frame):
                                      "Show or hide the legend",
                                      wx.ITEM_CHECK,
                                      )
+        self.mv_devices = wx.MenuItem(self.mview,
+                                      wx.ID_ANY,
+                                      "Device Overlay\tD",
+                                      "Show the device sites; needs 'X, Y'"
+                                      " offsets (um) in [Devices]",
+                                      wx.ITEM_CHECK,
+                                      )
+        self.mv_probe_path = wx.MenuItem(self.mview,
+                                         wx.ID_ANY,
+                                         "Probe Path\tP",
+                                         "Show the optimized probe sequence",
+                                         wx.ITEM_CHECK,
+                                         )
+        self.mv_tiles = wx.MenuItem(self.mview,
+                                    wx.ID_ANY,
+                                    "&Tiled Rendering\tCtrl+T",
+                                    "Draw the die from cached image tiles "
+                                    "for fast pan and zoom on large maps",
+                                    wx.ITEM_CHECK,
+                                    )
+        self.mv_zones = wx.MenuItem(self.mview,
+                                    wx.ID_ANY,
+                                    "&Zone Analysis...",
+                                    "Ring and sector zone analysis",
+                                    )
+        self.mv_summary = wx.MenuItem(self.mview,
+                                      wx.ID_ANY,
+                                      "&Map Summary...",
+                                      "Die count, radius and extent of "
+                                      "every map",
+                                      )
+        self.mv_log = wx.MenuItem(self.mview,
+                                  wx.ID_ANY,
+                                  "Show L&og",
+                                  "Show recent log messages",
+                                  )
 
         # Menu: Options (mo_) ###
         self.mo_test = wx.MenuItem(self.mopts,
@@ -172,6 +371,11 @@ class MainUI(wx.Frame):
                                    "&Test",
                                    "Nothing",
                                    )
+        self.mo_device_filter = wx.MenuItem(self.mopts,
+                                            wx.ID_ANY,
+                                            "Device &Filter...",
+                                            "Choose which devices to overlay",
+                                            )
         self.mo_high_color = wx.MenuItem(self.mopts,
                                          wx.ID_ANY,
                                          "Set &High Color",
@@ -185,17 +389,38 @@ class MainUI(wx.Frame):
 
     def _add_menu_items(self):
         """ Appends MenuItems to each menu """
+        self.mfile.Append(self.mf_load_yield)
+        self.mfile.Append(self.mf_save_mask)
+        self.mfile.Append(self.mf_cancel_load)
+        self.mfile.AppendSeparator()
         self.mfile.Append(self.mf_close)
 
         self.medit.Append(self.me_redraw)
+        self.medit.AppendSeparator()
+        self.medit.Append(self.me_edge_map)
+        self.medit.Append(self.me_sampling_map)
+        self.medit.Append(self.me_mask_overlay)
+        self.medit.AppendSeparator()
+        self.medit.Append(self.me_tool_click)
+        self.medit.Append(self.me_tool_rect)
+        self.medit.Append(self.me_tool_lasso)
+        self.medit.Append(self.me_ring_edit)
 
         self.mview.Append(self.mv_zoomfit)
         self.mview.AppendSeparator()
         self.mview.Append(self.mv_crosshairs)
         self.mview.Append(self.mv_outline)
         self.mview.Append(self.mv_legend)
+        self.mview.Append(self.mv_devices)
+        self.mview.Append(self.mv_probe_path)
+        self.mview.Append(self.mv_tiles)
+        self.mview.AppendSeparator()
+        self.mview.Append(self.mv_zones)
+        self.mview.Append(self.mv_summary)
+        self.mview.Append(self.mv_log)
 
         self.mopts.Append(self.mo_test)
+        self.mopts.Append(self.mo_device_filter)
         self.mopts.Append(self.mo_high_color)
         self.mopts.Append(self.mo_low_color)
 
@@ -209,10 +434,27 @@ class MainUI(wx.Frame):
     def _bind_events(self):
         """ Binds events to varoius MenuItems """
         self.Bind(wx.EVT_MENU, self.on_quit, self.mf_close)
+        self.Bind(wx.EVT_MENU, self.on_load_yield, self.mf_load_yield)
+        self.Bind(wx.EVT_MENU, self.on_save_mask, self.mf_save_mask)
+        self.Bind(wx.EVT_MENU, self.on_cancel_load, self.mf_cancel_load)
+        self.Bind(wx.EVT_MENU, self.on_edge_map, self.me_edge_map)
+        self.Bind(wx.EVT_MENU, self.on_sampling_map, self.me_sampling_map)
+        self.Bind(wx.EVT_MENU, self.on_mask_overlay, self.me_mask_overlay)
+        self.Bind(wx.EVT_MENU, self.on_select_tool, self.me_tool_click)
+        self.Bind(wx.EVT_MENU, self.on_select_tool, self.me_tool_rect)
+        self.Bind(wx.EVT_MENU, self.on_select_tool, self.me_tool_lasso)
+        self.Bind(wx.EVT_MENU, self.on_ring_edit, self.me_ring_edit)
         self.Bind(wx.EVT_MENU, self.zoom_fit, self.mv_zoomfit)
         self.Bind(wx.EVT_MENU, self.toggle_crosshairs, self.mv_crosshairs)
         self.Bind(wx.EVT_MENU, self.toggle_outline, self.mv_outline)
         self.Bind(wx.EVT_MENU, self.toggle_legend, self.mv_legend)
+        self.Bind(wx.EVT_MENU, self.show_log, self.mv_log)
+        self.Bind(wx.EVT_MENU, self.show_zones, self.mv_zones)
+        self.Bind(wx.EVT_MENU, self.show_summary, self.mv_summary)
+        self.Bind(wx.EVT_MENU, self.toggle_devices, self.mv_devices)
+        self.Bind(wx.EVT_MENU, self.toggle_probe_path, self.mv_probe_path)
+        self.Bind(wx.EVT_MENU, self.toggle_tiles, self.mv_tiles)
+        self.Bind(wx.EVT_MENU, self.filter_devices, self.mo_device_filter)
         self.Bind(wx.EVT_MENU, self.change_high_color, self.mo_high_color)
         self.Bind(wx.EVT_MENU, self.change_low_color, self.mo_low_color)
 
@@ -220,9 +462,63 @@ class MainUI(wx.Frame):
         """ Actions for the quit event """
         self.Close(True)
 
+    def on_load_yield(self, event):
+        """ Ask for wafer result files and show their stacked yield """
+        fd = wx.FileDialog(self,
+                           "Choose wafer result files",
+                           wildcard="CSV files (*.csv)|*.csv|All files|*.*",
+                           style=wx.FD_OPEN | wx.FD_MULTIPLE,
+                           )
+        if fd.ShowModal() == wx.ID_OK:
+            self.panel.show_yield(fd.GetPaths())
+        fd.Destroy()
+
+    def on_cancel_load(self, event):
+        """ Cancels the mask, map or yield load in progress """
+        self.panel.cancel_load()
+
+    def on_save_mask(self, event):
+        """ Saves the current mask (and any added maps) to a new file """
+        fd = wx.FileDialog(self,
+                           "Save mask as",
+                           defaultFile=self.panel.mask_data.mask_filename,
+                           wildcard="Mask files (*.ini)|*.ini",
+                           style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+                           )
+        if fd.ShowModal() == wx.ID_OK:
+            self.panel.mask_data.write_mask_file(fd.GetPath())
+            logging.info("Saved mask to %s", fd.GetPath())
+        fd.Destroy()
+
+    def on_edge_map(self, event):
+        """ Opens the edge exclusion map generator """
+        EdgeExclusionDialog(self, self.panel).Show()
+
+    def on_sampling_map(self, event):
+        """ Opens the sampling map generator """
+        SamplingDialog(self, self.panel).Show()
+
+    def on_mask_overlay(self, event):
+        """ Opens the cross-mask overlay dialog """
+        MaskOverlayDialog(self, self.panel).Show()
+
+    def on_select_tool(self, event):
+        """ Sets the wafer map's left-mouse tool from the Edit menu """
+        if self.me_tool_rect.IsChecked():
+            self.panel.select_tool = TOOL_RECT
+        elif self.me_tool_lasso.IsChecked():
+            self.panel.select_tool = TOOL_LASSO
+        else:
+            self.panel.select_tool = TOOL_CLICK
+        logging.debug("Selection tool: %s", self.panel.select_tool)
+
+    def on_ring_edit(self, event):
+        """ Opens the ring range edit dialog """
+        RingEditDialog(self, self.panel).Show()
+
     def zoom_fit(self, event):
         """ Call the WaferMapPanel.zoom_fill() method """
-        print("Frame Event!")
+        logging.debug("Zoom fit requested")
         self.panel.wm_panel.zoom_fill()
 
     def toggle_crosshairs(self, event):
@@ -237,34 +533,76 @@ class MainUI(wx.Frame):
         """ Call the WaferMapPanel.toggle_legend() method """
         self.panel.wm_panel.toggle_legend()
 
+    def toggle_devices(self, event):
+        """ Call the MainPanel.toggle_devices() method """
+        self.panel.toggle_devices()
+
+    def toggle_probe_path(self, event):
+        """ Call the MainPanel.toggle_probe_path() method """
+        self.panel.toggle_probe_path()
+
+    def toggle_tiles(self, event):
+        """ Call the MainPanel.toggle_tiles() method """
+        self.panel.toggle_tiles()
+
+    def filter_devices(self, event):
+        """ Let the user pick which devices are overlaid """
+        names = self.panel.mask_data.device_names
+        dlg = wx.MultiChoiceDialog(self,
+                                   "Devices to show",
+                                   "Device Filter",
+                                   names,
+                                   )
+        current = self.panel.device_filter
+        dlg.SetSelections([_i for _i, _n in enumerate(names)
+                           if current is None or _n in current])
+        if dlg.ShowModal() == wx.ID_OK:
+            selected = [names[_i] for _i in dlg.GetSelections()]
+            self.panel.set_device_filter(selected)
+        dlg.Destroy()
+
+    def show_zones(self, event):
+        """ Call the MainPanel.show_zones() method """
+        self.panel.show_zones()
+
+    def show_summary(self, event):
+        """ Call the MainPanel.show_summary() method """
+        self.panel.show_summary()
+
+    def show_log(self, event):
+        """ Opens the log viewer window """
+        LogFrame(self).Show()
+
     def change_high_color(self, event):
-        print("High color menu item clicked!")
+        logging.debug("High color menu item clicked")
         cd = wx.ColourDialog(self)
         cd.GetColourData().SetChooseFull(True)
 
         if cd.ShowModal() == wx.ID_OK:
             new_color = cd.GetColourData().Colour
-            print("The color {} was chosen!".format(new_color))
+            logging.info("The color %s was chosen", new_color)
             self.panel.wm_panel.on_color_change({'high': new_color,
                                                  'low': None})
+            self.panel.on_color_change()
             self.panel.wm_panel.Refresh()
         else:
-            print("no color chosen :-(")
+            logging.debug("No color chosen")
         cd.Destroy()
 
     def change_low_color(self, event):
-        print("Low Color menu item clicked!")
+        logging.debug("Low color menu item clicked")
         cd = wx.ColourDialog(self)
         cd.GetColourData().SetChooseFull(True)
 
         if cd.ShowModal() == wx.ID_OK:
             new_color = cd.GetColourData().Colour
-            print("The color {} was chosen!".format(new_color))
+            logging.info("The color %s was chosen", new_color)
             self.panel.wm_panel.on_color_change({'high': None,
                                                  'low': new_color})
+            self.panel.on_color_change()
             self.panel.wm_panel.Refresh()
         else:
-            print("no color chosen :-(")
+            logging.debug("No color chosen")
         cd.Destroy()
 
 
@@ -277,16 +615,58 @@ class MainPanel(wx.Panel):
         self.mask_names = []
         self.wafer_maps = []
         self.mask_data = None
+        self.die_index = None
+        self.device_sites = None
+        self.device_filter = None           # None means all devices
+        self.show_devices = False
+        self._device_overlay = None
+        self._highlight_overlay = None
+        self._mask_overlay = []
+        self.show_probe_path = False
+        self.probe_path = None
+        self._probe_overlay = None
+        self.zone_frame = None
+        self.summary_frame = None
+        self.tile_mode = False
+        self._tile_layer = None
+        self.tile_renderer = tiles.TileRenderer(self._on_tile_rendered)
+        self._hover_coords = None
+        self._hover_grid = None
+        self.select_tool = TOOL_CLICK
+        self._drag_points = None            # canvas coords of a drag
+        self._drag_band = None
+        self.loader = BackgroundLoader(self._on_load_progress)
 
         self.init_data()
         self.init_ui()
 
     def init_data(self):
-        """ Gets a list of all the masks available """
-        self.mask_names = sorted([osp.splitext(_m)[0]
-                                  for _m
-                                  in os.listdir(MASK_PATH)
-                                  if _m.endswith(".ini")])
+        """
+        Gets a list of all the masks available in the local mirror.
+
+        The mirror isn't synced here; on the first run the list is filled
+        in when the background sync has copied the masks.
+        """
+        mirror = mask_mirror.get_mirror()
+        mirror.add_sync_listener(self._on_mirror_sync)
+        self.mask_names = mirror.list_masks(sync=False)
+
+    def _on_mirror_sync(self, copied):
+        """ Called on the mirror's sync thread when files were copied """
+        wx.CallAfter(self._refresh_mask_list)
+
+    def _refresh_mask_list(self):
+        """ Updates the Mask ListBox, keeping the selection """
+        if not self:                    # the panel was destroyed
+            return
+        names = mask_mirror.get_mirror().list_masks(sync=False)
+        if names == self.mask_names:
+            return
+        selected = self.mask_lb.GetStringSelection()
+        self.mask_names = names
+        self.mask_lb.Set(names)
+        if selected in names:
+            self.mask_lb.SetStringSelection(selected)
 
     def init_ui(self):
         """ Init the UI Components """
@@ -316,22 +696,26 @@ class MainPanel(wx.Panel):
                                               plot_die_centers=False,
                                               )
         self.wafer_info = wafer_info
-        # Hack! FixMe!
-        self.mask_data = Mask("07G11")
-        self.mask_data.die_xy = wafer_info.die_size
-        self.mask_data.center_xy = wafer_info.center_xy
-        self.mask_data.dia = wafer_info.dia
+        # Not read from a file: the mirror may be empty and the share down.
+        self.mask_data = Mask.placeholder(wafer_info.die_size,
+                                          wafer_info.center_xy,
+                                          wafer_info.dia,
+                                          max(_y for _, _y, _ in xyd),
+                                          max(_x for _x, _, _ in xyd),
+                                          )
         self.read_mask_data(xyd)
+        self._build_die_index()
 
         self.stats_block = StatsBlock(self)
 
         # Create the radius plots
-        radius_sqrd_data = list(
-           (wafer_info.die_size[0] * (wafer_info.center_xy[0] - die[0]))**2
-           + (wafer_info.die_size[1] * (wafer_info.center_xy[1] - die[1]))**2
-           for die in xyd)
-        radius_data = list(math.sqrt(item) for item in radius_sqrd_data)
-        self.radius_plots = RadiusPlots(self, radius_data)
+        self.radius_plots = RadiusPlots(self,
+                                        self.die_index.radius,
+                                        self.mask_data.dia,
+                                        on_select=self.highlight_die,
+                                        )
+
+        self._hover_timer = wx.Timer(self)
 
         # Create our layout manager
         self.hbox = wx.BoxSizer(wx.HORIZONTAL)
@@ -363,7 +747,13 @@ class MainPanel(wx.Panel):
             self.xyd = xyd
         self.xyd_dict = wm_core.xyd_to_dict(self.xyd)
 
-    def update_canvas(self):
+    def update_canvas(self, data_type='discrete'):
+        """
+        Redraws the wafer map, stats and radius plots from ``self.xyd``.
+
+        For ``continuous`` data (such as yield) the radius histograms are
+        weighted by each die's value.
+        """
         # Create a new xyd list based on the mask
         self.wafer_info = wm_info.WaferInfo(self.mask_data.die_xy,
                                             self.mask_data.center_xy,
@@ -371,54 +761,556 @@ class MainPanel(wx.Panel):
                                             4.5,
                                             4.5)
 
+        self._build_die_index()
+
         # All these things just so that I can update the map...
         self.wm_panel.canvas.InitAll()
         self.wm_panel._clear_canvas()
+        self._tile_layer = None
         self.wm_panel.die_size = self.mask_data.die_xy
         self.wm_panel.xyd = self.xyd
         self.wm_panel.wafer_info = self.wafer_info
         self.wm_panel.grid_center = self.mask_data.center_xy
         self.wm_panel.xyd_dict = self.xyd_dict
+        self.wm_panel.data_type = data_type
+        if data_type != 'continuous':
+            # Don't carry a fixed range (such as yield's) to other maps.
+            self.wm_panel.plot_range = None
         self.wm_panel._create_legend()
-        self.wm_panel.draw_die()
+        if self.tile_mode:
+            self.draw_tile_layer(data_type)
+        else:
+            self.tile_renderer.set_source(None)
+            self.wm_panel.draw_die()
         self.wm_panel.draw_wafer_objects()
         self.wm_panel.zoom_fill()
 
         self.stats_block.update_stats(self.xyd)
 
-        radius_sqrd_data = [
-           (self.wafer_info.die_size[0] * (self.wafer_info.center_xy[0] - die[0]))**2
-           + (self.wafer_info.die_size[1] * (self.wafer_info.center_xy[1] - die[1]))**2
-           for die in self.xyd]
-        new_radius_data = list(math.sqrt(item) for item in radius_sqrd_data)
-        self.radius_plots.update(new_radius_data)
+        self._device_overlay = None
+        self.draw_device_overlay()
+        self._probe_overlay = None
+        self.probe_path = None
+        self.draw_probe_path()
+        weights = None
+        if data_type == 'continuous':
+            weights = self.die_index.data
+        self.radius_plots.update(self.die_index.radius,
+                                 weights,
+                                 self.mask_data.dia,
+                                 )
+        self._highlight_overlay = None
+        self._mask_overlay = []
+        if self.zone_frame is not None:
+            self.zone_frame.update_zones()
 
         self.Refresh()
         self.Update()
 
+    def _build_die_index(self):
+        """ Precomputes the grid -> die lookup used by hover and plots """
+        self.die_index = geometry.GridIndex(self.xyd,
+                                            self.mask_data.die_xy,
+                                            self.mask_data.center_xy,
+                                            )
+        self._hover_grid = None
+
+    def _canvas_transform(self):
+        """
+        Returns the (origin, step) of the grid -> canvas transform.
+
+        Taken from wm_utils so that vectorized coordinates match the die
+        drawn by wafer_map.
+        """
+        die_size = self.wm_panel.die_size
+        grid_center = self.wm_panel.grid_center
+        origin = np.array(wm_utils.grid_to_rect_coord((0, 0),
+                                                      die_size,
+                                                      grid_center,
+                                                      ))
+        step = np.array(wm_utils.grid_to_rect_coord((1, 1),
+                                                    die_size,
+                                                    grid_center,
+                                                    )) - origin
+        return origin, step
+
+    def _get_device_sites(self):
+        """ Returns the DeviceSites for the mask, computing it once """
+        if self.device_sites is None:
+            origin, step = self._canvas_transform()
+            centers = geometry.grid_die_centers(self.mask_data.row_count,
+                                                self.mask_data.col_count,
+                                                origin,
+                                                step,
+                                                self.mask_data.die_xy,
+                                                )
+            names, offsets = devices.parse_device_offsets(
+                self.mask_data.devices)
+            self.device_sites = devices.DeviceSites(centers[0],
+                                                    centers[1],
+                                                    names,
+                                                    offsets,
+                                                    )
+        return self.device_sites
+
+    def draw_device_overlay(self):
+        """
+        Draws the device sites of every die in the map.
+
+        All sites are drawn as one PointSet, so the canvas only has one
+        extra object no matter how many die or devices there are.
+        """
+        canvas = self.wm_panel.canvas
+        if self._device_overlay is None and not self.show_devices:
+            return
+        if self._device_overlay is not None:
+            canvas.RemoveObject(self._device_overlay)
+            self._device_overlay = None
+
+        if self.show_devices:
+            rows = int(self.mask_data.row_count)
+            cols = int(self.mask_data.col_count)
+            die_mask = geometry.grid_mask(self.die_index.x,
+                                          self.die_index.y,
+                                          rows,
+                                          cols,
+                                          )
+            sites = self._get_device_sites()
+            if not len(sites.names):
+                self.parent.SetStatusText("No device positions: [Devices] "
+                                          "values aren't 'X, Y' offsets "
+                                          "in um")
+            points = sites.select(die_mask, self.device_filter)
+            if len(points):
+                self._device_overlay = FloatCanvas.PointSet(
+                    points,
+                    Color="Black",
+                    Diameter=2,
+                    InForeground=True,
+                )
+                canvas.AddObject(self._device_overlay)
+        canvas.Draw(Force=True)
+
+    def highlight_die(self, die_mask):
+        """
+        Highlights a subset of the displayed die.
+
+        ``die_mask`` is a bool array over ``self.die_index`` (i.e. the
+        xyd list). The highlight is a single PointSet at the die centers,
+        and the highlighted die's share of each radius histogram bar is
+        drawn over the bars. An empty mask clears the highlight.
+        """
+        canvas = self.wm_panel.canvas
+        if self._highlight_overlay is not None:
+            canvas.RemoveObject(self._highlight_overlay)
+            self._highlight_overlay = None
+
+        die_mask = np.asarray(die_mask, dtype=bool)
+        if die_mask.any():
+            origin, step = self._canvas_transform()
+            die_size = np.array(self.wm_panel.die_size)
+            grid = np.column_stack([self.die_index.x[die_mask],
+                                    self.die_index.y[die_mask]])
+            points = origin + step * grid + die_size / 2
+            self._highlight_overlay = FloatCanvas.PointSet(
+                points,
+                Color="Red",
+                Diameter=6,
+                InForeground=True,
+            )
+            canvas.AddObject(self._highlight_overlay)
+        canvas.Draw(Force=True)
+        self.radius_plots.highlight(die_mask)
+
+    def die_in_selection(self, selected):
+        """ Returns the displayed die in a (rows, cols) grid selection """
+        x = self.die_index.x
+        y = self.die_index.y
+        rows, cols = selected.shape
+        inside = (x >= 1) & (x <= cols) & (y >= 1) & (y <= rows)
+        die_mask = np.zeros(x.size, dtype=bool)
+        die_mask[inside] = selected[y[inside] - 1, x[inside] - 1]
+        return die_mask
+
+    def _grid_shape(self):
+        """ Returns (rows, cols) of the mask grid, grown to fit all die """
+        rows = int(self.mask_data.row_count)
+        cols = int(self.mask_data.col_count)
+        if self.die_index.x.size:
+            rows = max(rows, int(self.die_index.y.max()))
+            cols = max(cols, int(self.die_index.x.max()))
+        return rows, cols
+
+    def _grid_centers(self):
+        """ Returns the canvas die-center (x, y) arrays of the grid """
+        rows, cols = self._grid_shape()
+        origin, step = self._canvas_transform()
+        return geometry.grid_die_centers(rows, cols, origin, step,
+                                         self.wm_panel.die_size)
+
+    def select_rect(self, corner_1, corner_2):
+        """ Returns the (rows, cols) grid selection of a canvas rectangle """
+        x, y = self._grid_centers()
+        return selection.rect_select(x, y, corner_1, corner_2)
+
+    def select_lasso(self, points):
+        """ Returns the (rows, cols) grid selection of a canvas polygon """
+        x, y = self._grid_centers()
+        return selection.lasso_select(x, y, points)
+
+    def select_ring(self, r_min, r_max):
+        """ Returns the (rows, cols) grid selection of a radius range """
+        rows, cols = self._grid_shape()
+        col, row = np.meshgrid(np.arange(1, cols + 1),
+                               np.arange(1, rows + 1))
+        radius = geometry.die_radius(col, row,
+                                     self.mask_data.die_xy,
+                                     self.mask_data.center_xy,
+                                     )
+        return selection.ring_select(radius, r_min, r_max)
+
+    def edit_die(self, selected, mode):
+        """
+        Adds, removes or inverts a whole selection of die at once.
+
+        ``selected`` is a (rows, cols) bool array from one of the
+        ``select_*`` methods. The map is redrawn once, and only if
+        something changed. Die that stay keep their values; added die
+        get "Every".
+        """
+        rows, cols = selected.shape
+        current = geometry.grid_mask(self.die_index.x,
+                                     self.die_index.y,
+                                     rows,
+                                     cols,
+                                     )
+        new = selection.apply_edit(current, selected, mode)
+        changed = int(np.count_nonzero(new != current))
+        logging.info("Selection %s: %d die changed", mode, changed)
+        if not changed:
+            return
+
+        grid = "x{}y{}"
+        row_idx, col_idx = np.nonzero(new)
+        self.xyd = []
+        for _x, _y in zip((col_idx + 1).tolist(), (row_idx + 1).tolist()):
+            value = self.xyd_dict.get(grid.format(_x, _y), "Every")
+            self.xyd.append((_x, _y, value))
+        self.xyd_dict = wm_core.xyd_to_dict(self.xyd)
+        self.update_canvas(self.wm_panel.data_type)
+
+    def draw_mask_overlay(self, source_xy=None, covered=None):
+        """
+        Draws another mask's die over the wafer map.
+
+        Parameters:
+        -----------
+        source_xy : (n, 2) float array, optional
+            The other mask's die centers, in this mask's grid coordinates.
+        covered : (rows, cols) bool array, optional
+            This mask's die that the other mask's die cover.
+
+        Each is drawn as a single PointSet. Calling with no arguments
+        clears the overlay.
+        """
+        canvas = self.wm_panel.canvas
+        for obj in self._mask_overlay:
+            canvas.RemoveObject(obj)
+        self._mask_overlay = []
+
+        origin, step = self._canvas_transform()
+        die_size = np.array(self.wm_panel.die_size)
+        if covered is not None and covered.any():
+            rows, cols = np.nonzero(covered)
+            grid = np.column_stack([cols + 1, rows + 1])
+            self._mask_overlay.append(FloatCanvas.PointSet(
+                origin + step * grid + die_size / 2,
+                Color="Red",
+                Diameter=6,
+                InForeground=True,
+            ))
+        if source_xy is not None and len(source_xy):
+            self._mask_overlay.append(FloatCanvas.PointSet(
+                origin + step * source_xy + die_size / 2,
+                Color="Blue",
+                Diameter=2,
+                InForeground=True,
+            ))
+        for obj in self._mask_overlay:
+            canvas.AddObject(obj)
+        canvas.Draw(Force=True)
+
+    def _probe_start(self):
+        """ Returns the grid (x, y) of the mask's probe start position """
+        try:
+            return (int(self.mask_data.start_col),
+                    int(self.mask_data.start_row))
+        except (AttributeError, TypeError, ValueError):
+            if self.die_index.x.size:
+                return int(self.die_index.x[0]), int(self.die_index.y[0])
+            return 1, 1
+
+    def draw_probe_path(self):
+        """
+        Draws the optimized probe sequence through the displayed die.
+
+        The path is computed once per map and drawn as a single Line. The
+        travel and estimated test time are shown in the status bar.
+        """
+        canvas = self.wm_panel.canvas
+        if self._probe_overlay is None and not self.show_probe_path:
+            return
+        if self._probe_overlay is not None:
+            canvas.RemoveObject(self._probe_overlay)
+            self._probe_overlay = None
+
+        if self.show_probe_path and self.die_index.x.size:
+            if self.probe_path is None:
+                self.probe_path = probe_path.optimize_path(
+                    self.die_index.x,
+                    self.die_index.y,
+                    self.mask_data.die_xy,
+                    self._probe_start(),
+                )
+            path = self.probe_path
+            origin, step = self._canvas_transform()
+            die_size = np.array(self.wm_panel.die_size)
+            grid = np.column_stack([np.concatenate(([path.start[0]], path.x)),
+                                    np.concatenate(([path.start[1]], path.y)),
+                                    ])
+            points = origin + step * grid + die_size / 2
+            self._probe_overlay = FloatCanvas.Line(points,
+                                                   LineColor="Blue",
+                                                   LineWidth=1,
+                                                   InForeground=True,
+                                                   )
+            canvas.AddObject(self._probe_overlay)
+
+            times = path.estimate(len(self.mask_data.devices))
+            text = ("Probe path ({}): {} die, {:.0f} mm travel, "
+                    "est. {:.1f} min ({:.2f} s per device test)")
+            text = text.format(path.method,
+                               len(path),
+                               path.travel,
+                               times["total"] / 60,
+                               times["per_device"],
+                               )
+            logging.info(text)
+            self.parent.SetStatusText(text)
+        canvas.Draw(Force=True)
+
+    def toggle_probe_path(self):
+        """ Shows or hides the probe path """
+        self.show_probe_path = not self.show_probe_path
+        self.draw_probe_path()
+
+    def toggle_tiles(self):
+        """ Switches between per-die objects and the tiled die layer """
+        self.tile_mode = not self.tile_mode
+        logging.info("Tiled rendering %s", "on" if self.tile_mode else "off")
+        if self.die_index is not None:
+            self.update_canvas(self.wm_panel.data_type)
+
+    def on_color_change(self):
+        """ Re-renders the tiles after the high or low color changes """
+        if self.tile_mode and self.die_index is not None:
+            self.update_canvas(self.wm_panel.data_type)
+
+    def draw_tile_layer(self, data_type):
+        """
+        Adds the die to the canvas as one TileLayer.
+
+        Used instead of ``wm_panel.draw_die``, which makes one canvas
+        object per die. Continuous data is colored from the panel's low
+        to high color over its plot range; discrete data only shows which
+        die are in the map.
+        """
+        mask = self.mask_data
+        index = self.die_index
+        rows, cols = self._grid_shape()
+        grid = geometry.grid_mask(index.x, index.y, rows, cols)
+        values = None
+        colormap = None
+        if data_type == 'continuous' and index.x.size:
+            data = np.asarray(index.data, dtype=float)
+            low, high = (self.wm_panel.plot_range
+                         or (np.nanmin(data), np.nanmax(data)))
+            keep = (index.x >= 1) & (index.y >= 1)
+            values = np.zeros((rows, cols))
+            values[index.y[keep] - 1, index.x[keep] - 1] = (
+                (data[keep] - low) / ((high - low) or 1))
+            colormap = self._tile_colormap()
+
+        source = tiles.TileSource(grid, mask.die_xy, mask.center_xy,
+                                  mask.dia, values, colormap)
+        origin, step = self._canvas_transform()
+        die_size = np.array(self.wm_panel.die_size)
+        self._tile_layer = TileLayer(
+            self.wm_panel.canvas,
+            self.tile_renderer,
+            source,
+            origin + step * np.array(mask.center_xy) + die_size / 2,
+            step / die_size,
+        )
+        self.wm_panel.canvas.AddObject(self._tile_layer)
+
+    def _tile_colormap(self):
+        """ Returns a (256, 3) ramp from the low to the high color """
+        low = np.array(wx.Colour(self.wm_panel.low_color).Get(False))
+        high = np.array(wx.Colour(self.wm_panel.high_color).Get(False))
+        ramp = np.linspace(0, 1, 256)[:, None]
+        return np.round(low + (high - low) * ramp).astype(np.uint8)
+
+    def _on_tile_rendered(self, key, generation, rgb):
+        """ Worker thread: hands a rendered tile to the main thread """
+        wx.CallAfter(self._add_tile, key, generation, rgb)
+
+    def _add_tile(self, key, generation, rgb):
+        if self._tile_layer is not None:
+            self._tile_layer.add_tile(key, generation, rgb)
+
+    def show_zones(self):
+        """ Opens (or raises) the zone analysis window """
+        if self.zone_frame is None:
+            self.zone_frame = ZoneFrame(self.parent, self)
+            self.zone_frame.Show()
+        else:
+            self.zone_frame.Raise()
+
+    def show_summary(self):
+        """ Opens (or raises) the map summary table """
+        if self.summary_frame is None:
+            self.summary_frame = MapSummaryFrame(self.parent, self)
+            self.summary_frame.Show()
+        else:
+            self.summary_frame.Raise()
+
+    def select_map(self, name):
+        """ Selects a map in the Map ListBox and displays it """
+        self.map_lb.SetStringSelection(name)
+        self._on_map_change(None)
+
+    def toggle_devices(self):
+        """ Shows or hides the device overlay """
+        self.show_devices = not self.show_devices
+        self.draw_device_overlay()
+
+    def set_device_filter(self, names):
+        """ Sets which devices are overlaid and redraws """
+        self.device_filter = list(names)
+        self.draw_device_overlay()
+
+    def show_yield(self, paths):
+        """
+        Stacks the pass/fail results of many wafers on the current mask and
+        displays the per-die yield.
+
+        Wafers are streamed one at a time into per-die counters, so the
+        number of files is only limited by time. The files are read on the
+        loader's worker thread, one progress step per file.
+        """
+        rows = int(self.mask_data.row_count)
+        cols = int(self.mask_data.col_count)
+        paths = list(paths)
+
+        def load(cancel, progress):
+            def on_file(done, path):
+                if cancel.is_set():
+                    raise LoadCancelled()
+                progress(done, len(paths))
+            return yield_map.accumulate_files(paths, rows, cols, on_file)
+
+        self.parent.set_progress(0, len(paths), "Stacking {} wafers...".format(
+            len(paths)))
+        self.loader.start(load, self._on_yield_loaded, self._on_load_error)
+
+    def _on_yield_loaded(self, acc):
+        """ Called on the main thread when the yield is stacked """
+        logging.info("Stacked %d wafers", acc.wafer_count)
+        self.show_xyd(acc.to_xyd(), 'continuous', (0.0, 1.0))
+        self.parent.set_progress(0, 0, "Stacked {} wafers".format(
+            acc.wafer_count))
+
+    def cancel_load(self):
+        """ Cancels the mask, map or yield load in progress """
+        self.loader.cancel()
+        self.parent.set_progress(0, 0, "Load cancelled")
+
+    def show_xyd(self, xyd, data_type='discrete', plot_range=None):
+        """
+        Replaces the displayed die with ``xyd`` and redraws.
+
+        ``plot_range`` is the (low, high) color range of continuous data.
+        The range of the data is used if None.
+        """
+        self.xyd = xyd
+        self.xyd_dict = wm_core.xyd_to_dict(self.xyd)
+        self.wm_panel.plot_range = plot_range
+        self.update_canvas(data_type=data_type)
+
+    def add_map(self, name, rc_list):
+        """ Adds a new map to the current mask and selects it """
+        self.mask_data.add_map(name, rc_list)
+        self.map_lb.Set(self.mask_data.map_names)
+        self.map_lb.SetStringSelection(name)
+        logging.info("Added map '%s' with %d die", name, len(rc_list))
+        if self.summary_frame is not None:
+            self.summary_frame.update_summary()
+
     def _bind_events(self):
         """ Binds events to various controls """
         self.mask_lb.Bind(wx.EVT_LISTBOX, self._on_mask_change)
         self.map_lb.Bind(wx.EVT_LISTBOX, self._on_map_change)
+        self.wm_panel.canvas.Bind(FloatCanvas.EVT_LEFT_DOWN,
+                                  self._on_left_down)
         self.wm_panel.canvas.Bind(FloatCanvas.EVT_LEFT_UP, self._on_die_click)
+        self.wm_panel.canvas.Bind(FloatCanvas.EVT_MOTION, self._on_motion)
+        self.Bind(wx.EVT_TIMER, self._on_hover_timer, self._hover_timer)
 
     def _on_mask_change(self, event):
         """ Fires when user selects a different item in the Mask ListBox """
         mask = self.mask_lb.GetStringSelection()
-        print("Mask Changed to: {}".format(mask))
+        logging.info("Mask changed to: %s", mask)
         self._update_map_list(mask)
 
     def _update_map_list(self, mask):
         """
         Reads the mask file for the selected mask and updates the Map
         ListBox with all of the wafer maps. Assumes 150mm wafer.
+
+        The mask is read on a worker thread. Picking another mask (or a
+        map) before it finishes cancels it.
         """
-        # Create an instance of the Mask class
-        self.mask_data = Mask(mask)
+        # Edit the Map ListBox: First Clear it. Items come when it's loaded.
+        self.map_lb.Clear()
+
+        def load(cancel, progress):
+            return Mask(mask, progress=progress, cancel=cancel)
+
+        self.parent.set_progress(0, 1, "Loading mask {}...".format(mask))
+        self.loader.start(load, self._on_mask_loaded, self._on_load_error)
+
+    def _on_mask_loaded(self, mask_data):
+        """ Called on the main thread when a mask finishes loading """
+        self.mask_data = mask_data
+        self.device_sites = None
+        self.device_filter = None
 
-        # Edit the Map ListBox: First Clear it, then insert new items
         self.map_lb.Clear()
         self.map_lb.AppendItems(self.mask_data.map_names)
+        self.parent.set_progress(0, 0, "Loaded mask {}".format(
+            self.mask_data.mask))
+        if self.summary_frame is not None:
+            self.summary_frame.update_summary()
+
+    def _on_load_error(self, err):
+        """ Called on the main thread when a load fails """
+        logging.error("Load failed: %s", err)
+        self.parent.set_progress(0, 0, "Load failed: {}".format(err))
+
+    def _on_load_progress(self, done, total):
+        """ Called on the main thread with load progress """
+        self.parent.set_progress(done, total)
 
     def _on_map_change(self, event):
         """
@@ -429,15 +1321,135 @@ class MainPanel(wx.Panel):
         """
         # First, get the Every map and update the wafer map with it.
         map_name = self.map_lb.GetStringSelection()
-        wfrmap = self.mask_data.maps[map_name]
-        self.wfrmap_data = wfrmap
-        self.read_mask_data()
-        print("Map Changed to: {}".format(map_name))
-
+        mask_data = self.mask_data
+        logging.info("Map changed to: %s", map_name)
+
+        def load(cancel, progress):
+            wfrmap = mask_data.maps[map_name]
+            xyd = [(_c, _r, "Every") for _r, _c in wfrmap]
+            if cancel.is_set():
+                raise LoadCancelled()
+            return wfrmap, xyd, wm_core.xyd_to_dict(xyd)
+
+        self.parent.set_progress(0, 1, "Loading map {}...".format(map_name))
+        self.loader.start(load, self._on_map_loaded, self._on_load_error)
+
+    def _on_map_loaded(self, result):
+        """ Called on the main thread when a map is ready to draw """
+        self.wfrmap_data, self.xyd, self.xyd_dict = result
         self.update_canvas()
+        self.parent.set_progress(0, 0, "")
+
+    def _on_motion(self, event):
+        """
+        Records the mouse position and schedules a hover update.
+
+        Motion events arrive far faster than the readout needs updating, so
+        only the latest position is kept and a one-shot timer processes it.
+        """
+        self._hover_coords = event.Coords
+        if self._drag_points is not None:
+            if self.select_tool == TOOL_RECT:
+                self._drag_points[1:] = [tuple(event.Coords)]
+            else:
+                self._drag_points.append(tuple(event.Coords))
+        if not self._hover_timer.IsRunning():
+            self._hover_timer.Start(HOVER_THROTTLE_MS, wx.TIMER_ONE_SHOT)
+        event.Skip()
+
+    def _on_hover_timer(self, event):
+        """ Updates the status bar and tooltip for the hovered die """
+        if self._drag_points is not None:
+            self._draw_drag_band()
+        if self._hover_coords is None or self.die_index is None:
+            return
+        grid = wm_utils.coord_to_grid(self._hover_coords,
+                                      self.wm_panel.die_size,
+                                      self.wm_panel.grid_center,
+                                      )
+        if grid == self._hover_grid:
+            return
+        self._hover_grid = grid
+
+        info = self.die_index.describe(*grid)
+        text = "Die x{}y{}   Radius: {:.2f} mm   {}".format(
+            grid[0],
+            grid[1],
+            info["radius"],
+            "In map" if info["in_map"] else "Not in map",
+        )
+        if info["in_map"]:
+            text += "   Value: {}".format(info["value"])
+        self.parent.SetStatusText(text)
+        self.wm_panel.canvas.SetToolTip(text)
+
+    def _on_left_down(self, event):
+        """ Starts a rectangle or lasso drag """
+        if self.select_tool != TOOL_CLICK:
+            self._drag_points = [tuple(event.Coords)]
+        event.Skip()
+
+    def _draw_drag_band(self):
+        """
+        Draws the outline of the rectangle or lasso being dragged.
+
+        The band is a foreground object, so redrawing it doesn't redraw
+        the die.
+        """
+        canvas = self.wm_panel.canvas
+        if self._drag_band is not None:
+            canvas.RemoveObject(self._drag_band)
+            self._drag_band = None
+        points = self._drag_points
+        if points is None or len(points) < 2:
+            canvas.Draw()
+            return
+        if self.select_tool == TOOL_RECT:
+            (x_1, y_1), (x_2, y_2) = points
+            points = [(x_1, y_1), (x_2, y_1), (x_2, y_2), (x_1, y_2)]
+        self._drag_band = FloatCanvas.Line(points + points[:1],
+                                           LineColor="Red",
+                                           LineStyle="Dot",
+                                           InForeground=True,
+                                           )
+        canvas.AddObject(self._drag_band)
+        canvas.Draw()
+
+    def _finish_drag(self, event):
+        """
+        Applies the dragged rectangle or lasso as one edit.
+
+        No modifier inverts the selected die, Shift adds them and Ctrl
+        removes them. Alt leaves the map alone and only highlights the
+        selected die, here and in the radius histograms.
+        """
+        points = self._drag_points
+        self._drag_points = None
+        self._draw_drag_band()
+        if self.select_tool == TOOL_RECT:
+            points[1:] = [tuple(event.Coords)]
+            selected = self.select_rect(points[0], points[1])
+        else:
+            points.append(tuple(event.Coords))
+            selected = self.select_lasso(points)
+
+        if event.AltDown():
+            self.highlight_die(self.die_in_selection(selected))
+            return
+        if event.ShiftDown():
+            mode = selection.ADD
+        elif event.ControlDown():
+            mode = selection.REMOVE
+        else:
+            mode = selection.INVERT
+        self.edit_die(selected, mode)
 
     def _on_die_click(self, event):
         """ Handle the left mouse click event """
+        if self._drag_points is not None:
+            self._finish_drag(event)
+            return
+
         # display the mouse coords on the Frame StatusBar
         ds_x, ds_y = self.wm_panel.die_size
         gc_x, gc_y = self.wm_panel.grid_center
@@ -449,27 +1461,763 @@ class MainPanel(wx.Panel):
         # lookup the die value
         grid = "x{}y{}"
         die_grid = grid.format(dg_x, dg_y)
+        logging.debug("Click at %s is die %s", tuple(event.Coords), die_grid)
         self._add_remove_die(die_grid)
 
     def _add_remove_die(self, grid_coord):
         """ Add or remove a die from the xyd_dict """
         try:
             del self.xyd_dict[grid_coord]
-#            print("removed die {}".format(grid_coord))
+            logging.debug("Removed die %s", grid_coord)
         except KeyError:
 #            # The die wasn't in the list, so instead we add it.
             self.xyd_dict[grid_coord] = "Every"
-#            print("added die {}".format(grid_coord))
+            logging.debug("Added die %s", grid_coord)
         self.xyd = xyd_dict_to_xyd_tuple(self.xyd_dict)
         self.update_canvas()
 
 
+class TileLayer(FloatCanvas.DrawObject):
+    """
+    Draws the die layer of the wafer map from cached image tiles.
+
+    On each draw, the tiles of the zoom level for the canvas scale (see
+    ``tiles.level_for_scale``) that are in view are blitted if cached.
+    Missing ones are requested from the TileRenderer and covered in the
+    meantime by the finest cached coarser tile. Level 0 (the whole wafer
+    in a few tiles) is always kept, so there is always something to
+    show. Other tiles are kept in an LRU of TILE_CACHE_SIZE, so panning
+    back over a region doesn't render it again.
+
+    Parameters:
+    -----------
+    canvas : FloatCanvas
+    renderer : tiles.TileRenderer
+    source : tiles.TileSource
+    world_center : (float, float)
+        Canvas coordinates of the wafer center.
+    axis : (float, float)
+        Canvas units per mm along tile X and Y (Y is down on tiles).
+    """
+    def __init__(self, canvas, renderer, source, world_center, axis):
+        FloatCanvas.DrawObject.__init__(self)
+        self.canvas = canvas
+        self.renderer = renderer
+        self.dia = source.dia
+        self.world_center = np.asarray(world_center, dtype=float)
+        self.axis = np.asarray(axis, dtype=float)
+        half = (self.dia / 2 + render.MARGIN_MM) * np.abs(self.axis)
+        self.BoundingBox = FloatCanvas.BBox.asBBox(
+            [self.world_center - half, self.world_center + half])
+        self.base_tiles = {}
+        self.bitmaps = collections.OrderedDict()
+        self._base_keys = tiles.all_tiles(0, self.dia)
+        self._redraw = None
+        self.generation = renderer.set_source(source)
+        renderer.request(self._base_keys)
+
+    def add_tile(self, key, generation, rgb):
+        """ Main thread: stores a rendered tile and schedules a redraw """
+        if generation != self.generation:
+            return
+        height, width, _ = rgb.shape
+        bitmap = wx.Bitmap.FromBuffer(width, height, rgb)
+        if key[0] == 0:
+            self.base_tiles[key] = bitmap
+        else:
+            self.bitmaps[key] = bitmap
+            while len(self.bitmaps) > TILE_CACHE_SIZE:
+                self.bitmaps.popitem(last=False)
+        if self._redraw is None:
+            self._redraw = wx.CallLater(TILE_REDRAW_MS, self._on_redraw)
+
+    def _on_redraw(self):
+        self._redraw = None
+        if self.generation == self.renderer.generation:
+            self.canvas.Draw(Force=True)
+
+    def _bitmap(self, key):
+        """ Returns a cached tile, or None; marks it recently used """
+        if key[0] == 0:
+            return self.base_tiles.get(key)
+        bitmap = self.bitmaps.get(key)
+        if bitmap is not None:
+            self.bitmaps.move_to_end(key)
+        return bitmap
+
+    def _Draw(self, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        level = tiles.level_for_scale(self.canvas.Scale)
+        view = ((np.asarray(self.canvas.ViewPortBB) - self.world_center)
+                / self.axis)
+        keys = tiles.visible_tiles(level, view[:, 0], view[:, 1], self.dia)
+
+        ready = []
+        missing = []
+        covers = set()
+        for key in keys:
+            if self._bitmap(key) is not None:
+                ready.append(key)
+                continue
+            missing.append(key)
+            for coarser in range(level - 1, -1, -1):
+                parent = tiles.parent_tile(key, coarser)
+                if self._bitmap(parent) is not None:
+                    covers.add(parent)
+                    break
+        self.renderer.request(
+            [_k for _k in self._base_keys if _k not in self.base_tiles]
+            + missing)
+
+        gc = wx.GraphicsContext.Create(dc)
+        gc.SetInterpolationQuality(wx.INTERPOLATION_FAST)
+        for key in sorted(covers) + ready:
+            self._draw_tile(gc, key, WorldToPixel)
+
+    def _draw_tile(self, gc, key, WorldToPixel):
+        """ Draws one tile, scaled to fit its canvas rectangle """
+        level, t_x, t_y = key
+        corners = np.array([[t_x, t_y], [t_x + 1, t_y + 1]], dtype=float)
+        corners = (self.world_center
+                   + self.axis * corners * tiles.tile_size(level))
+        # Round both edges so that neighboring tiles meet exactly.
+        (x_0, y_0), (x_1, y_1) = np.round(WorldToPixel(corners))
+        gc.DrawBitmap(self._bitmap(key),
+                      min(x_0, x_1),
+                      min(y_0, y_1),
+                      abs(x_1 - x_0),
+                      abs(y_1 - y_0),
+                      )
+
+
+class BackgroundLoader(object):
+    """
+    Runs one load at a time on a worker thread.
+
+    Results are passed back to the main thread with ``wx.CallAfter``.
+    Starting a new load cancels the one in flight: its ``cancel`` event is
+    set, and anything it still delivers is ignored.
+
+    Parameters:
+    -----------
+    on_progress : callable
+        Called on the main thread as ``on_progress(done, total)``.
+    """
+    def __init__(self, on_progress):
+        self.on_progress = on_progress
+        self._cancel = None
+        self._generation = 0
+
+    def start(self, func, on_done, on_error):
+        """
+        Runs ``func(cancel, progress)`` on a worker thread.
+
+        ``cancel`` is a threading.Event that ``func`` should check, raising
+        LoadCancelled if it's set. ``progress(done, total)`` may be called
+        from the worker. ``on_done(result)`` or ``on_error(exception)`` is
+        then called on the main thread.
+        """
+        self.cancel()
+        self._generation += 1
+        generation = self._generation
+        cancel = threading.Event()
+        self._cancel = cancel
+
+        def progress(done, total):
+            wx.CallAfter(self._deliver, generation, self.on_progress,
+                         done, total)
+
+        def run():
+            try:
+                result = func(cancel, progress)
+            except LoadCancelled:
+                logging.debug("Load %d cancelled", generation)
+                return
+            except Exception as err:
+                logging.exception("Load %d failed", generation)
+                wx.CallAfter(self._deliver, generation, on_error, err)
+                return
+            wx.CallAfter(self._deliver, generation, on_done, result)
+
+        worker = threading.Thread(target=run,
+                                  name="Loader-{}".format(generation),
+                                  daemon=True,
+                                  )
+        worker.start()
+
+    def cancel(self):
+        """ Cancels the load in flight, if any, and ignores its results """
+        self._generation += 1
+        if self._cancel is not None:
+            self._cancel.set()
+            self._cancel = None
+
+    def _deliver(self, generation, callback, *args):
+        """ Main thread: calls ``callback`` unless the load is stale """
+        if generation == self._generation:
+            callback(*args)
+
+
+class EdgeExclusionDialog(wx.Dialog):
+    """
+    Generates a full / partial die map from the mask geometry.
+
+    The wafer map previews the result while the exclusion slider is
+    dragged. "Add Map" adds the result to the mask's map list. Closing
+    without adding puts back the map that was shown before.
+    """
+    def __init__(self, parent, panel):
+        wx.Dialog.__init__(self,
+                           parent,
+                           wx.ID_ANY,
+                           title="Edge Exclusion Map",
+                           style=wx.DEFAULT_DIALOG_STYLE,
+                           )
+        self.panel = panel
+        self.mask = panel.mask_data
+        self.classes = None
+        self._shown = (panel.xyd,
+                       panel.wm_panel.data_type,
+                       panel.wm_panel.plot_range,
+                       )
+        self._added = False
+        self._default_name = ""
+        self.init_ui()
+        self._preview_timer = wx.Timer(self)
+        self._bind_events()
+        self._on_preview_timer(None)
+
+    def init_ui(self):
+        """ Init the UI Components """
+        # Slider is in 0.1 mm steps.
+        self.excl_lbl = wx.StaticText(self, wx.ID_ANY, label="")
+        self.excl_slider = wx.Slider(self,
+                                     wx.ID_ANY,
+                                     value=45,
+                                     minValue=0,
+                                     maxValue=200,
+                                     size=(300, -1),
+                                     )
+        self.partial_cb = wx.CheckBox(self, wx.ID_ANY,
+                                      label="Include partial die")
+        self.name_lbl = wx.StaticText(self, wx.ID_ANY, label="Map Name")
+        self.name_tc = wx.TextCtrl(self, wx.ID_ANY, size=(200, -1))
+        self.add_btn = wx.Button(self, wx.ID_ANY, label="Add Map")
+        self.close_btn = wx.Button(self, wx.ID_CLOSE)
+
+        self.hbox_btns = wx.BoxSizer(wx.HORIZONTAL)
+        self.hbox_btns.Add(self.add_btn, 0, wx.ALL, 5)
+        self.hbox_btns.Add(self.close_btn, 0, wx.ALL, 5)
+
+        self.vbox = wx.BoxSizer(wx.VERTICAL)
+        self.vbox.Add(self.excl_lbl, 0, wx.ALL, 5)
+        self.vbox.Add(self.excl_slider, 0, wx.EXPAND | wx.ALL, 5)
+        self.vbox.Add(self.partial_cb, 0, wx.ALL, 5)
+        self.vbox.Add(self.name_lbl, 0, wx.LEFT | wx.TOP, 5)
+        self.vbox.Add(self.name_tc, 0, wx.EXPAND | wx.ALL, 5)
+        self.vbox.Add(self.hbox_btns, 0, wx.ALIGN_RIGHT)
+        self.SetSizerAndFit(self.vbox)
+
+    def _bind_events(self):
+        """ Binds events to various controls """
+        self.excl_slider.Bind(wx.EVT_SLIDER, self._on_change)
+        self.partial_cb.Bind(wx.EVT_CHECKBOX, self._on_change)
+        self.add_btn.Bind(wx.EVT_BUTTON, self._on_add)
+        self.close_btn.Bind(wx.EVT_BUTTON, self._on_close)
+        self.Bind(wx.EVT_CLOSE, self._on_close)
+        self.Bind(wx.EVT_TIMER, self._on_preview_timer, self._preview_timer)
+
+    @property
+    def edge_excl(self):
+        """ The slider value in mm """
+        return self.excl_slider.GetValue() / 10
+
+    def _on_change(self, event):
+        """ Schedules a preview; rapid slider moves only redraw once """
+        self.excl_lbl.SetLabel("Edge Exclusion: {:.1f} mm".format(
+            self.edge_excl))
+        if not self._preview_timer.IsRunning():
+            self._preview_timer.Start(PREVIEW_THROTTLE_MS, wx.TIMER_ONE_SHOT)
+
+    def _on_preview_timer(self, event):
+        """ Classifies the grid and previews it on the wafer map """
+        self.excl_lbl.SetLabel("Edge Exclusion: {:.1f} mm".format(
+            self.edge_excl))
+        # Only follow the slider until the user types their own name.
+        name = "Edge {:.1f}mm".format(self.edge_excl)
+        if self.name_tc.GetValue() in ("", self._default_name):
+            self.name_tc.ChangeValue(name)
+        self._default_name = name
+        self.classes = map_generator.classify_die(int(self.mask.row_count),
+                                                  int(self.mask.col_count),
+                                                  self.mask.die_xy,
+                                                  self.mask.center_xy,
+                                                  self.mask.dia,
+                                                  self.edge_excl,
+                                                  self.mask.flat_loc,
+                                                  )
+        xyd = map_generator.classes_to_xyd(self.classes)
+        if not self.partial_cb.GetValue():
+            xyd = [_d for _d in xyd if _d[2] == "Full"]
+        self.panel.show_xyd(xyd)
+
+    def _on_add(self, event):
+        """ Adds the generated map to the mask """
+        name = self.name_tc.GetValue().strip()
+        if not name or self.classes is None:
+            return
+        rc_list = map_generator.classes_to_map(self.classes,
+                                               self.partial_cb.GetValue())
+        self.panel.add_map(name, rc_list)
+        self._added = True
+
+    def _on_close(self, event):
+        self._preview_timer.Stop()
+        # Leave the preview up if it was added; it's the selected map.
+        if not self._added and self.panel.mask_data is self.mask:
+            self.panel.show_xyd(*self._shown)
+        self.Destroy()
+
+
+class SamplingDialog(wx.Dialog):
+    """
+    Generates a sparse sampling map from the displayed die.
+
+    The sampled die are highlighted on the wafer map and their coverage
+    metrics shown while the settings are changed. "Add Map" adds the
+    sample to the mask's map list.
+    """
+    method_labels = ["N-Point Pattern",
+                     "Uniform Radial",
+                     "Stratified Random",
+                     ]
+
+    def __init__(self, parent, panel):
+        wx.Dialog.__init__(self,
+                           parent,
+                           wx.ID_ANY,
+                           title="Sampling Map",
+                           style=wx.DEFAULT_DIALOG_STYLE,
+                           )
+        self.panel = panel
+        self.sampler = sampling.Sampler(panel.die_index.x,
+                                        panel.die_index.y,
+                                        panel.mask_data.die_xy,
+                                        panel.mask_data.center_xy,
+                                        panel.mask_data.dia,
+                                        )
+        self.sample = None
+        self.init_ui()
+        self._preview_timer = wx.Timer(self)
+        self._bind_events()
+        self._on_preview_timer(None)
+
+    def init_ui(self):
+        """ Init the UI Components """
+        self.method_rb = wx.RadioBox(self,
+                                     wx.ID_ANY,
+                                     label="Method",
+                                     choices=self.method_labels,
+                                     style=wx.RA_SPECIFY_ROWS,
+                                     )
+        self.count_lbl = wx.StaticText(self, wx.ID_ANY, label="Die Count")
+        self.count_spin = wx.SpinCtrl(self,
+                                      wx.ID_ANY,
+                                      min=1,
+                                      max=max(min(len(self.sampler),
+                                                  SAMPLING_MAX_DIE), 1),
+                                      initial=min(9, len(self.sampler)),
+                                      )
+        self.seed_lbl = wx.StaticText(self, wx.ID_ANY, label="Random Seed")
+        self.seed_spin = wx.SpinCtrl(self, wx.ID_ANY, min=0, max=99999)
+        self.metrics_lbl = wx.StaticText(self, wx.ID_ANY, label="",
+                                         size=(300, 90))
+        self.name_lbl = wx.StaticText(self, wx.ID_ANY, label="Map Name")
+        self.name_tc = wx.TextCtrl(self, wx.ID_ANY, size=(200, -1))
+        self.add_btn = wx.Button(self, wx.ID_ANY, label="Add Map")
+        self.close_btn = wx.Button(self, wx.ID_CLOSE)
+
+        self.grid_sizer = wx.FlexGridSizer(2, 2, 5, 5)
+        self.grid_sizer.Add(self.count_lbl, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.grid_sizer.Add(self.count_spin, 0)
+        self.grid_sizer.Add(self.seed_lbl, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.grid_sizer.Add(self.seed_spin, 0)
+
+        self.hbox_btns = wx.BoxSizer(wx.HORIZONTAL)
+        self.hbox_btns.Add(self.add_btn, 0, wx.ALL, 5)
+        self.hbox_btns.Add(self.close_btn, 0, wx.ALL, 5)
+
+        self.vbox = wx.BoxSizer(wx.VERTICAL)
+        self.vbox.Add(self.method_rb, 0, wx.EXPAND | wx.ALL, 5)
+        self.vbox.Add(self.grid_sizer, 0, wx.ALL, 5)
+        self.vbox.Add(self.metrics_lbl, 0, wx.EXPAND | wx.ALL, 5)
+        self.vbox.Add(self.name_lbl, 0, wx.LEFT | wx.TOP, 5)
+        self.vbox.Add(self.name_tc, 0, wx.EXPAND | wx.ALL, 5)
+        self.vbox.Add(self.hbox_btns, 0, wx.ALIGN_RIGHT)
+        self.SetSizerAndFit(self.vbox)
+
+    def _bind_events(self):
+        """ Binds events to various controls """
+        self.method_rb.Bind(wx.EVT_RADIOBOX, self._on_change)
+        self.count_spin.Bind(wx.EVT_SPINCTRL, self._on_change)
+        self.seed_spin.Bind(wx.EVT_SPINCTRL, self._on_change)
+        self.add_btn.Bind(wx.EVT_BUTTON, self._on_add)
+        self.close_btn.Bind(wx.EVT_BUTTON, self._on_close)
+        self.Bind(wx.EVT_TIMER, self._on_preview_timer, self._preview_timer)
+
+    def _on_change(self, event):
+        """
+        Schedules a preview once the settings stop changing.
+
+        Sampling and its metrics take a noticeable time for large samples,
+        so holding down a spinner arrow mustn't resample at every step.
+        """
+        self._preview_timer.Start(SAMPLING_DEBOUNCE_MS, wx.TIMER_ONE_SHOT)
+
+    def _on_preview_timer(self, event):
+        """ Samples the die, shows the metrics and highlights the die """
+        method = sampling.METHODS[self.method_rb.GetSelection()]
+        count = self.count_spin.GetValue()
+        self.name_tc.SetValue("{} {}".format(
+            self.method_labels[self.method_rb.GetSelection()], count))
+        try:
+            self.sample = self.sampler.sample(method,
+                                              count,
+                                              self.seed_spin.GetValue(),
+                                              )
+        except ValueError as err:
+            self.sample = None
+            self.metrics_lbl.SetLabel(str(err))
+            self.panel.highlight_die([])
+            return
+
+        metrics = self.sampler.metrics(self.sample)
+        text = ("Die: {count}\n"
+                "Max gap: {max_gap:.1f} mm   Mean gap: {mean_gap:.1f} mm\n"
+                "Min spacing: {min_spacing:.1f} mm\n"
+                "Ring share error: {ring_error:.1%}\n"
+                "Sector share error: {sector_error:.1%}")
+        self.metrics_lbl.SetLabel(text.format(**metrics))
+
+        die_mask = np.zeros(len(self.sampler), dtype=bool)
+        die_mask[self.sample] = True
+        self.panel.highlight_die(die_mask)
+
+    def _on_add(self, event):
+        """ Adds the sample to the mask as a new map """
+        name = self.name_tc.GetValue().strip()
+        if not name or self.sample is None:
+            return
+        self.panel.add_map(name, self.sampler.to_map(self.sample))
+
+    def _on_close(self, event):
+        self._preview_timer.Stop()
+        self.panel.highlight_die([])
+        self.Destroy()
+
+
+class MaskOverlayDialog(wx.Dialog):
+    """
+    Overlays a map from another mask onto the current mask's grid.
+
+    The other mask's die (blue) and the current mask's die they cover by
+    at least the threshold (red) are drawn over the wafer map. "Add Map"
+    adds the covered die to the current mask as a new map.
+    """
+    def __init__(self, parent, panel):
+        wx.Dialog.__init__(self,
+                           parent,
+                           wx.ID_ANY,
+                           title="Overlay Map From Mask",
+                           style=wx.DEFAULT_DIALOG_STYLE,
+                           )
+        self.panel = panel
+        self.target = panel.mask_data
+        self.source = None
+        self.fraction = None
+        self.loader = BackgroundLoader(self._on_load_progress)
+        self.init_ui()
+        self._preview_timer = wx.Timer(self)
+        self._bind_events()
+
+    def init_ui(self):
+        """ Init the UI Components """
+        self.mask_lbl = wx.StaticText(self, wx.ID_ANY, label="From Mask")
+        self.mask_ch = wx.Choice(self, wx.ID_ANY,
+                                 choices=self.panel.mask_names)
+        self.map_lbl = wx.StaticText(self, wx.ID_ANY, label="Map")
+        self.map_ch = wx.Choice(self, wx.ID_ANY, size=(150, -1))
+        self.thresh_lbl = wx.StaticText(self, wx.ID_ANY, label="")
+        self.thresh_slider = wx.Slider(self,
+                                       wx.ID_ANY,
+                                       value=50,
+                                       minValue=1,
+                                       maxValue=100,
+                                       size=(300, -1),
+                                       )
+        self.status_lbl = wx.StaticText(self, wx.ID_ANY, label="")
+        self.name_lbl = wx.StaticText(self, wx.ID_ANY, label="Map Name")
+        self.name_tc = wx.TextCtrl(self, wx.ID_ANY, size=(200, -1))
+        self.add_btn = wx.Button(self, wx.ID_ANY, label="Add Map")
+        self.close_btn = wx.Button(self, wx.ID_CLOSE)
+
+        self.grid_sizer = wx.FlexGridSizer(2, 2, 5, 5)
+        self.grid_sizer.Add(self.mask_lbl, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.grid_sizer.Add(self.mask_ch, 0, wx.EXPAND)
+        self.grid_sizer.Add(self.map_lbl, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.grid_sizer.Add(self.map_ch, 0, wx.EXPAND)
+
+        self.hbox_btns = wx.BoxSizer(wx.HORIZONTAL)
+        self.hbox_btns.Add(self.add_btn, 0, wx.ALL, 5)
+        self.hbox_btns.Add(self.close_btn, 0, wx.ALL, 5)
+
+        self.vbox = wx.BoxSizer(wx.VERTICAL)
+        self.vbox.Add(self.grid_sizer, 0, wx.ALL, 5)
+        self.vbox.Add(self.thresh_lbl, 0, wx.ALL, 5)
+        self.vbox.Add(self.thresh_slider, 0, wx.EXPAND | wx.ALL, 5)
+        self.vbox.Add(self.status_lbl, 0, wx.ALL, 5)
+        self.vbox.Add(self.name_lbl, 0, wx.LEFT | wx.TOP, 5)
+        self.vbox.Add(self.name_tc, 0, wx.EXPAND | wx.ALL, 5)
+        self.vbox.Add(self.hbox_btns, 0, wx.ALIGN_RIGHT)
+        self.SetSizerAndFit(self.vbox)
+
+    def _bind_events(self):
+        """ Binds events to various controls """
+        self.mask_ch.Bind(wx.EVT_CHOICE, self._on_mask_choice)
+        self.map_ch.Bind(wx.EVT_CHOICE, self._on_change)
+        self.thresh_slider.Bind(wx.EVT_SLIDER, self._on_change)
+        self.add_btn.Bind(wx.EVT_BUTTON, self._on_add)
+        self.close_btn.Bind(wx.EVT_BUTTON, self._on_close)
+        self.Bind(wx.EVT_TIMER, self._on_preview_timer, self._preview_timer)
+
+    @property
+    def threshold(self):
+        """ The slider value as a coverage fraction """
+        return self.thresh_slider.GetValue() / 100
+
+    def _on_mask_choice(self, event):
+        """ Loads the chosen mask on a worker thread """
+        name = self.mask_ch.GetStringSelection()
+        self.source = None
+        self.map_ch.Clear()
+
+        def load(cancel, progress):
+            return Mask(name, progress=progress, cancel=cancel)
+
+        self.status_lbl.SetLabel("Loading mask {}...".format(name))
+        self.loader.start(load, self._on_mask_loaded, self._on_load_error)
+
+    def _on_mask_loaded(self, mask):
+        self.source = mask
+        self.map_ch.AppendItems(mask.map_names)
+        self.status_lbl.SetLabel("")
+
+    def _on_load_error(self, err):
+        self.status_lbl.SetLabel("Load failed: {}".format(err))
+
+    def _on_load_progress(self, done, total):
+        self.status_lbl.SetLabel("Loading mask: {} of {} maps".format(done,
+                                                                      total))
+
+    def _on_change(self, event):
+        """ Schedules a preview; rapid slider moves only redraw once """
+        self.thresh_lbl.SetLabel("Coverage Threshold: {:.0%}".format(
+            self.threshold))
+        if not self._preview_timer.IsRunning():
+            self._preview_timer.Start(PREVIEW_THROTTLE_MS, wx.TIMER_ONE_SHOT)
+
+    def _on_preview_timer(self, event):
+        """ Resamples the chosen map and draws the overlay """
+        map_name = self.map_ch.GetStringSelection()
+        if self.source is None or not map_name:
+            return
+        self.thresh_lbl.SetLabel("Coverage Threshold: {:.0%}".format(
+            self.threshold))
+        src = self.source
+        src_grid = render.map_grid(src.maps[map_name],
+                                   int(src.row_count),
+                                   int(src.col_count))
+        tgt = self.target
+        fraction = resample.coverage(src_grid,
+                                     src.die_xy,
+                                     src.center_xy,
+                                     (int(tgt.row_count), int(tgt.col_count)),
+                                     tgt.die_xy,
+                                     tgt.center_xy,
+                                     )
+        self.fraction = fraction
+        source_xy = resample.source_centers(src_grid,
+                                            src.die_xy,
+                                            src.center_xy,
+                                            tgt.die_xy,
+                                            tgt.center_xy,
+                                            )
+        covered = fraction >= self.threshold
+        self.panel.draw_mask_overlay(source_xy, covered)
+        self.status_lbl.SetLabel("{} of {} die -> {} die".format(
+            map_name, int(src_grid.sum()), int(covered.sum())))
+        self.name_tc.SetValue("{} {}".format(src.mask, map_name))
+
+    def _on_add(self, event):
+        """ Adds the resampled map to the current mask """
+        name = self.name_tc.GetValue().strip()
+        if not name or self.fraction is None:
+            return
+        self.panel.add_map(name, resample.coverage_to_map(self.fraction,
+                                                          self.threshold))
+
+    def _on_close(self, event):
+        self._preview_timer.Stop()
+        self.loader.cancel()
+        self.panel.draw_mask_overlay()
+        self.Destroy()
+
+
+class RingEditDialog(wx.Dialog):
+    """
+    Adds, removes or inverts every die in a radius range.
+
+    Each Apply is a single batched edit of the displayed map.
+    """
+    def __init__(self, parent, panel):
+        wx.Dialog.__init__(self,
+                           parent,
+                           wx.ID_ANY,
+                           title="Edit Ring Range",
+                           style=wx.DEFAULT_DIALOG_STYLE,
+                           )
+        self.panel = panel
+        self.init_ui()
+        self._bind_events()
+
+    def init_ui(self):
+        """ Init the UI Components """
+        max_radius = self.panel.mask_data.dia / 2
+        self.min_lbl = wx.StaticText(self, wx.ID_ANY,
+                                     label="Min Radius (mm)")
+        self.min_spin = wx.SpinCtrlDouble(self,
+                                          wx.ID_ANY,
+                                          min=0,
+                                          max=max_radius,
+                                          initial=max_radius - 5,
+                                          inc=0.5,
+                                          )
+        self.max_lbl = wx.StaticText(self, wx.ID_ANY,
+                                     label="Max Radius (mm)")
+        self.max_spin = wx.SpinCtrlDouble(self,
+                                          wx.ID_ANY,
+                                          min=0,
+                                          max=max_radius,
+                                          initial=max_radius,
+                                          inc=0.5,
+                                          )
+        self.mode_rb = wx.RadioBox(self,
+                                   wx.ID_ANY,
+                                   label="Edit",
+                                   choices=["Add", "Remove", "Invert"],
+                                   )
+        self.mode_rb.SetSelection(1)
+        self.apply_btn = wx.Button(self, wx.ID_APPLY)
+        self.close_btn = wx.Button(self, wx.ID_CLOSE)
+
+        self.grid_sizer = wx.FlexGridSizer(2, 2, 5, 5)
+        self.grid_sizer.Add(self.min_lbl, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.grid_sizer.Add(self.min_spin, 0)
+        self.grid_sizer.Add(self.max_lbl, 0, wx.ALIGN_CENTER_VERTICAL)
+        self.grid_sizer.Add(self.max_spin, 0)
+
+        self.hbox_btns = wx.BoxSizer(wx.HORIZONTAL)
+        self.hbox_btns.Add(self.apply_btn, 0, wx.ALL, 5)
+        self.hbox_btns.Add(self.close_btn, 0, wx.ALL, 5)
+
+        self.vbox = wx.BoxSizer(wx.VERTICAL)
+        self.vbox.Add(self.grid_sizer, 0, wx.ALL, 5)
+        self.vbox.Add(self.mode_rb, 0, wx.EXPAND | wx.ALL, 5)
+        self.vbox.Add(self.hbox_btns, 0, wx.ALIGN_RIGHT)
+        self.SetSizerAndFit(self.vbox)
+
+    def _bind_events(self):
+        """ Binds events to various controls """
+        self.apply_btn.Bind(wx.EVT_BUTTON, self._on_apply)
+        self.close_btn.Bind(wx.EVT_BUTTON, self._on_close)
+
+    def _on_apply(self, event):
+        """ Applies the edit to every die in the ring """
+        r_min = self.min_spin.GetValue()
+        r_max = self.max_spin.GetValue()
+        mode = selection.EDIT_MODES[self.mode_rb.GetSelection()]
+        self.panel.edit_die(self.panel.select_ring(r_min, r_max), mode)
+
+    def _on_close(self, event):
+        self.Destroy()
+
+
+class LogFrame(wx.Frame):
+    """
+    Shows the in-memory log ring buffer.
+
+    The text is refreshed on a timer, and only if new lines were logged.
+    """
+    def __init__(self, parent):
+        wx.Frame.__init__(self,
+                          parent=parent,
+                          id=wx.ID_ANY,
+                          title="Log",
+                          size=(900, 400),
+                          )
+        self.ring = get_ring_buffer()
+        self.last_line = None
+
+        self.text = wx.TextCtrl(self,
+                                wx.ID_ANY,
+                                style=(wx.TE_MULTILINE
+                                       | wx.TE_READONLY
+                                       | wx.HSCROLL),
+                                )
+        font = wx.Font(9,
+                       wx.FONTFAMILY_TELETYPE,
+                       wx.FONTSTYLE_NORMAL,
+                       wx.FONTWEIGHT_NORMAL,
+                       )
+        self.text.SetFont(font)
+
+        self.timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._on_timer, self.timer)
+        self.Bind(wx.EVT_CLOSE, self._on_close)
+        self.timer.Start(LOG_VIEW_REFRESH_MS)
+        self._on_timer(None)
+
+    def _on_timer(self, event):
+        """ Reloads the text if anything new was logged """
+        if self.ring is None:
+            self.text.SetValue("Logging has not been set up.")
+            return
+        lines = self.ring.get_lines()
+        last_line = lines[-1] if lines else None
+        if last_line == self.last_line:
+            return
+        self.last_line = last_line
+        self.text.SetValue("\n".join(lines))
+        self.text.ShowPosition(self.text.GetLastPosition())
+
+    def _on_close(self, event):
+        self.timer.Stop()
+        event.Skip()
+
+
 class RadiusPlots(wx.Panel):
-    """ A container for the two radius histograms """
-    def __init__(self, parent, radius_data):
+    """
+    A container for the two radius histograms
+
+    If given, ``on_select`` is called as on_select(die_mask) when bins are
+    clicked or dragged over, with a bool array over ``radius_data``.
+    """
+    def __init__(self, parent, radius_data, dia=150, on_select=None):
         wx.Panel.__init__(self, parent)
         self.parent = parent
         self.radius_data = radius_data
+        self.dia = dia
+        self.on_select = on_select
+        self._set_binspecs(dia)
         self._init_ui()
 
         self._bind_events()
@@ -477,24 +2225,22 @@ class RadiusPlots(wx.Panel):
     def _init_ui(self):
         """ """
         # create the items
-        self.lin_binspec = range(0, 81, 5)
-
-        # bins of equal area, area = 2000 mm^2
-        self.eq_area_binspec = [0, 25.2313, 35.6825, 43.7019,
-                                50.4627, 56.419, 61.8039,
-                                66.7558, 71.365, 75.694]
-
         self.radius_plot = Histogram(self,
                                      self.radius_data,
                                      self.lin_binspec,
                                      "Bin Size = 5mm",
                                      "Radius (mm)",
+                                     x_range=(0, self.dia / 2),
+                                     on_bin_select=self._on_lin_select,
                                      )
         self.eq_area_plot = Histogram(self,
                                       self.radius_data,
                                       self.eq_area_binspec,
-                                      "BinSize = 2000 mm^2",
+                                      "BinSize = {} mm^2".format(
+                                          EQ_AREA_BIN_MM2),
                                       "Radius (mm)",
+                                      x_range=(0, self.dia / 2),
+                                      on_bin_select=self._on_eq_area_select,
                                       )
 
         # Create the layout manager
@@ -507,10 +2253,39 @@ class RadiusPlots(wx.Panel):
         """ """
         pass
 
-    def update(self, data):
+    def _set_binspecs(self, dia):
+        """ Computes the 5 mm and equal-area bins for a wafer diameter """
+        self.lin_binspec = range(0, int(dia / 2) + 6, 5)
+
+        # bins of equal area, area = 2000 mm^2
+        self.eq_area_binspec = zones.fixed_area_edges(dia, EQ_AREA_BIN_MM2)
+
+    def update(self, data, weights=None, dia=None):
         """ Updates the two radius plots """
-        self.radius_plot.update(data, self.lin_binspec)
-        self.eq_area_plot.update(data, self.eq_area_binspec)
+        if dia is not None and dia != self.dia:
+            self.dia = dia
+            self._set_binspecs(dia)
+            self.radius_plot.x_range = (0, dia / 2)
+            self.eq_area_plot.x_range = (0, dia / 2)
+        self.radius_plot.update(data, self.lin_binspec, weights)
+        self.eq_area_plot.update(data, self.eq_area_binspec, weights)
+
+    def highlight(self, die_mask):
+        """ Shows the share of ``die_mask`` in every bar of both plots """
+        self.radius_plot.highlight(die_mask)
+        self.eq_area_plot.highlight(die_mask)
+
+    def _on_lin_select(self, first, last):
+        self._select(self.radius_plot.die_in(first, last))
+
+    def _on_eq_area_select(self, first, last):
+        self._select(self.eq_area_plot.die_in(first, last))
+
+    def _select(self, die_mask):
+        if self.on_select is not None:
+            self.on_select(die_mask)
+        else:
+            self.highlight(die_mask)
 
 
 def pairwise(iterable):
@@ -537,21 +2312,49 @@ class Histogram(wxplot.PlotCanvas):
         3 <= x < 4
         x >= 4
 
+    x_range is the displayed X range; default is the first to last edge.
+
+    If on_bin_click is given, it's called as on_bin_click(bin_index) when
+    the user clicks inside a bin.
+
+    If on_bin_select is given, it's called as on_bin_select(first, last)
+    whenever a click or drag changes the selected range of bins. A click
+    outside all bins calls it with (-1, -1).
+
+    The bin of every item is computed once per update, so counting a
+    subset of the items (see ``highlight``) is a single bincount.
+
     """
     def __init__(self, parent, data, binspec,
-                 title="Histogram", x_label="Bin", y_label="Count"):
+                 title="Histogram", x_label="Bin", y_label="Count",
+                 x_range=None, on_bin_click=None, on_bin_select=None):
         wxplot.PlotCanvas.__init__(self, parent)
         self.parent = parent
         self.data = data
         self.binspec = binspec
         self.hist_data = None
+        self.edges = None
+        self.bin_idx = None                 # bin of each item, -1 if none
+        self.weights = None
+        self.highlight_data = None
         self.title = title
         self.x_label = x_label
         self.y_label = y_label
+        self.x_range = x_range
+        self.on_bin_click = on_bin_click
+        self.on_bin_select = on_bin_select
+        self._drag_bin = None
+        self._selected_bins = None
 
         # get rid of that annoying crosshair cursor
         self.canvas.SetCursor(wx.NullCursor)
 
+        if self.on_bin_click is not None or self.on_bin_select is not None:
+            self.canvas.Bind(wx.EVT_LEFT_DOWN, self._on_left_down)
+        if self.on_bin_select is not None:
+            self.canvas.Bind(wx.EVT_MOTION, self._on_motion)
+            self.canvas.Bind(wx.EVT_LEFT_UP, self._on_left_up)
+
         self._init_data()
 
 #        self._init_ui()
@@ -563,11 +2366,98 @@ class Histogram(wxplot.PlotCanvas):
         """ Initialize the data. Do any one-time operations here """
         self.update(self.data, self.binspec)
 
-    def update(self, data, binspec):
+    def bin_at(self, event):
+        """ Returns the bin index under the mouse, or -1 """
+        if self.edges is None:
+            return -1
+        x, _ = self.GetXY(event)
+        return int(zones.bin_index([x], self.edges)[0])
+
+    def die_in(self, first, last):
+        """ Returns a bool array of the items in bins first to last """
+        if self.bin_idx is None or first < 0:
+            return np.zeros(0 if self.bin_idx is None else self.bin_idx.size,
+                            dtype=bool)
+        return (self.bin_idx >= first) & (self.bin_idx <= last)
+
+    def _on_left_down(self, event):
+        """ Reports clicks on a bin and starts a bin drag """
+        idx = self.bin_at(event)
+        if self.on_bin_click is not None and idx >= 0:
+            self.on_bin_click(idx)
+        if self.on_bin_select is not None:
+            self._drag_bin = idx
+            self._selected_bins = None
+            self._select_bins(idx, idx)
+        event.Skip()
+
+    def _on_motion(self, event):
+        """ Extends a bin drag; only bin changes are reported """
+        if self._drag_bin is not None and event.LeftIsDown():
+            idx = self.bin_at(event)
+            if idx >= 0:
+                if self._drag_bin < 0:
+                    self._drag_bin = idx
+                self._select_bins(self._drag_bin, idx)
+        event.Skip()
+
+    def _on_left_up(self, event):
+        self._drag_bin = None
+        event.Skip()
+
+    def _select_bins(self, first, last):
+        first, last = sorted((first, last))
+        if first < 0:
+            first = last = -1
+        if (first, last) != self._selected_bins:
+            self._selected_bins = (first, last)
+            self.on_bin_select(first, last)
+
+    def highlight(self, die_mask):
+        """
+        Draws the share of each bar taken by a subset of the items.
+
+        ``die_mask`` is a bool array over the plotted data. An empty or
+        all-False mask removes the highlight.
+        """
+        die_mask = np.asarray(die_mask, dtype=bool)
+        if self.bin_idx is None or die_mask.shape != self.bin_idx.shape:
+            self.highlight_data = None
+        elif not die_mask.any():
+            self.highlight_data = None
+        else:
+            self.highlight_data = self._count(die_mask)
+        self._draw()
+
+    def _count(self, die_mask=None):
+        """ Counts (or sums the weights of) the items in each bin """
+        keep = self.bin_idx >= 0
+        if die_mask is not None:
+            keep &= die_mask
+        weights = None if self.weights is None else self.weights[keep]
+        return np.bincount(self.bin_idx[keep],
+                           weights=weights,
+                           minlength=len(self.edges) - 1,
+                           )
+
+    def update(self, data, binspec, weights=None):
+        """
+        Redraws the histogram.
+
+        If given, ``weights`` must be the same length as ``data``; each item
+        then contributes its weight instead of 1 to its bin.
+        """
         self.Clear()
 
         # other stuff uses numpy so I can too.
-        hist, edges = np.histogram(data, binspec)
+        edges = np.asarray(binspec, dtype=float)
+        self.edges = edges
+        self.bin_idx = zones.bin_index(data, edges)
+        self.weights = None if weights is None else np.asarray(weights)
+        self.highlight_data = None
+        self._selected_bins = None
+        hist = self._count()
+        self.hist_data = hist
 
         bars = []
         for n, (count, (low, high)) in enumerate(zip(hist, pairwise(edges))):
@@ -593,7 +2483,18 @@ class Histogram(wxplot.PlotCanvas):
                                   )
             bars.append(ln3)
 
-        bars = [wxplot.PolyHistogram(hist, edges)]
+        self._draw()
+
+    def _draw(self):
+        """ Draws the bars, and the highlighted share over them """
+        edges = self.edges
+        bars = [wxplot.PolyHistogram(self.hist_data, edges)]
+        if self.highlight_data is not None:
+            bars.append(wxplot.PolyHistogram(self.highlight_data,
+                                             edges,
+                                             fillcolour='red',
+                                             edgewidth=1,
+                                             ))
 
         plot = wxplot.PlotGraphics(bars,
                                    title=self.title,
@@ -601,12 +2502,273 @@ class Histogram(wxplot.PlotCanvas):
                                    yLabel=self.y_label,
                                    )
 
-        self.XSpec = (0, 75)
+        if self.x_range is None:
+            self.XSpec = (edges[0], edges[-1])
+        else:
+            self.XSpec = self.x_range
 
         self.EnableGrid = True
         self.Draw(plot)
 
 
+class ZoneFrame(wx.Frame):
+    """
+    Equal-area ring and angular sector analysis of the displayed map.
+
+    Shows a ring histogram, a sector histogram and a ring x sector count
+    matrix. Clicking a bin or a matrix cell highlights its die on the
+    wafer map. Everything is recomputed whenever the map is redrawn.
+    """
+    def __init__(self, parent, panel):
+        wx.Frame.__init__(self,
+                          parent=parent,
+                          id=wx.ID_ANY,
+                          title="Zone Analysis",
+                          size=(700, 700),
+                          )
+        self.panel = panel
+        self.analysis = None
+        self.init_ui()
+        self._bind_events()
+        self.update_zones()
+
+    def init_ui(self):
+        """ Init the UI Components """
+        self.rings_lbl = wx.StaticText(self, wx.ID_ANY, label="Rings")
+        self.rings_sc = wx.SpinCtrl(self, wx.ID_ANY, min=1, max=50, initial=5)
+        self.sectors_lbl = wx.StaticText(self, wx.ID_ANY, label="Sectors")
+        self.sectors_sc = wx.SpinCtrl(self, wx.ID_ANY, min=1, max=72,
+                                      initial=8)
+
+        self.ring_plot = Histogram(self, [], [0, 1],
+                                   "Equal-Area Rings",
+                                   "Radius (mm)",
+                                   on_bin_click=self._on_ring_click,
+                                   )
+        self.sector_plot = Histogram(self, [], [0, 360],
+                                     "Sectors",
+                                     "Angle (deg)",
+                                     on_bin_click=self._on_sector_click,
+                                     )
+        self.matrix = wx.grid.Grid(self, wx.ID_ANY)
+        self.matrix.CreateGrid(1, 1)
+        self.matrix.EnableEditing(False)
+
+        self.hbox_ctrls = wx.BoxSizer(wx.HORIZONTAL)
+        self.hbox_ctrls.Add(self.rings_lbl, 0, wx.ALL | wx.ALIGN_CENTER, 5)
+        self.hbox_ctrls.Add(self.rings_sc, 0, wx.ALL, 5)
+        self.hbox_ctrls.Add(self.sectors_lbl, 0, wx.ALL | wx.ALIGN_CENTER, 5)
+        self.hbox_ctrls.Add(self.sectors_sc, 0, wx.ALL, 5)
+
+        self.hbox_plots = wx.BoxSizer(wx.HORIZONTAL)
+        self.hbox_plots.Add(self.ring_plot, 1, wx.EXPAND)
+        self.hbox_plots.Add(self.sector_plot, 1, wx.EXPAND)
+
+        self.vbox = wx.BoxSizer(wx.VERTICAL)
+        self.vbox.Add(self.hbox_ctrls, 0)
+        self.vbox.Add(self.hbox_plots, 1, wx.EXPAND)
+        self.vbox.Add(self.matrix, 1, wx.EXPAND | wx.ALL, 5)
+        self.SetSizer(self.vbox)
+
+    def _bind_events(self):
+        """ Binds events to various controls """
+        self.rings_sc.Bind(wx.EVT_SPINCTRL, self._on_spin)
+        self.sectors_sc.Bind(wx.EVT_SPINCTRL, self._on_spin)
+        self.matrix.Bind(wx.grid.EVT_GRID_CELL_LEFT_CLICK, self._on_cell_click)
+        self.Bind(wx.EVT_CLOSE, self._on_close)
+
+    def update_zones(self):
+        """ Recomputes every zone plot from the panel's current die """
+        index = self.panel.die_index
+        mask = self.panel.mask_data
+        dx, dy = geometry.die_offsets(index.x, index.y,
+                                      mask.die_xy, mask.center_xy)
+        self.analysis = zones.ZoneAnalysis(index.radius,
+                                           zones.die_angle(dx, dy),
+                                           mask.dia,
+                                           self.rings_sc.GetValue(),
+                                           self.sectors_sc.GetValue(),
+                                           )
+        self.ring_plot.update(self.analysis.radius,
+                              self.analysis.ring_edges)
+        self.sector_plot.update(self.analysis.angle,
+                                self.analysis.sector_edges)
+        self._fill_matrix(self.analysis.matrix())
+
+    def _fill_matrix(self, counts):
+        """ Resizes the grid to (rings, sectors) and fills in counts """
+        n_rings, n_sectors = counts.shape
+        grid = self.matrix
+        grid.BeginBatch()
+        if grid.GetNumberRows() > n_rings:
+            grid.DeleteRows(0, grid.GetNumberRows() - n_rings)
+        elif grid.GetNumberRows() < n_rings:
+            grid.AppendRows(n_rings - grid.GetNumberRows())
+        if grid.GetNumberCols() > n_sectors:
+            grid.DeleteCols(0, grid.GetNumberCols() - n_sectors)
+        elif grid.GetNumberCols() < n_sectors:
+            grid.AppendCols(n_sectors - grid.GetNumberCols())
+
+        edges = self.analysis.ring_edges
+        for ring in range(n_rings):
+            grid.SetRowLabelValue(ring, "{:.1f}-{:.1f}".format(
+                edges[ring], edges[ring + 1]))
+        edges = self.analysis.sector_edges
+        for sector in range(n_sectors):
+            grid.SetColLabelValue(sector, "{:.0f}-{:.0f}".format(
+                edges[sector], edges[sector + 1]))
+        for ring in range(n_rings):
+            for sector in range(n_sectors):
+                grid.SetCellValue(ring, sector,
+                                  str(int(counts[ring, sector])))
+        grid.EndBatch()
+
+    def _on_spin(self, event):
+        self.update_zones()
+
+    def _on_ring_click(self, ring):
+        self.panel.highlight_die(self.analysis.die_in(ring=ring))
+
+    def _on_sector_click(self, sector):
+        self.panel.highlight_die(self.analysis.die_in(sector=sector))
+
+    def _on_cell_click(self, event):
+        self.panel.highlight_die(self.analysis.die_in(ring=event.GetRow(),
+                                                      sector=event.GetCol()))
+        event.Skip()
+
+    def _on_close(self, event):
+        self.panel.zone_frame = None
+        self.panel.highlight_die([])
+        event.Skip()
+
+
+class MapSummaryFrame(wx.Frame):
+    """
+    Sortable table of every map in the current mask.
+
+    Click a column header to sort by it (again to reverse). Double-click
+    a row to display that map. The table is refilled whenever a mask is
+    loaded or a map is added.
+    """
+    def __init__(self, parent, panel):
+        wx.Frame.__init__(self,
+                          parent=parent,
+                          id=wx.ID_ANY,
+                          title="Map Summary",
+                          size=(700, 500),
+                          )
+        self.panel = panel
+        self.init_ui()
+        self._bind_events()
+        self.update_summary()
+
+    def init_ui(self):
+        """ Init the UI Components """
+        self.table = MapSummaryList(self)
+        self.vbox = wx.BoxSizer(wx.VERTICAL)
+        self.vbox.Add(self.table, 1, wx.EXPAND)
+        self.SetSizer(self.vbox)
+
+    def _bind_events(self):
+        """ Binds events to various controls """
+        self.table.Bind(wx.EVT_LIST_COL_CLICK, self._on_col_click)
+        self.table.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self._on_activate)
+        self.Bind(wx.EVT_CLOSE, self._on_close)
+
+    def update_summary(self):
+        """ Recomputes the table from the panel's current mask """
+        mask = self.panel.mask_data
+        if mask is None or mask.maps is None:
+            self.table.set_summary(None)
+            return
+        self.SetTitle("Map Summary - {}".format(mask.mask))
+        self.table.set_summary(map_summary.mask_summary(mask))
+
+    def _on_col_click(self, event):
+        self.table.sort(event.GetColumn())
+
+    def _on_activate(self, event):
+        self.panel.select_map(self.table.name_at(event.GetIndex()))
+
+    def _on_close(self, event):
+        self.panel.summary_frame = None
+        event.Skip()
+
+
+class MapSummaryList(wx.ListCtrl):
+    """
+    Virtual list of a ``map_summary.summarize`` result.
+
+    Rows are never copied into the control; sorting only reorders an
+    index array and the visible rows are formatted on demand.
+    """
+    def __init__(self, parent):
+        wx.ListCtrl.__init__(self,
+                             parent,
+                             wx.ID_ANY,
+                             style=(wx.LC_REPORT | wx.LC_VIRTUAL
+                                    | wx.LC_SINGLE_SEL),
+                             )
+        for col, (_, label) in enumerate(map_summary.COLUMNS):
+            self.InsertColumn(col, label)
+        self.summary = None
+        self.order = np.arange(0)
+        self.sort_col = 0
+        self.sort_reverse = False
+
+    def set_summary(self, summary):
+        """ Shows a new summary, keeping the current sort """
+        self.summary = summary
+        self.order = np.arange(len(summary["name"]) if summary else 0)
+        self._apply_sort()
+
+    def sort(self, col):
+        """ Sorts by column ``col``, reversing if already sorted by it """
+        if col == self.sort_col:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_col = col
+            self.sort_reverse = False
+        self._apply_sort()
+
+    def _apply_sort(self):
+        if self.summary is not None:
+            key = self.summary[map_summary.COLUMNS[self.sort_col][0]]
+            if key.ndim > 1:
+                # Bounding boxes sort by area.
+                key = ((key[:, 1] - key[:, 0] + 1)
+                       * (key[:, 3] - key[:, 2] + 1))
+            if key.dtype == object:
+                key = np.array([str(_k).lower() for _k in key])
+            self.order = np.argsort(key, kind='stable')
+            if self.sort_reverse:
+                self.order = self.order[::-1]
+        self.SetItemCount(len(self.order))
+        self.Refresh()
+
+    def name_at(self, item):
+        """ Returns the map name shown on row ``item`` """
+        return self.summary["name"][self.order[item]]
+
+    def OnGetItemText(self, item, col):
+        """ Formats one cell; called by wx for visible rows only """
+        idx = self.order[item]
+        key = map_summary.COLUMNS[col][0]
+        value = self.summary[key][idx]
+        if key == "name":
+            return value
+        if key == "bbox":
+            if not value.any():
+                return "-"
+            return "{}-{} x {}-{}".format(*value)
+        if key == "every_fraction":
+            return "-" if np.isnan(value) else "{:.1%}".format(value)
+        if key == "mean_radius":
+            return "-" if np.isnan(value) else "{:.2f}".format(value)
+        return str(int(value))
+
+
 class LabeledListBox(wx.Panel):
     """ A simple Labeled List Box """
     def __init__(self, parent, label_text, *args, **kwargs):
@@ -685,139 +2847,11 @@ class StatsBlock(wx.Panel):
         self.stat_str_ui.SetLabel("Die Count: {}".format(die_count))
 
 
-# TODO: too many attributes
-class Mask(object):
-    """
-    Upon init, reads an OWT mask file and stores things to memory.
-    """
-    def __init__(self, mask):
-        self.mask = mask
-        self.mask_path = MASK_PATH
-        self.mask_filename = self.mask + ".ini"
-        self.mask_file = osp.join(self.mask_path, self.mask_filename)
-        self.mask_info = None
-        self.mask_info_names = None
-        self.maps = None
-        self.map_names = None
-        self.devices = None
-        self.device_names = None
-
-        self.read_mask_file()
-
-    def read_mask_file(self):
-        """ Reads the wafer maps from the 150mm section """
-        parser = configparser.RawConfigParser()
-        parser.optionxform = str        # Make keys Case-sensitive
-        parser.read(self.mask_file)
-
-        self._extract_mask_info(parser.items("Mask"))
-
-        # Try all of the wafer diameters. I only want the biggest wafer size.
-        # TODO: replace with douglib.utils.try_again
-        args = ["150mm", "100mm", "50mm"]
-        for arg in args:
-            try:
-                self._extract_maps(parser.items(arg))
-                self.dia = int(arg[:-2])
-                break
-            except configparser.NoSectionError:
-                continue
-        else:
-            # for loop never 'break', so there was always an error. Raise it.
-            error_txt = "Why are there no sections?"
-            raise configparser.NoSectionError(error_txt)
-
-        self.devices = dict(parser.items("Devices"))
-        self.device_names = sorted(self.devices.keys())
-
-    def _extract_mask_info(self, mask_info):
-        """ Extracts mask_info items from the list return by parser """
-        self.mask_info = dict(mask_info)
-        self.mask_info_names = sorted(self.mask_info.keys())
-        self.die_x = float(self.mask_info["Die X"])
-        self.die_y = float(self.mask_info["Die Y"])
-        self.die_xy = (self.die_x, self.die_y)
-        self.flat_loc = int(self.mask_info["Flat"])
-        mask_enum = mask_constants.lookup(self.mask_info['Mask'][1:-1])
-        self.center_xy = mask_enum.center_xy
-        print("Center XY: {}".format(self.center_xy))
-
-    def _extract_maps(self, maps):
-        """
-        Removes the unnecessary map info from the "150mm" section. This info
-        is the Rows, Cols, Home Row, Home Col, Start Row, Start Col. These
-        items are saved for posterity, but I don't think they're needed.
-        """
-        self.maps = dict(maps)
-        self.row_count = dictpop(self.maps, "Rows")
-        self.col_count = dictpop(self.maps, "Cols")
-        self.home_row = dictpop(self.maps, "Home Row")
-        self.home_col = dictpop(self.maps, "Home Col")
-        self.start_row = dictpop(self.maps, "Start Row")
-        self.start_col = dictpop(self.maps, "Start Col")
-        self.map_names = sorted(self.maps.keys())
-
-        for key in self.map_names:
-            self.maps[key] = convert_map_list(self.maps[key])
-
-
-def invert_wafer_map(xy_list):
-    """
-    Inverts a wafer map (list of (x, y) coordinate pairs).
-
-    Needed because the OWT files use an exclusion list while everything else
-    uses an *inclusion* list.
-    """
-    # First, find the min and max X and Y coordinates
-    min_x = min([_x for _x, _y in xy_list])         # won't it always be 1?
-    max_x = max([_x for _x, _y in xy_list])
-    min_y = min([_y for _x, _y in xy_list])         # won't it always be 1?
-    max_y = max([_y for _x, _y in xy_list])
-
-    # Then create two lists for all possible points
-    all_x = range(1, max_x + 1)
-    all_y = range(1, max_y + 1)
-    all_xy = {(_x, _y) for _y in all_y for _x in all_x}     # Note it's a set
-
-    # now make our original xy_list into a set and subtract it from all_xy
-    inverted = list(all_xy - set(xy_list))
-    return inverted
-
-
-def convert_map_list(string):
-    """
-    Converts a map string to a list of (X, Y) coord pairs.
-
-    The string looks like
-    "1,1; 1,2; 1,3; 1,4; 1,5; 1,6; 1,7; 1,8; 1,9; 1,10"
-    """
-    xy_list = []
-    for pair in string[1:-1].split("; "):
-        try:
-            xy_list.append(tuple(map(int, pair.split(","))))
-        except ValueError:
-            print("Can't convert '{}'".format(pair))
-            raise
-
-    return invert_wafer_map(xy_list)
-
-
-def dictpop(dictionary, item):
-    """ Deletes an item from a dictionary and returns it. """
-    retval = dictionary[item]
-    del dictionary[item]
-    return retval
-
-
-def xyd_dict_to_xyd_tuple(d):
-    """ Converts a dict of [x{}y{} : data] values to a list of tuples """
-    t = [tuple(list(map(int, s[1:].split("y"))) + ["Every"]) for s in d.keys()]
-    return t
-
-
 def main():
-    """ Main Code """
-    docopt(__doc__, version=__version__)
+    """ Runs the GUI """
+    # The GUI logs to the console, a file and the log viewer. Importing
+    # this module doesn't set up logging.
+    setup_logging()
     MainApp()
 
 
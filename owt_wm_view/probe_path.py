@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          probe_path.py
+@created:       Tue Oct 20 11:26:03 2026
+
+Description:
+    Probe-sequence optimization and test-time estimates for a map.
+
+    Two starting orders are built from the start position: a serpentine
+    (row by row, alternating direction) and a greedy nearest-neighbor walk.
+    Both are then refined with a windowed 2-opt, which is vectorized over
+    the whole path, and the shorter one wins.
+
+    Die positions are grid coordinates; distances are physical (mm), so
+    non-square die are handled correctly. The start position is the first
+    point of the path but is never moved, and a die at the start position
+    is always probed first.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import math
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+NN_RING_LIMIT = 4               # grid rings searched before brute force
+TWO_OPT_WINDOW = 24             # furthest path neighbor tried by 2-opt
+TWO_OPT_PASSES = 50
+STAGE_SPEED = 50.0              # mm/s
+INDEX_TIME = 0.25               # s per move: accel, settle and touchdown
+DEVICE_TEST_TIME = 1.0          # s to test one device
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class ProbePath(object):
+    """
+    An ordered probe sequence.
+
+    Parameters:
+    -----------
+    x, y : (n,) int arrays
+        Grid coordinates of the die, in probe order.
+    start : (int, int)
+        Grid (x, y) of the start position.
+    die_xy : (float, float)
+        Die size in mm.
+    method : str
+        How the order was built.
+    """
+    def __init__(self, x, y, start, die_xy, method):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.start = start
+        self.die_xy = die_xy
+        self.method = method
+        self.travel = path_length(np.concatenate(([start[0]], self.x)),
+                                  np.concatenate(([start[1]], self.y)),
+                                  die_xy)
+
+    def __len__(self):
+        return len(self.x)
+
+    def estimate(self, n_devices, device_time=DEVICE_TEST_TIME,
+                 speed=STAGE_SPEED, index_time=INDEX_TIME):
+        """
+        Estimates the test time of the path.
+
+        Parameters:
+        -----------
+        n_devices : int
+            Devices tested on each die (from the mask's [Devices]).
+        device_time : float
+            Seconds to test one device.
+        speed : float
+            Stage speed in mm/s.
+        index_time : float
+            Fixed overhead per move, in seconds.
+
+        Returns:
+        --------
+        times : dict
+            ``move``, ``test`` and ``total`` seconds, plus ``per_device``,
+            the total divided by the number of device tests.
+        """
+        move = self.travel / speed + len(self) * index_time
+        test = len(self) * n_devices * device_time
+        total = move + test
+        n_tests = len(self) * n_devices
+        return {"move": move,
+                "test": test,
+                "total": total,
+                "per_device": total / n_tests if n_tests else 0.0,
+                }
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def path_length(x, y, die_xy):
+    """ Returns the length (mm) of the open path through grid points """
+    dx = np.diff(np.asarray(x, dtype=float)) * die_xy[0]
+    dy = np.diff(np.asarray(y, dtype=float)) * die_xy[1]
+    return float(np.hypot(dx, dy).sum())
+
+
+def serpentine_order(x, y, start):
+    """
+    Returns the serpentine visiting order of grid points.
+
+    Rows are walked from the end of the wafer nearest the start row, and
+    the first row runs away from the start column.
+
+    Returns:
+    --------
+    order : (n,) int array
+        Indices into ``x`` and ``y``.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if not x.size:
+        return np.arange(0)
+    rows = np.unique(y)
+    if abs(start[1] - rows[-1]) < abs(start[1] - rows[0]):
+        rows = rows[::-1]
+    first_asc = abs(start[0] - x.min()) <= abs(start[0] - x.max())
+    rank = np.empty(rows.max() - rows.min() + 1, dtype=np.intp)
+    rank[rows - rows.min()] = np.arange(rows.size)
+    row_rank = rank[y - rows.min()]
+    ascending = (row_rank % 2 == 0) == first_asc
+    return np.lexsort((np.where(ascending, x, -x), row_rank))
+
+
+def nearest_neighbor_order(x, y, die_xy, start):
+    """
+    Returns a greedy nearest-neighbor visiting order of grid points.
+
+    Each next die is found by searching the grid rings around the current
+    die in a hash of the unvisited die. If none are within
+    ``NN_RING_LIMIT`` rings, all unvisited die are checked at once.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = x.size
+    size_x, size_y = die_xy
+    step = min(size_x, size_y)
+    unvisited = {(int(_x), int(_y)): _i
+                 for _i, (_x, _y) in enumerate(zip(x, y))}
+    alive = np.ones(n, dtype=bool)
+    order = np.empty(n, dtype=np.intp)
+    cur_x, cur_y = start
+
+    for k in range(n):
+        best = -1
+        best_d = math.inf
+        for ring in range(NN_RING_LIMIT + 1):
+            for g_x, g_y in _ring_cells(cur_x, cur_y, ring):
+                idx = unvisited.get((g_x, g_y))
+                if idx is None:
+                    continue
+                d = ((g_x - cur_x) * size_x)**2 + ((g_y - cur_y) * size_y)**2
+                if d < best_d:
+                    best, best_d = idx, d
+            # Nothing in a further ring can be closer than this.
+            if best >= 0 and ((ring + 1) * step)**2 >= best_d:
+                break
+        else:
+            dist = (((x - cur_x) * size_x)**2
+                    + ((y - cur_y) * size_y)**2).astype(float)
+            dist[~alive] = math.inf
+            best = int(np.argmin(dist))
+
+        order[k] = best
+        alive[best] = False
+        cur_x, cur_y = int(x[best]), int(y[best])
+        del unvisited[(cur_x, cur_y)]
+    return order
+
+
+def _ring_cells(c_x, c_y, ring):
+    """ Yields the grid cells at Chebyshev distance ``ring`` """
+    if ring == 0:
+        yield c_x, c_y
+        return
+    for d in range(-ring, ring + 1):
+        yield c_x + d, c_y - ring
+        yield c_x + d, c_y + ring
+    for d in range(-ring + 1, ring):
+        yield c_x - ring, c_y + d
+        yield c_x + ring, c_y + d
+
+
+def two_opt(px, py, window=TWO_OPT_WINDOW, max_passes=TWO_OPT_PASSES):
+    """
+    Shortens an open path with windowed 2-opt moves.
+
+    A move reverses the points between two edges ``(i, i+1)`` and
+    ``(j, j+1)`` with ``j - i <= window``. Each pass computes the gain of
+    every such move at once, takes the best move for each ``i``, and
+    applies as many non-overlapping ones as possible. Point 0 never moves.
+
+    Parameters:
+    -----------
+    px, py : (n,) float arrays
+        Physical coordinates of the points, in path order.
+
+    Returns:
+    --------
+    order : (n,) int array
+        The improved order, as indices into ``px`` and ``py``.
+    """
+    n = len(px)
+    order = np.arange(n)
+    if n < 4:
+        return order
+    for _ in range(max_passes):
+        x = px[order]
+        y = py[order]
+        edge = np.hypot(np.diff(x), np.diff(y))
+        best_gain = np.zeros(n - 1)
+        best_j = np.zeros(n - 1, dtype=np.intp)
+        for offset in range(2, min(window, n - 2) + 1):
+            i = np.arange(n - 1 - offset)
+            j = i + offset
+            gain = (edge[i] + edge[j]
+                    - np.hypot(x[i] - x[j], y[i] - y[j])
+                    - np.hypot(x[i + 1] - x[j + 1], y[i + 1] - y[j + 1]))
+            better = gain > best_gain[i]
+            best_gain[i[better]] = gain[better]
+            best_j[i[better]] = j[better]
+
+        cand = np.flatnonzero(best_gain > 1e-9)
+        if not cand.size:
+            break
+        cand = cand[np.argsort(-best_gain[cand])]
+        used = np.zeros(n, dtype=bool)
+        for i in cand.tolist():
+            j = int(best_j[i])
+            if used[i:j + 2].any():
+                continue
+            used[i:j + 2] = True
+            order[i + 1:j + 1] = order[i + 1:j + 1][::-1].copy()
+    return order
+
+
+def optimize_path(x, y, die_xy, start):
+    """
+    Builds the shortest probe path found for a set of die.
+
+    Parameters:
+    -----------
+    x, y : (n,) int arrays
+        Grid coordinates of the die.
+    die_xy : (float, float)
+        Die size in mm.
+    start : (int, int)
+        Grid (x, y) of the start position.
+
+    Returns:
+    --------
+    path : ProbePath
+    """
+    x = np.asarray(x, dtype=np.intp)
+    y = np.asarray(y, dtype=np.intp)
+    # The die under the probe at the start goes first; 2-opt could move it.
+    at_start = (x == start[0]) & (y == start[1])
+    first_x = x[at_start]
+    first_y = y[at_start]
+    x = x[~at_start]
+    y = y[~at_start]
+    best = None
+    for method, order in (
+            ("serpentine", serpentine_order(x, y, start)),
+            ("nearest neighbor", nearest_neighbor_order(x, y, die_xy, start)),
+            ):
+        # Prepend the start so the first move is refined too.
+        px = np.concatenate(([start[0]], x[order])) * float(die_xy[0])
+        py = np.concatenate(([start[1]], y[order])) * float(die_xy[1])
+        refined = order[two_opt(px, py)[1:] - 1]
+        path = ProbePath(np.concatenate((first_x, x[refined])),
+                         np.concatenate((first_y, y[refined])),
+                         start,
+                         die_xy,
+                         method + " + 2-opt",
+                         )
+        if best is None or path.travel < best.travel:
+            best = path
+    return best
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          render.py
+@created:       Mon Oct 19 22:14:37 2026
+
+Description:
+    Headless wafer map rendering.
+
+    Maps are rasterized with numpy (no wx, no display needed) and encoded
+    as PNG with zlib. Each image row/column is mapped to a grid row/column
+    once, so rendering is a single fancy-index of the die grid.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import struct
+import zlib
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+COLOR_DIE = (0, 160, 0)
+COLOR_EMPTY = (255, 255, 255)       # grid location not in the map
+COLOR_BORDER = (90, 90, 90)         # die edges
+COLOR_OUTSIDE = (225, 225, 225)     # off the wafer
+COLOR_OUTLINE = (0, 0, 0)
+MARGIN_MM = 2
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def map_grid(rc_list, rows, cols):
+    """
+    Converts a map list of (row, col) pairs to a (rows, cols) bool grid.
+    """
+    grid = np.zeros((int(rows), int(cols)), dtype=bool)
+    if len(rc_list):
+        rc = np.asarray(rc_list, dtype=np.intp)
+        keep = ((rc[:, 0] >= 1) & (rc[:, 0] <= rows)
+                & (rc[:, 1] >= 1) & (rc[:, 1] <= cols))
+        grid[rc[keep, 0] - 1, rc[keep, 1] - 1] = True
+    return grid
+
+
+def pixel_grid(n_px, px_per_mm, origin_mm, die_mm, center):
+    """
+    Maps each pixel along one image axis to a grid index and die phase.
+
+    Image X increases with column and image Y (downward) increases with
+    row, so the same mapping works for both axes.
+
+    Returns:
+    --------
+    grid_idx : (n_px,) int array
+        1-indexed grid column (or row).
+    phase : (n_px,) float array
+        Position within the die, 0 to 1.
+    """
+    mm = origin_mm + (np.arange(n_px) + 0.5) / px_per_mm
+    pos = mm / die_mm + center + 0.5
+    grid_idx = np.floor(pos).astype(np.intp)
+    return grid_idx, pos - grid_idx
+
+
+def render_rgb(grid, die_xy, center_xy, dia, px_per_mm=4, values=None,
+               colormap=None):
+    """
+    Rasterizes a die grid to an RGB image of the whole wafer.
+
+    See ``render_window`` for the parameters.
+
+    Returns:
+    --------
+    rgb : (height, width, 3) uint8 array
+        Row 0 is the top of the wafer.
+    """
+    half = dia / 2 + MARGIN_MM
+    size = int(np.ceil(2 * half * px_per_mm))
+    return render_window(grid, die_xy, center_xy, dia, px_per_mm,
+                         (-half, -half), (size, size), values, colormap)
+
+
+def render_window(grid, die_xy, center_xy, dia, px_per_mm, origin_mm,
+                  shape, values=None, colormap=None, outline=True):
+    """
+    Rasterizes a rectangular window of the wafer to an RGB image.
+
+    Parameters:
+    -----------
+    grid : (rows, cols) bool array
+        Die in the map, indexed ``[row - 1, col - 1]``.
+    die_xy : (float, float)
+        Die size in mm.
+    center_xy : (float, float)
+        The grid coordinate of the wafer center.
+    dia : float
+        Wafer diameter in mm.
+    px_per_mm : float
+        Image scale.
+    origin_mm : (float, float)
+        Top-left corner of the window, in mm from the wafer center. X is
+        to the right and Y is *down*, like image rows.
+    shape : (int, int)
+        The window's (height, width) in pixels.
+    values : (rows, cols) float array, optional
+        Per-die values in [0, 1]; colored with ``colormap`` instead of
+        ``COLOR_DIE``.
+    colormap : (256, 3) uint8 array, optional
+        Defaults to a black -> green ramp.
+    outline : bool
+        Draw the wafer outline and shade everything off the wafer.
+
+    Returns:
+    --------
+    rgb : (height, width, 3) uint8 array
+    """
+    rows, cols = grid.shape
+    height, width = shape
+
+    col, col_phase = pixel_grid(width, px_per_mm, origin_mm[0], die_xy[0],
+                                center_xy[0])
+    # Image rows go down, and so do grid rows.
+    row, row_phase = pixel_grid(height, px_per_mm, origin_mm[1], die_xy[1],
+                                center_xy[1])
+
+    in_grid = (((row >= 1) & (row <= rows))[:, None]
+               & ((col >= 1) & (col <= cols))[None, :])
+    r_idx = np.clip(row - 1, 0, rows - 1)
+    c_idx = np.clip(col - 1, 0, cols - 1)
+    die = grid[r_idx[:, None], c_idx[None, :]] & in_grid
+
+    rgb = np.empty((height, width, 3), dtype=np.uint8)
+    rgb[...] = COLOR_EMPTY
+    if values is None:
+        rgb[die] = COLOR_DIE
+    else:
+        if colormap is None:
+            colormap = np.zeros((256, 3), dtype=np.uint8)
+            colormap[:, 1] = np.arange(256)
+        vals = values[r_idx[:, None], c_idx[None, :]]
+        levels = np.nan_to_num(np.clip(vals, 0, 1) * 255).astype(np.uint8)
+        rgb[die] = colormap[levels[die]]
+
+    # Die borders, one pixel wide, only where there's a die.
+    edge = 1 / (np.array(die_xy) * px_per_mm)
+    border = ((row_phase < edge[1])[:, None]
+              | (col_phase < edge[0])[None, :])
+    rgb[die & border] = COLOR_BORDER
+
+    if not outline:
+        return rgb
+
+    # Wafer outline and everything off the wafer.
+    mm_x = origin_mm[0] + (np.arange(width) + 0.5) / px_per_mm
+    mm_y = origin_mm[1] + (np.arange(height) + 0.5) / px_per_mm
+    radius = np.hypot(mm_x[None, :], mm_y[:, None])
+    rgb[radius > dia / 2] = COLOR_OUTSIDE
+    rgb[np.abs(radius - dia / 2) < 1 / px_per_mm] = COLOR_OUTLINE
+    return rgb
+
+
+def encode_png(rgb):
+    """ Encodes an (h, w, 3) uint8 array as PNG bytes """
+    height, width, _ = rgb.shape
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(height, width * 3)    # filter type 0 per row
+
+    def chunk(kind, data):
+        body = kind + data
+        return (struct.pack(">I", len(data)) + body
+                + struct.pack(">I", zlib.crc32(body) & 0xffffffff))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"".join([b"\x89PNG\r\n\x1a\n",
+                     chunk(b"IHDR", header),
+                     chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)),
+                     chunk(b"IEND", b""),
+                     ])
+
+
+def render_map_png(mask, map_name, px_per_mm=4):
+    """
+    Renders one of a Mask's maps as PNG bytes.
+
+    ``mask`` is a ``Mask`` instance (only its geometry and maps are used).
+    """
+    grid = map_grid(mask.maps[map_name],
+                    int(mask.row_count),
+                    int(mask.col_count))
+    rgb = render_rgb(grid, mask.die_xy, mask.center_xy, mask.dia, px_per_mm)
+    return encode_png(rgb)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          resample.py
+@created:       Wed Oct 21 13:18:44 2026
+
+Description:
+    Resamples a die set from one mask's grid onto another's.
+
+    Die are rectangles, so the area shared by a target die and a source die
+    is the product of their overlaps along X and along Y. With ``Ox`` the
+    (target cols, source cols) matrix of X overlaps and ``Oy`` the
+    (target rows, source rows) matrix of Y overlaps, the area of every
+    target die covered by the source die set ``S`` is::
+
+        covered = Oy . S . Ox^T
+
+    which is two small matrix products, no matter how many die there are.
+
+    Grids are placed by their wafer center: physical coordinates are mm
+    from the center, +X toward higher columns and +Y toward lower rows.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import geometry
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import geometry
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import geometry
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+# Coverage thresholds by name: any overlap, at least half, fully covered.
+THRESHOLDS = {"any": 1e-9,
+              "majority": 0.5,
+              "full": 1 - 1e-9,
+              }
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def die_edges(n, size, center, flip=False):
+    """
+    Returns the low and high edges (mm) of each die along one axis.
+
+    Parameters:
+    -----------
+    n : int
+        Number of grid positions (1 to n).
+    size : float
+        Die size along the axis, mm.
+    center : float
+        Grid coordinate of the wafer center along the axis.
+    flip : bool
+        True for rows, where the physical axis points toward lower
+        grid numbers.
+    """
+    mid = (np.arange(1, n + 1) - center) * size
+    if flip:
+        mid = -mid
+    return mid - size / 2, mid + size / 2
+
+
+def overlap_matrix(dst_edges, src_edges):
+    """
+    Returns the overlap length of every (target, source) pair of intervals.
+
+    Both arguments are (low, high) tuples of arrays, as from ``die_edges``.
+    """
+    dst_lo, dst_hi = dst_edges
+    src_lo, src_hi = src_edges
+    length = (np.minimum(dst_hi[:, None], src_hi[None, :])
+              - np.maximum(dst_lo[:, None], src_lo[None, :]))
+    return np.maximum(length, 0)
+
+
+def coverage(src_grid, src_die_xy, src_center_xy,
+             dst_shape, dst_die_xy, dst_center_xy, offset=(0, 0)):
+    """
+    Returns the fraction of each target die covered by a source die set.
+
+    Parameters:
+    -----------
+    src_grid : (src_rows, src_cols) bool array
+        The source die, indexed ``[row - 1, col - 1]``.
+    src_die_xy, src_center_xy : (float, float)
+        The source mask's die size and grid center.
+    dst_shape : (int, int)
+        The target grid (rows, cols).
+    dst_die_xy, dst_center_xy : (float, float)
+        The target mask's die size and grid center.
+    offset : (float, float)
+        Physical shift (mm) of the source wafer relative to the target.
+
+    Returns:
+    --------
+    fraction : (dst_rows, dst_cols) float array
+        0 to 1.
+    """
+    src_rows, src_cols = src_grid.shape
+    dst_rows, dst_cols = dst_shape
+    src_x = die_edges(src_cols, src_die_xy[0], src_center_xy[0])
+    src_y = die_edges(src_rows, src_die_xy[1], src_center_xy[1], flip=True)
+    src_x = (src_x[0] + offset[0], src_x[1] + offset[0])
+    src_y = (src_y[0] + offset[1], src_y[1] + offset[1])
+    dst_x = die_edges(dst_cols, dst_die_xy[0], dst_center_xy[0])
+    dst_y = die_edges(dst_rows, dst_die_xy[1], dst_center_xy[1], flip=True)
+
+    o_x = overlap_matrix(dst_x, src_x)
+    o_y = overlap_matrix(dst_y, src_y)
+    covered = o_y @ src_grid.astype(float) @ o_x.T
+    return np.clip(covered / (dst_die_xy[0] * dst_die_xy[1]), 0, 1)
+
+
+def source_centers(src_grid, src_die_xy, src_center_xy,
+                   dst_die_xy, dst_center_xy, offset=(0, 0)):
+    """
+    Returns the source die centers in target grid coordinates.
+
+    Used to draw the source die on the target's wafer map.
+
+    Returns:
+    --------
+    xy : (n, 2) float array
+        Fractional target (X, Y) grid coordinates.
+    """
+    rows, cols = np.nonzero(src_grid)
+    dx, dy = geometry.die_offsets(cols + 1, rows + 1, src_die_xy,
+                                  src_center_xy)
+    dx = dx + offset[0]
+    dy = dy + offset[1]
+    return np.column_stack([dst_center_xy[0] + dx / dst_die_xy[0],
+                            dst_center_xy[1] - dy / dst_die_xy[1]])
+
+
+def coverage_to_map(fraction, threshold=THRESHOLDS["majority"]):
+    """
+    Returns the target die covered by at least ``threshold``.
+
+    Returns:
+    --------
+    rc_list : list of (row, col) tuples
+        Same format as the values of ``Mask.maps``.
+    """
+    rows, cols = np.nonzero(fraction >= threshold)
+    return list(zip((rows + 1).tolist(), (cols + 1).tolist()))
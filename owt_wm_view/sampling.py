@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          sampling.py
+@created:       Tue Oct 20 14:02:51 2026
+
+Description:
+    Sparse sampling maps.
+
+    Picks a target number of die out of a full die set with one of three
+    methods:
+
+    ``n_point``
+        The standard N-point patterns (center plus rings of sites), each
+        site snapped to the nearest die.
+    ``uniform_radial``
+        Evenly spaced rings, with sites spread around each ring in
+        proportion to its circumference.
+    ``stratified_random``
+        Random die, allocated to equal-area ring x sector zones in
+        proportion to the die count of each zone.
+
+    Coverage metrics are computed for the whole die set at once so that
+    candidate samples can be compared interactively.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import math
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import geometry
+    from . import zones
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import geometry
+        import zones
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import geometry
+        from owt_wm_view import zones
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+# Standard patterns: (fraction of the sampled radius, angle in degrees).
+N_POINT_PATTERNS = {
+    1: [(0, 0)],
+    5: [(0, 0)] + [(0.6, _a) for _a in (0, 90, 180, 270)],
+    9: ([(0, 0)]
+        + [(0.45, _a) for _a in (45, 135, 225, 315)]
+        + [(0.85, _a) for _a in (0, 90, 180, 270)]),
+    13: ([(0, 0)]
+         + [(0.35, _a) for _a in (0, 90, 180, 270)]
+         + [(0.8, _a) for _a in range(0, 360, 45)]),
+    17: ([(0, 0)]
+         + [(0.45, _a) for _a in range(0, 360, 45)]
+         + [(0.85, _a + 22.5) for _a in range(0, 360, 45)]),
+}
+METHODS = ("n_point", "uniform_radial", "stratified_random")
+STRATA_RINGS = 4
+STRATA_SECTORS = 8
+METRIC_BLOCK = 1 << 20          # elements per block of a distance matrix
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class Sampler(object):
+    """
+    Builds sampling maps from a full die set.
+
+    Samples are returned as sorted index arrays into ``x`` and ``y``.
+
+    Parameters:
+    -----------
+    x, y : (n,) int arrays
+        Grid coordinates of every die that may be sampled.
+    die_xy : (float, float)
+        Die size in mm.
+    center_xy : (float, float)
+        The grid coordinate of the wafer center.
+    dia : float
+        Wafer diameter in mm.
+    """
+    def __init__(self, x, y, die_xy, center_xy, dia):
+        self.x = np.asarray(x, dtype=np.intp)
+        self.y = np.asarray(y, dtype=np.intp)
+        self.dia = dia
+        self.dx, self.dy = geometry.die_offsets(self.x, self.y,
+                                                die_xy, center_xy)
+        self.radius = np.hypot(self.dx, self.dy)
+        self.angle = zones.die_angle(self.dx, self.dy)
+        # Sites are placed relative to the outermost die, not the wafer.
+        self.r_max = float(self.radius.max()) if self.x.size else 0.0
+
+    def __len__(self):
+        return self.x.size
+
+    def sample(self, method, n, seed=None):
+        """ Calls the sampling method named ``method`` """
+        if method not in METHODS:
+            raise ValueError("Unknown sampling method: {!r}".format(method))
+        if method == "stratified_random":
+            return self.stratified_random(n, seed)
+        return getattr(self, method)(n)
+
+    def n_point(self, n):
+        """ Returns the standard ``n``-point pattern (see N_POINT_PATTERNS) """
+        try:
+            sites = np.array(N_POINT_PATTERNS[n], dtype=float)
+        except KeyError:
+            raise ValueError("No standard {}-point pattern. Choose from "
+                             "{}".format(n, sorted(N_POINT_PATTERNS)))
+        angle = np.radians(sites[:, 1])
+        r = sites[:, 0] * self.r_max
+        return self.snap(r * np.cos(angle), r * np.sin(angle))
+
+    def uniform_radial(self, n):
+        """
+        Returns ``n`` sites on evenly spaced rings.
+
+        The ring count is chosen so the spacing along each ring is about
+        the spacing between rings. Alternate rings are rotated by half a
+        site so that sites don't line up radially.
+        """
+        n = min(int(n), len(self))
+        if n <= 1:
+            return self.snap([0.0], [0.0])[:n]
+        n_rings = max(int(round(math.sqrt((n - 1) / math.pi))), 1)
+        radii = self.r_max * np.arange(1, n_rings + 1) / n_rings
+        counts = _allocate(n - 1, radii)
+
+        site_x = [0.0]
+        site_y = [0.0]
+        for k, (r, count) in enumerate(zip(radii, counts)):
+            if not count:
+                continue
+            angle = 2 * np.pi * (np.arange(count) + 0.5 * (k % 2)) / count
+            site_x.extend(r * np.cos(angle))
+            site_y.extend(r * np.sin(angle))
+        return self.snap(site_x, site_y)
+
+    def stratified_random(self, n, seed=None, n_rings=STRATA_RINGS,
+                          n_sectors=STRATA_SECTORS):
+        """
+        Returns ``n`` random die, stratified by equal-area zones.
+
+        Each ring x sector zone gets a share of ``n`` proportional to the
+        number of die in it, and its die are picked at random.
+        """
+        n = min(int(n), len(self))
+        analysis = zones.ZoneAnalysis(self.radius,
+                                      self.angle,
+                                      2 * self.r_max + 1e-9,
+                                      n_rings,
+                                      n_sectors,
+                                      )
+        zone = analysis.ring_idx * n_sectors + analysis.sector_idx
+        zone[(analysis.ring_idx < 0) | (analysis.sector_idx < 0)] = 0
+        counts = np.bincount(zone, minlength=n_rings * n_sectors)
+        quota = _allocate(n, counts)
+
+        # Shuffle within zones: sort by zone, then by a random key, and
+        # keep the first ``quota`` die of each zone.
+        rng = np.random.default_rng(seed)
+        order = np.lexsort((rng.random(len(self)), zone))
+        zone_sorted = zone[order]
+        first = np.searchsorted(zone_sorted, np.arange(counts.size))
+        rank = np.arange(len(self)) - first[zone_sorted]
+        return np.sort(order[rank < quota[zone_sorted]])
+
+    def snap(self, site_x, site_y):
+        """
+        Returns the nearest distinct die to each site (mm offsets).
+
+        Sites are assigned in order; a die already taken by an earlier site
+        isn't reused. The site x die distances are computed a block of
+        sites at a time (see ``_block_rows``).
+        """
+        n_sites = min(len(site_x), len(self))
+        site_x = np.asarray(site_x, dtype=float)[:n_sites]
+        site_y = np.asarray(site_y, dtype=float)[:n_sites]
+        taken = np.zeros(len(self), dtype=bool)
+        picked = []
+        rows = _block_rows(len(self))
+        for start in range(0, n_sites, rows):
+            stop = start + rows
+            dist2 = _dist2(site_x[start:stop], site_y[start:stop],
+                           self.dx, self.dy)
+            # The nearest die is usually free; only mask if it's taken.
+            for row, idx in zip(dist2, dist2.argmin(axis=1).tolist()):
+                if taken[idx]:
+                    row[taken] = np.inf
+                    idx = int(np.argmin(row))
+                taken[idx] = True
+                picked.append(idx)
+        return np.sort(np.array(picked, dtype=np.intp))
+
+    def metrics(self, idx):
+        """
+        Returns coverage metrics for a sample.
+
+        Returns:
+        --------
+        metrics : dict
+            ``count``; ``max_gap`` and ``mean_gap``, the largest and mean
+            distance (mm) from any die to its nearest sampled die;
+            ``min_spacing``, the closest pair of sampled die (mm); and
+            ``ring_error`` / ``sector_error``, the largest difference
+            between the sample's and the die set's share of any
+            equal-area ring or sector.
+        """
+        idx = np.asarray(idx, dtype=np.intp)
+        result = {"count": int(idx.size)}
+        if not idx.size:
+            result.update(max_gap=math.inf, mean_gap=math.inf,
+                          min_spacing=math.inf, ring_error=1.0,
+                          sector_error=1.0)
+            return result
+
+        nearest = nearest_distance(self.dx, self.dy,
+                                   self.dx[idx], self.dy[idx])
+        result["max_gap"] = float(nearest.max())
+        result["mean_gap"] = float(nearest.mean())
+
+        result["min_spacing"] = min_spacing(self.dx[idx], self.dy[idx])
+
+        ring_edges = zones.equal_area_edges(2 * self.r_max + 1e-9,
+                                            STRATA_RINGS)
+        result["ring_error"] = _share_error(self.radius, idx, ring_edges)
+        result["sector_error"] = _share_error(
+            self.angle, idx, zones.sector_edges(STRATA_SECTORS))
+        return result
+
+    def to_map(self, idx):
+        """ Returns a sample as a map list of (row, col) tuples """
+        idx = np.asarray(idx, dtype=np.intp)
+        return sorted(zip(self.y[idx].tolist(), self.x[idx].tolist()))
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def nearest_distance(x, y, site_x, site_y):
+    """
+    Returns the distance from each (x, y) point to its nearest site.
+
+    The distance matrix is built a block of points at a time (see
+    ``_block_rows``) to keep memory bounded.
+    """
+    result = np.empty(len(x))
+    rows = _block_rows(len(site_x))
+    for start in range(0, len(x), rows):
+        stop = start + rows
+        result[start:stop] = _dist2(x[start:stop], y[start:stop],
+                                    site_x, site_y).min(axis=1)
+    return np.sqrt(result)
+
+
+def min_spacing(x, y):
+    """
+    Returns the smallest distance between any two of the points.
+
+    Only pairs (i, j) with i < j are computed, a block of rows at a time.
+    Returns inf for fewer than two points.
+    """
+    n = len(x)
+    best = math.inf
+    rows = _block_rows(n)
+    for start in range(0, n - 1, rows):
+        stop = min(start + rows, n)
+        dist2 = _dist2(x[start:stop], y[start:stop], x[start:], y[start:])
+        # Drop j <= i, the diagonal and the pairs already seen.
+        dist2[np.tri(stop - start, n - start, dtype=bool)] = np.inf
+        best = min(best, float(dist2.min()))
+    return math.sqrt(best)
+
+
+def _block_rows(n_cols):
+    """ Returns the rows per block of an (n, n_cols) distance matrix """
+    return max(METRIC_BLOCK // max(n_cols, 1), 1)
+
+
+def _dist2(x, y, site_x, site_y):
+    """ Returns the (len(x), len(site_x)) squared distances """
+    dist2 = np.subtract.outer(x, site_x)
+    dist2 *= dist2
+    dist_y = np.subtract.outer(y, site_y)
+    dist_y *= dist_y
+    dist2 += dist_y
+    return dist2
+
+
+def _allocate(n, weights):
+    """
+    Splits ``n`` into integer shares proportional to ``weights``.
+
+    Uses the largest-remainder method, so the shares always sum to ``n``.
+    """
+    weights = np.asarray(weights, dtype=float)
+    if n <= 0 or weights.sum() <= 0:
+        return np.zeros(weights.size, dtype=np.intp)
+    exact = n * weights / weights.sum()
+    shares = np.floor(exact).astype(np.intp)
+    remainder = int(n - shares.sum())
+    if remainder:
+        shares[np.argsort(shares - exact)[:remainder]] += 1
+    return shares
+
+
+def _share_error(values, idx, edges):
+    """ Largest difference in the share of die per bin, sample vs all """
+    bins = zones.bin_index(values, edges)
+    n_bins = len(edges) - 1
+    every = np.bincount(bins[bins >= 0], minlength=n_bins)
+    sample_bins = bins[idx]
+    sample = np.bincount(sample_bins[sample_bins >= 0], minlength=n_bins)
+    return float(np.abs(sample / max(sample.sum(), 1)
+                        - every / max(every.sum(), 1)).max())
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          selection.py
+@created:       Tue Oct 20 09:12:40 2026
+
+Description:
+    Region selection of die on the mask grid.
+
+    Every selection is a single vectorized query over the whole Rows x Cols
+    grid and returns a (rows, cols) bool array, indexed ``[row - 1,
+    col - 1]`` like ``geometry.grid_mask``. Edits combine a selection with
+    the die currently in the map in one array operation.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+ADD = "add"
+REMOVE = "remove"
+INVERT = "invert"
+EDIT_MODES = (ADD, REMOVE, INVERT)
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def rect_select(x, y, corner_1, corner_2):
+    """
+    Selects the die whose centers are inside a rectangle.
+
+    Parameters:
+    -----------
+    x, y : (rows, cols) float arrays
+        Die-center coordinates, e.g. from ``geometry.grid_die_centers``.
+    corner_1, corner_2 : (float, float)
+        Opposite corners of the rectangle, in the same coordinates.
+    """
+    x_min, x_max = sorted((corner_1[0], corner_2[0]))
+    y_min, y_max = sorted((corner_1[1], corner_2[1]))
+    return (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+
+
+def lasso_select(x, y, polygon):
+    """
+    Selects the die whose centers are inside a polygon.
+
+    Uses the even-odd rule. The polygon is closed automatically. Only the
+    die inside its bounding box are tested, one edge at a time.
+
+    Parameters:
+    -----------
+    x, y : (rows, cols) float arrays
+        Die-center coordinates.
+    polygon : (n, 2) array-like
+        The lasso vertices.
+    """
+    poly = np.asarray(polygon, dtype=float).reshape(-1, 2)
+    selected = np.zeros(np.shape(x), dtype=bool)
+    if len(poly) < 3:
+        return selected
+
+    (x_min, y_min), (x_max, y_max) = poly.min(axis=0), poly.max(axis=0)
+    candidates = (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+    px = x[candidates]
+    py = y[candidates]
+
+    inside = np.zeros(px.shape, dtype=bool)
+    x_1, y_1 = poly[-1]
+    for x_2, y_2 in poly:
+        # Does a ray to +X from the point cross this edge?
+        spans = (y_1 > py) != (y_2 > py)
+        if spans.any():
+            cross_x = x_1 + (py - y_1) * (x_2 - x_1) / np.where(
+                y_2 == y_1, 1, y_2 - y_1)
+            inside ^= spans & (px < cross_x)
+        x_1, y_1 = x_2, y_2
+
+    selected[candidates] = inside
+    return selected
+
+
+def ring_select(radius, r_min, r_max):
+    """
+    Selects the die with ``r_min <= radius <= r_max``.
+
+    ``radius`` is the (rows, cols) array of die-center radii, e.g.
+    ``geometry.die_radius`` over the whole grid.
+    """
+    return (radius >= r_min) & (radius <= r_max)
+
+
+def apply_edit(current, selected, mode):
+    """
+    Applies a selection to the die in a map as one batched edit.
+
+    Parameters:
+    -----------
+    current : (rows, cols) bool array
+        The die currently in the map.
+    selected : (rows, cols) bool array
+        The selected die.
+    mode : str
+        ``ADD``, ``REMOVE`` or ``INVERT``.
+
+    Returns:
+    --------
+    new : (rows, cols) bool array
+    """
+    if mode == ADD:
+        return current | selected
+    elif mode == REMOVE:
+        return current & ~selected
+    elif mode == INVERT:
+        return current ^ selected
+    raise ValueError("Unknown edit mode: {!r}".format(mode))
@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          server.py
+@created:       Mon Oct 19 22:48:05 2026
+
+Description:
+    Local HTTP wafer-map service.
+
+    Serves the masks in the local mask mirror as JSON and rendered PNGs,
+    using the ``core.Mask`` model and the headless renderer in ``render``.
+    No wx is needed.
+
+    Routes::
+
+        /masks                          list of mask names
+        /masks/<mask>                   mask info and map names
+        /masks/<mask>/maps/<map>        die list (JSON)
+        /masks/<mask>/maps/<map>.png    rendered map; ?px=N pixels per mm
+
+    Requests are handled on a fixed thread pool. Every response carries an
+    ETag and Last-Modified derived from the mask file's size and mtime, so
+    clients revalidate with If-None-Match / If-Modified-Since and get a
+    304 until the mask file changes.
+
+    Rendered PNGs go through a shared cache (in memory, then on disk).
+    Concurrent requests for the same image wait on a single render.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import collections
+import concurrent.futures
+import email.utils
+import hashlib
+import http.server
+import json
+import logging
+import os
+import os.path as osp
+import socket
+import tempfile
+import threading
+import urllib.parse
+
+# Third-Party
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import core
+    from . import mask_mirror
+    from . import render
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import core
+        import mask_mirror
+        import render
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import core
+        from owt_wm_view import mask_mirror
+        from owt_wm_view import render
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8050
+DEFAULT_WORKERS = 8
+DEFAULT_CACHE_DIR = osp.join(osp.expanduser("~"), ".owt_wm_view",
+                             "render_cache")
+MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+MASK_CACHE_SIZE = 32            # loaded masks kept, least recently used go
+DEFAULT_PX_PER_MM = 4
+MAX_PX_PER_MM = 20
+REQUEST_TIMEOUT_S = 5           # idle keep-alive connections are closed
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class MaskStore(object):
+    """
+    Thread-safe cache of loaded masks.
+
+    A mask is re-read only when the size or mtime of its mirrored .ini
+    file changes. Concurrent requests for a mask that isn't loaded yet
+    share a single load. Only the ``max_masks`` most recently used masks
+    are kept.
+
+    Parameters:
+    -----------
+    mask_class : class, optional
+        Called as ``mask_class(name)`` to load a mask. Defaults to
+        ``core.Mask``.
+    mirror : MaskMirror, optional
+        Defaults to ``mask_mirror.get_mirror()``.
+    max_masks : int
+        Number of loaded masks to keep.
+    """
+    def __init__(self, mask_class=None, mirror=None,
+                 max_masks=MASK_CACHE_SIZE):
+        self.mask_class = mask_class or core.Mask
+        self.mirror = mirror or mask_mirror.get_mirror()
+        self.max_masks = max_masks
+        self._masks = collections.OrderedDict()     # {name: (stamp, mask)}
+        self._locks = {}            # {name: Lock}, one load at a time
+        self._lock = threading.Lock()
+
+    def names(self):
+        return self.mirror.list_masks()
+
+    def stamp(self, name):
+        """
+        Returns the (size, mtime_ns) stamp of a mask's mirrored file.
+
+        Raises FileNotFoundError if there's no such mask, and ValueError
+        if ``name`` isn't a plain file name (e.g. "../other").
+        """
+        mask_mirror.check_name(name)
+        return self.mirror.stamp(name + ".ini")
+
+    def get(self, name):
+        """ Returns (stamp, mask), loading the mask if it's new or stale """
+        stamp = self.stamp(name)
+        with self._lock:
+            cached = self._masks.get(name)
+            if cached is not None and cached[0] == stamp:
+                self._masks.move_to_end(name)
+                return cached
+            load_lock = self._locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                cached = self._masks.get(name)
+            if cached is None or cached[0] != stamp:
+                logging.info("Loading mask %s", name)
+                cached = (stamp, self.mask_class(name))
+                with self._lock:
+                    self._masks[name] = cached
+                    self._masks.move_to_end(name)
+                    while len(self._masks) > self.max_masks:
+                        self._masks.popitem(last=False)
+            return cached
+
+
+class RenderCache(object):
+    """
+    Two-level cache of rendered images: an LRU in memory, then files.
+
+    Keys must change whenever the image would (see ``make_etag``), so
+    entries never need invalidating. Only one thread renders a given key;
+    the others wait for it and then read the result from memory.
+
+    Parameters:
+    -----------
+    cache_dir : str, optional
+        Directory for the on-disk cache. Memory only if None.
+    max_bytes : int
+        Size limit of the in-memory cache.
+    """
+    def __init__(self, cache_dir=None, max_bytes=MEMORY_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._memory = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._inflight = {}         # {key: Lock} of renders in progress
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, key, render_func):
+        """
+        Returns the cached bytes for ``key``, calling ``render_func()`` to
+        create them if they're in neither cache.
+        """
+        data = self._get_memory(key)
+        if data is not None:
+            return data
+
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                data = self._get_memory(key)
+                if data is None:
+                    data = self._read_disk(key)
+                    if data is None:
+                        data = render_func()
+                        self._write_disk(key, data)
+                    self._put_memory(key, data)
+                return data
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _get_memory(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+            return data
+
+    def _put_memory(self, key, data):
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and len(self._memory) > 1:
+                _, old = self._memory.popitem(last=False)
+                self._size -= len(old)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return osp.join(self.cache_dir, digest + ".png")
+
+    def _read_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as openf:
+                return openf.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        """ Writes to a temp file then renames, so readers never see
+        a partial file """
+        if self.cache_dir is None:
+            return
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as openf:
+                openf.write(data)
+            os.replace(tmp, self._disk_path(key))
+        except OSError as err:
+            logging.warning("Unable to write render cache: %s", err)
+
+
+class ThreadPoolHTTPServer(http.server.HTTPServer):
+    """
+    HTTPServer that handles each request on a fixed thread pool.
+
+    A worker stays with a keep-alive connection until the client closes
+    it or it's idle for the handler's ``timeout``. ``server_close`` shuts
+    down every open connection so that no worker is left waiting on one.
+    """
+    def __init__(self, address, handler_class, workers=DEFAULT_WORKERS):
+        # Before the base __init__, which calls server_close if bind fails.
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="MapServer")
+        self._requests = set()      # connections being handled
+        self._closing = False
+        self._requests_lock = threading.Lock()
+        http.server.HTTPServer.__init__(self, address, handler_class)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        with self._requests_lock:
+            if self._closing:
+                self.shutdown_request(request)
+                return
+            self._requests.add(request)
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._requests_lock:
+                self._requests.discard(request)
+            self.shutdown_request(request)
+
+    def server_close(self):
+        http.server.HTTPServer.server_close(self)
+        with self._requests_lock:
+            self._closing = True
+            requests = list(self._requests)
+        # Wakes up workers blocked reading from idle connections.
+        for request in requests:
+            try:
+                request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._pool.shutdown(wait=False)
+
+
+class MapRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Handles the routes listed in the module docstring.
+
+    The server must have ``store`` (MaskStore) and ``cache`` (RenderCache)
+    attributes.
+    """
+    protocol_version = "HTTP/1.1"
+    timeout = REQUEST_TIMEOUT_S
+
+    def do_GET(self):
+        self._dispatch(send_body=True)
+
+    def do_HEAD(self):
+        self._dispatch(send_body=False)
+
+    def log_message(self, fmt, *args):
+        logging.info("%s - %s", self.address_string(), fmt % args)
+
+    def _dispatch(self, send_body):
+        self._send_body = send_body
+        url = urllib.parse.urlsplit(self.path)
+        parts = [urllib.parse.unquote(_p)
+                 for _p in url.path.split("/") if _p]
+        query = urllib.parse.parse_qs(url.query)
+        try:
+            if parts == ["masks"]:
+                self._send_json(self.server.store.names())
+            elif len(parts) == 2 and parts[0] == "masks":
+                self._mask_info(parts[1])
+            elif (len(parts) == 4 and parts[0] == "masks"
+                    and parts[2] == "maps"):
+                if parts[3].endswith(".png"):
+                    self._map_png(parts[1], parts[3][:-4], query)
+                else:
+                    self._map_die(parts[1], parts[3])
+            else:
+                self._send_error(404, "No such resource")
+        except (FileNotFoundError, KeyError) as err:
+            self._send_error(404, "Not found: {}".format(err))
+        except ValueError as err:
+            self._send_error(400, str(err))
+        except Exception:
+            logging.exception("Error handling %s", self.path)
+            self._send_error(500, "Internal error")
+
+    def _mask_info(self, name):
+        stamp, mask = self.server.store.get(name)
+        etag = make_etag(name, stamp, "info")
+        if self._not_modified(etag, stamp):
+            return
+        info = {"mask": name,
+                "dia": mask.dia,
+                "die_xy": mask.die_xy,
+                "center_xy": mask.center_xy,
+                "rows": int(mask.row_count),
+                "cols": int(mask.col_count),
+                "flat": mask.flat_loc,
+                "info": mask.mask_info,
+                "maps": mask.map_names,
+                "devices": mask.devices,
+                }
+        self._send_json(info, etag, stamp)
+
+    def _map_die(self, name, map_name):
+        stamp, mask = self.server.store.get(name)
+        rc_list = mask.maps[map_name]
+        etag = make_etag(name, stamp, "die", map_name)
+        if self._not_modified(etag, stamp):
+            return
+        die = {"mask": name,
+               "map": map_name,
+               "count": len(rc_list),
+               "die": [[_r, _c] for _r, _c in rc_list],
+               }
+        self._send_json(die, etag, stamp)
+
+    def _map_png(self, name, map_name, query):
+        px_per_mm = int(query.get("px", [DEFAULT_PX_PER_MM])[0])
+        if not 1 <= px_per_mm <= MAX_PX_PER_MM:
+            raise ValueError("px must be 1 to {}".format(MAX_PX_PER_MM))
+        stamp, mask = self.server.store.get(name)
+        if map_name not in mask.maps:
+            raise KeyError(map_name)
+        etag = make_etag(name, stamp, "png", map_name, px_per_mm)
+        if self._not_modified(etag, stamp):
+            return
+        data = self.server.cache.get(
+            etag,
+            lambda: render.render_map_png(mask, map_name, px_per_mm))
+        self._send(200, "image/png", data, etag, stamp)
+
+    def _not_modified(self, etag, stamp):
+        """ Sends a 304 and returns True if the client's copy is current """
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [_t.strip() for _t in if_none_match.split(",")]
+            current = etag in tags or "*" in tags
+        else:
+            since = self.headers.get("If-Modified-Since")
+            current = False
+            if since is not None:
+                try:
+                    since = email.utils.parsedate_to_datetime(since)
+                    current = int(stamp[1] // 10**9) <= since.timestamp()
+                except (TypeError, ValueError):
+                    pass
+        if current:
+            self._send(304, None, b"", etag, stamp)
+        return current
+
+    def _send_json(self, obj, etag=None, stamp=None):
+        data = json.dumps(obj).encode("utf-8")
+        self._send(200, "application/json", data, etag, stamp)
+
+    def _send_error(self, code, message):
+        data = json.dumps({"error": message}).encode("utf-8")
+        self._send(code, "application/json", data)
+
+    def _send(self, code, content_type, data, etag=None, stamp=None):
+        self.send_response(code)
+        if content_type is not None:
+            self.send_header("Content-Type", content_type)
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if stamp is not None:
+            self.send_header("Last-Modified",
+                             email.utils.formatdate(stamp[1] / 10**9,
+                                                    usegmt=True))
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self._send_body and code != 304:
+            self.wfile.write(data)
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def make_etag(mask_name, stamp, *parts):
+    """
+    Returns a strong ETag for a resource of a mask.
+
+    ``stamp`` is the mask file's (size, mtime_ns), so the tag changes
+    whenever the file does.
+    """
+    text = "|".join(str(_p) for _p in (mask_name, ) + tuple(stamp) + parts)
+    return '"{}"'.format(hashlib.sha1(text.encode("utf-8")).hexdigest())
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT,
+                workers=DEFAULT_WORKERS, cache_dir=DEFAULT_CACHE_DIR,
+                mask_class=None):
+    """
+    Creates (but doesn't start) the map server.
+
+    Parameters:
+    -----------
+    host, port : str, int
+        Address to listen on.
+    workers : int
+        Size of the request thread pool.
+    cache_dir : str
+        Directory for the on-disk render cache, or None for memory only.
+    mask_class : class, optional
+        Used to load masks. Defaults to ``core.Mask``.
+    """
+    server = ThreadPoolHTTPServer((host, port), MapRequestHandler, workers)
+    server.store = MaskStore(mask_class)
+    server.cache = RenderCache(cache_dir)
+    return server
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS,
+          mask_class=None):
+    """ Runs the map server until interrupted """
+    mirror = mask_mirror.get_mirror()
+    mirror.start()
+    server = make_server(host, port, workers, mask_class=mask_class)
+    logging.info("Serving wafer maps on http://%s:%s/masks",
+                 host, server.server_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        mirror.stop()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_compact.py
+@created:       Mon Oct 19 16:05:51 2026
+
+Description:
+    Unit tests for compact.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import unittest
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+from .. import compact
+from .. import core
+from .. import map_summary
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def make_mask(name, maps, rows=4, cols=5):
+    """ Returns a core.Mask with the given maps, not read from a file """
+    mask = core.Mask.placeholder((5, 5), (3, 2.5), 150, rows, cols)
+    mask.mask = name
+    mask.mask_info = {"Mask": '"{}"'.format(name), "Flat": "270"}
+    mask.devices = {"Dev": '"Every"'}
+    for map_name, rc_list in maps.items():
+        mask.add_map(map_name, rc_list)
+    return mask
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestCompactMap(unittest.TestCase):
+    """ Packing and unpacking single maps """
+
+    def test_round_trip(self):
+        grid = np.zeros((3, 11), dtype=bool)
+        grid[0, 0] = grid[1, 5] = grid[2, 10] = True
+        cmap = compact.CompactMap(grid)
+        self.assertEqual(len(cmap), 3)
+        self.assertEqual(cmap.nbytes, 5)            # 33 bits
+        np.testing.assert_array_equal(cmap.grid(), grid)
+        self.assertEqual(cmap.rc_list(), [(1, 1), (2, 6), (3, 11)])
+
+    def test_pad_and_crop(self):
+        cmap = compact.CompactMap.from_rc([(1, 1), (2, 3)])
+        self.assertEqual(cmap.shape, (2, 3))
+        padded = cmap.grid(4, 5)
+        self.assertEqual(padded.shape, (4, 5))
+        self.assertEqual(list(zip(*np.nonzero(padded))), [(0, 0), (1, 2)])
+        cropped = cmap.grid(2, 2)
+        self.assertEqual(list(zip(*np.nonzero(cropped))), [(0, 0)])
+
+    def test_from_rc(self):
+        cmap = compact.CompactMap.from_rc([(2, 2), (0, 1), (1, 3), (2, 2)])
+        self.assertEqual(cmap.rc_list(), [(1, 3), (2, 2)])
+        empty = compact.CompactMap.from_rc([])
+        self.assertEqual((len(empty), empty.rc_list()), (0, []))
+
+    def test_from_exclusions(self):
+        pairs = np.array([[1, 1], [2, 2], [9, 9]])
+        cmap = compact.CompactMap.from_exclusions(pairs, (2, 3))
+        self.assertEqual(cmap.rc_list(),
+                         [(1, 2), (1, 3), (2, 1), (2, 3)])
+        full = compact.CompactMap.from_exclusions(np.empty((0, 2)), (2, 2))
+        self.assertEqual(len(full), 4)
+
+
+class TestCompactMask(unittest.TestCase):
+    """ CompactMask must hold the same maps as the core.Mask """
+
+    def test_from_mask(self):
+        maps = {"Every": [(_r, _c) for _r in range(1, 5)
+                          for _c in range(1, 6)],
+                "Edge": [(1, 1), (4, 5)],
+                "Empty": [],
+                }
+        mask = make_mask("T1", maps)
+        cmask = compact.CompactMask.from_mask(mask)
+        self.assertEqual(cmask.map_names, tuple(mask.map_names))
+        for name in mask.map_names:
+            self.assertEqual(cmask.rc_list(name), mask.maps[name], name)
+        np.testing.assert_array_equal(
+            cmask.stack(),
+            map_summary.map_stack(mask.maps, mask.map_names, 4, 5))
+        self.assertEqual(cmask.grid("Edge").shape, (4, 5))
+        self.assertEqual(cmask.die_count(), 22)
+        for name in ("row_count", "col_count", "start_row", "start_col"):
+            self.assertEqual(getattr(cmask, name), getattr(mask, name))
+
+
+class TestLoadLibrary(unittest.TestCase):
+    """ Budget, skipped and failed masks """
+
+    def setUp(self):
+        self.names = ["A", "B", "C", "D"]
+        self.loaded = []
+
+    def load(self, name):
+        self.loaded.append(name)
+        if name == "B":
+            raise ValueError("bad mask file")
+        return make_mask(name, {"Every": [(1, 1), (2, 2)]})
+
+    def test_all(self):
+        calls = []
+        library = compact.load_library(100, self.names,
+                                       mask_class=self.load,
+                                       progress=lambda *a: calls.append(a))
+        self.assertEqual(sorted(library.masks), ["A", "C", "D"])
+        self.assertEqual(library.failed, ["B"])
+        self.assertEqual(library.skipped, [])
+        self.assertEqual(calls, [(1, 4), (2, 4), (3, 4), (4, 4)])
+        report = library.report()
+        self.assertEqual(report["loaded"], 3)
+        self.assertEqual(report["bytes"], library.nbytes)
+
+    def test_budget(self):
+        one = compact.load_library(100, ["A"], mask_class=self.load)
+        budget_mb = one.nbytes * 1.5 / compact.MB
+        self.loaded = []
+        calls = []
+        library = compact.load_library(budget_mb, self.names,
+                                       mask_class=self.load,
+                                       progress=lambda *a: calls.append(a))
+        self.assertEqual(list(library.masks), ["A"])
+        self.assertEqual(library.failed, ["B"])
+        self.assertEqual(library.skipped, ["C", "D"])
+        self.assertEqual(self.loaded, ["A", "B", "C"])
+        self.assertLessEqual(library.nbytes, library.budget)
+        self.assertEqual(calls[-1], (4, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_core.py
+@created:       Mon Oct 19 10:12:44 2026
+
+Description:
+    Unit tests for core.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import os
+import os.path as osp
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+# Package / Application
+from .. import core
+from .. import mask_mirror
+from .. import mask_reader
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+ROWS = 20
+COLS = 20
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestWriteMaskFile(unittest.TestCase):
+    """ Written masks must read back with every map unchanged """
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".ini")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def _round_trip(self, maps):
+        mask = core.Mask.__new__(core.Mask)
+        mask.mask_info = {"Mask": '"TEST"', "Die X": "5", "Die Y": "5",
+                          "Flat": "270"}
+        mask.dia = 150
+        mask.row_count = str(ROWS)
+        mask.col_count = str(COLS)
+        mask.home_row = mask.start_row = "1"
+        mask.home_col = mask.start_col = "1"
+        mask.map_names = sorted(maps)
+        mask.maps = maps
+        mask.devices = {"Dev": '"Every"'}
+        mask.write_mask_file(self.filename)
+
+        loaded = core.Mask.__new__(core.Mask)
+        loaded.cancel = None
+        loaded.progress = None
+        with mask_reader.MaskFileReader(self.filename) as reader:
+            loaded._extract_maps(reader, "150mm")
+        return loaded
+
+    def test_round_trip(self):
+        every = [(_r, _c) for _r in range(1, ROWS + 1)
+                 for _c in range(1, COLS + 1)]
+        maps = {"Full": every,
+                "NoCorner": every[1:],
+                "NoLast": every[:-1],
+                "Empty": [],
+                "Middle": [(10, 10), (10, 11), (11, 10)],
+                }
+        loaded = self._round_trip(maps)
+        self.assertEqual(loaded.map_names, sorted(maps))
+        for name, rc_list in maps.items():
+            self.assertEqual(loaded.maps[name], rc_list, name)
+
+
+class TestOffline(unittest.TestCase):
+    """ Empty mirror and unreachable mask roots, as on a new machine """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.mirror = mask_mirror.MaskMirror(
+            [osp.join(self.tmp, "unreachable")], osp.join(self.tmp, "mirror"))
+        patcher = mock.patch.object(mask_mirror, "_MIRROR", self.mirror)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_placeholder(self):
+        mask = core.Mask.placeholder((5, 5), (10.5, 10.5), 150, ROWS, COLS)
+        self.assertEqual(mask.maps, {})
+        self.assertEqual((mask.row_count, mask.col_count),
+                         (str(ROWS), str(COLS)))
+        self.assertEqual(self.mirror.list_masks(sync=False), [])
+        self.assertEqual(os.listdir(self.mirror.mirror_dir), [])
+
+    def test_load_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            core.Mask("07G11")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_devices.py
+@created:       Mon Oct 19 16:02:11 2026
+
+Description:
+    Unit tests for devices.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import unittest
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+from .. import devices
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestParseDeviceOffsets(unittest.TestCase):
+    """ [Devices] values are 'X, Y' in um; anything else has no position """
+
+    def test_positions(self):
+        names, offsets = devices.parse_device_offsets({
+            "Ring": "-1250, 400",
+            "Pad": "1250.5,-400.25, probe pad",
+            "Res": "  75 ,  0 ",
+            "Far": "1.2e3, -3e2",
+        })
+        self.assertEqual(names, ["Far", "Pad", "Res", "Ring"])
+        np.testing.assert_allclose(offsets, [[1.2, -0.3],
+                                             [1.2505, -0.40025],
+                                             [0.075, 0.0],
+                                             [-1.25, 0.4]])
+
+    def test_no_position(self):
+        # Map names as used by the fixtures, a single number and blanks.
+        with self.assertLogs(level="INFO") as log:
+            names, offsets = devices.parse_device_offsets({
+                "Dev": '"Every"',
+                "Dev2": "Every",
+                "Cap": "250",
+                "Empty": "",
+                "Ring": "-1250, 400",
+            })
+        self.assertEqual(names, ["Ring"])
+        self.assertEqual(offsets.shape, (1, 2))
+        self.assertEqual(len(log.output), 1)
+        self.assertIn("4 of 5", log.output[0])
+
+    def test_empty(self):
+        names, offsets = devices.parse_device_offsets({})
+        self.assertEqual(names, [])
+        self.assertEqual(offsets.shape, (0, 2))
+
+
+class TestDeviceSites(unittest.TestCase):
+    """ Device sites are the die centers plus each offset """
+
+    def setUp(self):
+        centers_x, centers_y = np.meshgrid([-5.0, 0.0, 5.0], [4.0, -4.0])
+        names, offsets = devices.parse_device_offsets({"A": "1000, 0",
+                                                       "B": "0, -500"})
+        self.sites = devices.DeviceSites(centers_x, centers_y,
+                                         names, offsets)
+
+    def test_select_all(self):
+        die_mask = np.zeros((2, 3), dtype=bool)
+        die_mask[1, 2] = True
+        np.testing.assert_allclose(self.sites.select(die_mask),
+                                   [[6.0, -4.0], [5.0, -4.5]])
+
+    def test_select_filter(self):
+        die_mask = np.ones((2, 3), dtype=bool)
+        points = self.sites.select(die_mask, ["B"])
+        self.assertEqual(points.shape, (6, 2))
+        np.testing.assert_allclose(points[:, 1], [3.5] * 3 + [-4.5] * 3)
+
+    def test_no_positions(self):
+        names, offsets = devices.parse_device_offsets({"Dev": '"Every"'})
+        sites = devices.DeviceSites(np.zeros((2, 3)), np.zeros((2, 3)),
+                                    names, offsets)
+        self.assertEqual(sites.select(np.ones((2, 3), dtype=bool)).shape,
+                         (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
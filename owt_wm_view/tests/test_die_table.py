@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_die_table.py
+@created:       Mon Oct 19 15:22:08 2026
+
+Description:
+    Unit tests for die_table.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import os
+import os.path as osp
+import shutil
+import tempfile
+import unittest
+
+# Package / Application
+from .. import core
+from .. import die_table
+from .. import mask_mirror
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestExportLibrary(unittest.TestCase):
+    """ Export -> read round trip and incremental updates """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.mirror = mask_mirror.MaskMirror([], osp.join(self.tmp, "mirror"))
+        self.path = osp.join(self.tmp, "die_table.bin")
+        self.masks = {}
+        self.loaded = []
+        self.set_mask("A", {"Every": [(1, 1), (1, 2), (2, 2)],
+                            "Edge": [(1, 1)]})
+        self.set_mask("B", {"Center": [(2, 3)]})
+        self.set_mask("C", {"Every": [(3, 3), (1, 3)]})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def set_mask(self, name, maps):
+        """ Defines a mask and (re)writes its mirrored file """
+        self.masks[name] = maps
+        filename = osp.join(self.mirror.mirror_dir, name + ".ini")
+        version = len(self.loaded) + sum(map(len, maps.values()))
+        with open(filename, 'w') as openf:
+            openf.write("[Mask]\n; version {}\n".format(version) * version)
+        # A different mtime even on coarse-grained file systems.
+        os.utime(filename, (version * 1000, version * 1000))
+
+    def load(self, name):
+        """ mask_class for export_library: builds a mask from self.masks """
+        self.loaded.append(name)
+        mask = core.Mask.placeholder((5, 5), (2, 2), 150, 3, 3)
+        for map_name, rc_list in self.masks[name].items():
+            mask.add_map(map_name, rc_list)
+        return mask
+
+    def export(self, masks, full=False):
+        return die_table.export_library(self.path, masks, full, self.mirror,
+                                        self.load)
+
+    def check_mask(self, reader, name):
+        table = reader.read_mask(name)
+        map_names = reader.map_names(name)
+        self.assertEqual(map_names, sorted(self.masks[name]))
+        found = {_n: [] for _n in map_names}
+        for code, x, y in zip(table["map"], table["x"], table["y"]):
+            found[map_names[code]].append((int(y), int(x)))
+        self.assertEqual(found, {_n: sorted(_rc) for _n, _rc
+                                 in self.masks[name].items()})
+        code = reader.mask_names.index(name)
+        self.assertTrue((table["mask"] == code).all())
+
+    def test_round_trip(self):
+        summary = self.export(["A", "B", "C"])
+        self.assertEqual((summary["written"], summary["copied"],
+                          summary["failed"], summary["rows"]), (3, 0, 0, 7))
+        with die_table.DieTableReader(self.path) as reader:
+            self.assertEqual(reader.mask_names, ["A", "B", "C"])
+            self.assertEqual(len(reader), 7)
+            for name in reader.mask_names:
+                self.check_mask(reader, name)
+
+            table, map_names = reader.read_all(["mask", "map", "x", "y"])
+            self.assertEqual(map_names, ["Center", "Edge", "Every"])
+            rows = sorted(zip(table["mask"].tolist(),
+                              [map_names[_m] for _m in table["map"]],
+                              table["y"].tolist(), table["x"].tolist()))
+            expected = sorted((_i, _m, _r, _c)
+                              for _i, _n in enumerate(["A", "B", "C"])
+                              for _m, _rc in self.masks[_n].items()
+                              for _r, _c in _rc)
+            self.assertEqual(rows, expected)
+
+    def test_incremental(self):
+        self.export(None)
+        self.set_mask("B", {"Center": [(2, 3), (3, 2)], "New": [(1, 1)]})
+        os.remove(osp.join(self.mirror.mirror_dir, "C.ini"))
+        self.loaded = []
+
+        summary = self.export(None)
+        self.assertEqual(self.loaded, ["B"])
+        self.assertEqual((summary["written"], summary["copied"],
+                          summary["rows"]), (1, 1, 7))
+        with die_table.DieTableReader(self.path) as reader:
+            self.assertEqual(reader.mask_names, ["A", "B"])
+            self.check_mask(reader, "A")
+            self.check_mask(reader, "B")
+
+    def test_full(self):
+        self.export(["A", "B"])
+        self.loaded = []
+        summary = self.export(["A", "B"], full=True)
+        self.assertEqual(self.loaded, ["A", "B"])
+        self.assertEqual(summary["copied"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
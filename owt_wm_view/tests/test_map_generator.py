@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_map_generator.py
+@created:       Mon Oct 19 16:31:08 2026
+
+Description:
+    Unit tests for map_generator.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import os
+import tempfile
+import unittest
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+from .. import core
+from .. import map_generator
+from .. import mask_reader
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+# 5 x 5 grid of 10 mm die on a 50 mm wafer (no SEMI flat for that size).
+# With 5 mm edge exclusion the usable radius is 20 mm: the center die and
+# its 4 neighbours are full, the 4 corners are out, the rest are partial.
+SMALL = dict(rows=5, cols=5, die_xy=(10, 10), center_xy=(3, 3), dia=50,
+             edge_excl=5)
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestClassifyDie(unittest.TestCase):
+    """ Die classes on small grids worked out by hand """
+
+    def test_counts(self):
+        classes = map_generator.classify_die(**SMALL)
+        self.assertEqual(classes.shape, (5, 5))
+        counts = np.bincount(classes.ravel(), minlength=3)
+        self.assertEqual(counts[map_generator.FULL], 5)
+        self.assertEqual(counts[map_generator.PARTIAL], 16)
+        self.assertEqual(counts[map_generator.EXCLUDED], 4)
+        full = np.argwhere(classes == map_generator.FULL) + 1
+        self.assertEqual(sorted(map(tuple, full)),
+                         [(2, 3), (3, 2), (3, 3), (3, 4), (4, 3)])
+        for row, col in [(0, 0), (0, 4), (4, 0), (4, 4)]:
+            self.assertEqual(classes[row, col], map_generator.EXCLUDED)
+
+    def test_no_exclusion(self):
+        classes = map_generator.classify_die(**dict(SMALL, edge_excl=0))
+        self.assertTrue((classes[1:4, 1:4] == map_generator.FULL).all())
+        self.assertEqual((classes == map_generator.PARTIAL).sum(), 16)
+
+    def test_flat(self):
+        # 150 mm wafer, 10 mm die, 15 x 15 grid. The flat is at the bottom
+        # (270 deg), 69.3 mm from the center; 5 mm flat exclusion makes the
+        # die at Y = -60 mm partial while its mirror at Y = +60 stays full.
+        args = dict(rows=15, cols=15, die_xy=(10, 10), center_xy=(8, 8),
+                    dia=150, edge_excl=0)
+        no_flat = map_generator.classify_die(**args)
+        flat = map_generator.classify_die(flat_loc=270, flat_excl=5, **args)
+        self.assertEqual(no_flat[13, 7], map_generator.FULL)
+        self.assertEqual(flat[13, 7], map_generator.PARTIAL)
+        self.assertEqual(flat[1, 7], map_generator.FULL)
+        # The flat only ever removes die.
+        self.assertTrue((flat <= no_flat).all())
+        np.testing.assert_array_equal(flat[:8], no_flat[:8])
+
+
+class TestClassesToMap(unittest.TestCase):
+    """ Generated maps must survive a write and reload """
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".ini")
+        os.close(fd)
+        self.classes = map_generator.classify_die(**SMALL)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_include_partial(self):
+        full = map_generator.classes_to_map(self.classes)
+        both = map_generator.classes_to_map(self.classes, True)
+        self.assertEqual(len(full), 5)
+        self.assertEqual(len(both), 21)
+        self.assertTrue(set(full) < set(both))
+        self.assertNotIn((1, 1), both)
+
+    def test_xyd(self):
+        xyd = map_generator.classes_to_xyd(self.classes)
+        self.assertEqual(len(xyd), 21)
+        self.assertIn((3, 2, "Full"), xyd)
+        self.assertIn((1, 3, "Partial"), xyd)
+
+    def test_write_reload(self):
+        maps = {"Edge 5.0mm": map_generator.classes_to_map(self.classes),
+                "Edge 5.0mm Partial": map_generator.classes_to_map(
+                    self.classes, True)}
+        mask = core.Mask.placeholder(SMALL["die_xy"], SMALL["center_xy"],
+                                     150, SMALL["rows"], SMALL["cols"])
+        for name, rc_list in maps.items():
+            mask.add_map(name, rc_list)
+        mask.write_mask_file(self.filename)
+
+        loaded = core.Mask.__new__(core.Mask)
+        loaded.cancel = None
+        loaded.progress = None
+        with mask_reader.MaskFileReader(self.filename) as reader:
+            loaded._extract_maps(reader, "150mm")
+        self.assertEqual(loaded.map_names, sorted(maps))
+        for name, rc_list in maps.items():
+            self.assertEqual(loaded.maps[name], sorted(rc_list), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_mask_mirror.py
+@created:       Mon Oct 19 11:48:52 2026
+
+Description:
+    Unit tests for mask_mirror.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import os
+import os.path as osp
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Package / Application
+from .. import mask_mirror
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestMaskNames(unittest.TestCase):
+    """ Names that could leave the mirror or the roots are rejected """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.root = osp.join(self.tmp, "root")
+        os.makedirs(self.root)
+        with open(osp.join(self.tmp, "SECRET.ini"), 'w') as openf:
+            openf.write("[Mask]\n")
+        self.mirror = mask_mirror.MaskMirror([self.root],
+                                             osp.join(self.tmp, "mirror"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_is_safe_name(self):
+        for name in ("T1.ini", "a..b.ini", "..ini"):
+            self.assertTrue(mask_mirror.is_safe_name(name), name)
+        for name in ("", ".", "..", "../SECRET.ini", "..\\SECRET.ini",
+                     "sub/T1.ini", "C:SECRET.ini"):
+            self.assertFalse(mask_mirror.is_safe_name(name), name)
+
+    def test_traversal(self):
+        with self.assertRaises(ValueError):
+            self.mirror.path_for("../SECRET.ini")
+        with self.assertRaises(ValueError):
+            self.mirror.fetch("../SECRET.ini")
+        self.assertEqual(os.listdir(self.mirror.mirror_dir), [])
+
+
+class TestSync(unittest.TestCase):
+    """ Syncing must not block other users of the mirror """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.root = osp.join(self.tmp, "root")
+        os.makedirs(self.root)
+        with open(osp.join(self.root, "T1.ini"), 'w') as openf:
+            openf.write("[Mask]\n")
+        self.mirror = mask_mirror.MaskMirror([self.root],
+                                             osp.join(self.tmp, "mirror"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_list_masks_without_sync(self):
+        self.assertEqual(self.mirror.list_masks(sync=False), [])
+        self.assertEqual(self.mirror.list_masks(), ["T1"])
+
+    def test_listener(self):
+        copied = []
+        self.mirror.add_sync_listener(copied.append)
+        self.mirror.sync()
+        self.mirror.sync()
+        self.assertEqual(copied, [["T1.ini"]])
+
+    def test_copy_without_lock(self):
+        free = []
+
+        def try_lock():
+            if self.mirror._lock.acquire(timeout=1):
+                self.mirror._lock.release()
+                free.append(True)
+
+        def copystat(src, dst):
+            # Still copying: another thread must be able to take the lock.
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+
+        with mock.patch.object(mask_mirror.shutil, "copystat", copystat):
+            self.mirror.sync()
+        self.assertEqual(free, [True])
+        self.assertEqual(self.mirror.list_masks(sync=False), ["T1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
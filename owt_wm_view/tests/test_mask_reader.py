@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_mask_reader.py
+@created:       Mon Oct 19 11:05:18 2026
+
+Description:
+    Unit tests for mask_reader.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import os
+import tempfile
+import unittest
+
+# Package / Application
+from .. import mask_reader
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+MASK_TEXT = """\
+[150mm]
+Rows = 4
+Cols = 4
+Good = "1,1; 2,2"
+Letter = "1,1; 2,x"
+Odd = "1,1; 2"
+"""
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestDecodeMapBuffer(unittest.TestCase):
+    """ Malformed map values must raise ValueError and free the file """
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".ini")
+        with os.fdopen(fd, 'w') as openf:
+            openf.write(MASK_TEXT)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def _decode(self, key):
+        """ Decodes a map the way ``core.Mask`` does """
+        with mask_reader.MaskFileReader(self.filename) as reader:
+            self.reader = reader
+            buf = reader.buffer("150mm", key)
+            try:
+                return mask_reader.decode_map_buffer(buf)
+            finally:
+                buf.release()
+
+    def test_good(self):
+        pairs = self._decode("Good")
+        self.assertEqual(pairs.tolist(), [[1, 1], [2, 2]])
+        self.assertTrue(self.reader._file.closed)
+
+    def test_malformed(self):
+        for key in ("Letter", "Odd"):
+            with self.assertRaises(ValueError):
+                self._decode(key)
+            self.assertTrue(self.reader._file.closed, key)
+
+
+if __name__ == "__main__":
+    unittest.main()
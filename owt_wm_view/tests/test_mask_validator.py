@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_mask_validator.py
+@created:       Mon Oct 19 13:02:40 2026
+
+Description:
+    Unit tests for mask_validator.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import os
+import tempfile
+import unittest
+
+# Package / Application
+from .. import mask_validator
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+MASK_TEMPLATE = """\
+[Mask]
+Mask = "TEST"
+Die X = 5
+Die Y = 5
+Flat = 270
+
+[150mm]
+Rows = 4
+Cols = 4
+Home Row = 1
+Home Col = 1
+Start Row = 1
+Start Col = 1
+{}
+
+[Devices]
+Dev = "Every"
+"""
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestValidateMaskFile(unittest.TestCase):
+    """ Map verdicts must match what ``core.Mask`` loads """
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".ini")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def _checks(self, maps):
+        """ Returns the (errors, warnings) checks for a file with maps """
+        with open(self.filename, 'w') as openf:
+            openf.write(MASK_TEMPLATE.format(maps))
+        report = mask_validator.validate_mask_file(self.filename)
+        return ([_e["check"] for _e in report["errors"]],
+                [_w["check"] for _w in report["warnings"]])
+
+    def test_empty_value_is_every_die(self):
+        errors, warnings = self._checks('Every = ""')
+        self.assertNotIn("empty", errors + warnings)
+
+    def test_unquoted(self):
+        errors, _ = self._checks('Edge = 1,1; 2,2')
+        self.assertNotIn("coords", errors)
+
+    def test_malformed(self):
+        for value in ('"1,1; 2,x"', '"1,1; 2"'):
+            errors, _ = self._checks('Bad = ' + value)
+            self.assertIn("coords", errors, value)
+
+    def test_duplicate_key(self):
+        errors, _ = self._checks('Every = ""\nEvery = ""')
+        self.assertIn("duplicate", errors)
+
+    def test_warnings(self):
+        _, warnings = self._checks('A = "1,1; 1,1; 5,5"\nB = "1,1"')
+        self.assertEqual(sorted(warnings),
+                         ["bounds", "duplicate", "duplicate"])
+
+
+if __name__ == "__main__":
+    unittest.main()
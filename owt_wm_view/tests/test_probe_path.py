@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_probe_path.py
+@created:       Mon Oct 19 18:37:50 2026
+
+Description:
+    Unit tests for probe_path.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import unittest
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+from .. import probe_path
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+DIE_XY = (2.5, 4.0)
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def random_map(seed, n=21, keep=0.8):
+    """ Returns the (x, y) of a round map with some die left out """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[1:n + 1, 1:n + 1]
+    center = (n + 1) / 2
+    inside = (x - center)**2 + (y - center)**2 <= (n / 2)**2
+    inside &= rng.random(inside.shape) < keep
+    return x[inside], y[inside]
+
+
+def travel(x, y, order, start):
+    """ Length of the path from ``start`` through the die in ``order`` """
+    return probe_path.ProbePath(x[order], y[order], start, DIE_XY,
+                                "test").travel
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestSerpentine(unittest.TestCase):
+    """ Row by row, alternating, from the end nearest the start """
+
+    def setUp(self):
+        y, x = np.mgrid[1:4, 1:4]
+        self.x = x.ravel()
+        self.y = y.ravel()
+
+    def visits(self, start):
+        order = probe_path.serpentine_order(self.x, self.y, start)
+        return list(zip(self.x[order].tolist(), self.y[order].tolist()))
+
+    def test_top_left(self):
+        self.assertEqual(self.visits((1, 1)),
+                         [(1, 1), (2, 1), (3, 1),
+                          (3, 2), (2, 2), (1, 2),
+                          (1, 3), (2, 3), (3, 3)])
+
+    def test_bottom_right(self):
+        self.assertEqual(self.visits((3, 3)),
+                         [(3, 3), (2, 3), (1, 3),
+                          (1, 2), (2, 2), (3, 2),
+                          (3, 1), (2, 1), (1, 1)])
+
+    def test_empty(self):
+        self.assertEqual(probe_path.serpentine_order([], [], (1, 1)).size, 0)
+
+
+class TestOptimizePath(unittest.TestCase):
+    """ Properties that must hold for any map """
+
+    def test_permutation(self):
+        for seed in range(5):
+            x, y = random_map(seed)
+            path = probe_path.optimize_path(x, y, DIE_XY, (1, 11))
+            self.assertEqual(len(path), len(x))
+            self.assertEqual(sorted(zip(path.x.tolist(), path.y.tolist())),
+                             sorted(zip(x.tolist(), y.tolist())))
+
+    def test_not_longer_than_seeds(self):
+        for seed in range(5):
+            x, y = random_map(seed)
+            start = (int(x[0]), int(y[0]))
+            path = probe_path.optimize_path(x, y, DIE_XY, start)
+            nn = probe_path.nearest_neighbor_order(x, y, DIE_XY, start)
+            serp = probe_path.serpentine_order(x, y, start)
+            self.assertLessEqual(path.travel, travel(x, y, nn, start) + 1e-9)
+            self.assertLessEqual(path.travel,
+                                 travel(x, y, serp, start) + 1e-9)
+
+    def test_start_first(self):
+        for seed in range(20):
+            x, y = random_map(seed, n=15)
+            i = np.random.default_rng(seed).integers(len(x))
+            start = (int(x[i]), int(y[i]))
+            path = probe_path.optimize_path(x, y, DIE_XY, start)
+            self.assertEqual((int(path.x[0]), int(path.y[0])), start, seed)
+
+    def test_start_off_map(self):
+        x, y = random_map(0)
+        path = probe_path.optimize_path(x, y, DIE_XY, (0, 0))
+        self.assertEqual(len(path), len(x))
+        self.assertEqual(path.start, (0, 0))
+
+    def test_small(self):
+        path = probe_path.optimize_path([], [], DIE_XY, (1, 1))
+        self.assertEqual((len(path), path.travel), (0, 0.0))
+        path = probe_path.optimize_path([1], [1], DIE_XY, (1, 1))
+        self.assertEqual((len(path), path.travel), (1, 0.0))
+
+
+class TestNearestNeighbor(unittest.TestCase):
+    """ Greedy order, including die beyond the ring search """
+
+    def test_far_die(self):
+        far = probe_path.NN_RING_LIMIT * 3
+        x = np.array([1, 2, far, far + 1])
+        y = np.array([1, 1, 1, 1])
+        order = probe_path.nearest_neighbor_order(x, y, (1, 1), (1, 1))
+        self.assertEqual(order.tolist(), [0, 1, 2, 3])
+
+
+class TestTwoOpt(unittest.TestCase):
+    """ 2-opt only ever shortens the path and keeps point 0 """
+
+    def test_shorter(self):
+        rng = np.random.default_rng(3)
+        px = rng.uniform(0, 100, 200)
+        py = rng.uniform(0, 100, 200)
+        order = probe_path.two_opt(px, py)
+        self.assertEqual(order[0], 0)
+        self.assertEqual(sorted(order.tolist()), list(range(200)))
+
+        def length(idx):
+            return np.hypot(np.diff(px[idx]), np.diff(py[idx])).sum()
+        self.assertLess(length(order), length(np.arange(200)))
+
+    def test_uncrosses(self):
+        # 0 -> 2 -> 1 -> 3 along a line is fixed to 0 -> 1 -> 2 -> 3.
+        px = np.array([0.0, 2.0, 1.0, 3.0])
+        py = np.zeros(4)
+        self.assertEqual(probe_path.two_opt(px, py).tolist(), [0, 2, 1, 3])
+
+
+class TestEstimate(unittest.TestCase):
+    """ Test time estimates """
+
+    def test_estimate(self):
+        path = probe_path.ProbePath([2, 3], [1, 1], (1, 1), (10.0, 10.0),
+                                    "test")
+        self.assertEqual(path.travel, 20.0)
+        times = path.estimate(3, device_time=1.0, speed=10.0, index_time=0.5)
+        self.assertEqual(times["move"], 3.0)
+        self.assertEqual(times["test"], 6.0)
+        self.assertEqual(times["total"], 9.0)
+        self.assertEqual(times["per_device"], 1.5)
+        self.assertEqual(path.estimate(0)["per_device"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_resample.py
+@created:       Mon Oct 19 18:58:14 2026
+
+Description:
+    Unit tests for resample.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import unittest
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+from .. import resample
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+# 3 x 3 grid of 10 mm die and 6 x 6 grid of 5 mm die over the same 30 mm
+# square, both centered on the wafer.
+BIG = dict(shape=(3, 3), die_xy=(10.0, 10.0), center_xy=(2, 2))
+SMALL = dict(shape=(6, 6), die_xy=(5.0, 5.0), center_xy=(3.5, 3.5))
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def resample_grid(src_grid, src, dst, offset=(0, 0)):
+    """ coverage() from the grid definitions above """
+    return resample.coverage(src_grid, src["die_xy"], src["center_xy"],
+                             dst["shape"], dst["die_xy"], dst["center_xy"],
+                             offset)
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestIdentity(unittest.TestCase):
+    """ Resampling onto the same grid changes nothing """
+
+    def setUp(self):
+        self.grid = np.random.default_rng(0).random((7, 9)) < 0.6
+        self.geom = dict(shape=(7, 9), die_xy=(4.5, 6.0), center_xy=(5, 4))
+
+    def test_coverage(self):
+        fraction = resample_grid(self.grid, self.geom, self.geom)
+        np.testing.assert_allclose(fraction, self.grid.astype(float))
+
+    def test_map(self):
+        fraction = resample_grid(self.grid, self.geom, self.geom)
+        rows, cols = np.nonzero(self.grid)
+        expected = list(zip((rows + 1).tolist(), (cols + 1).tolist()))
+        for threshold in resample.THRESHOLDS.values():
+            self.assertEqual(resample.coverage_to_map(fraction, threshold),
+                             expected)
+
+    def test_centers(self):
+        xy = resample.source_centers(self.grid, self.geom["die_xy"],
+                                     self.geom["center_xy"],
+                                     self.geom["die_xy"],
+                                     self.geom["center_xy"])
+        rows, cols = np.nonzero(self.grid)
+        np.testing.assert_allclose(xy, np.column_stack([cols + 1, rows + 1]))
+
+
+class TestHalfSize(unittest.TestCase):
+    """ Each 10 mm source die exactly covers 2 x 2 of the 5 mm die """
+
+    def test_full(self):
+        fraction = resample_grid(np.ones((3, 3), dtype=bool), BIG, SMALL)
+        np.testing.assert_allclose(fraction, np.ones((6, 6)))
+
+    def test_each_die(self):
+        for row in range(3):
+            for col in range(3):
+                src = np.zeros((3, 3), dtype=bool)
+                src[row, col] = True
+                fraction = resample_grid(src, BIG, SMALL)
+                expected = np.zeros((6, 6))
+                expected[2 * row:2 * row + 2, 2 * col:2 * col + 2] = 1
+                np.testing.assert_allclose(fraction, expected)
+                self.assertEqual(
+                    resample.coverage_to_map(fraction),
+                    [(2 * row + _r, 2 * col + _c)
+                     for _r in (1, 2) for _c in (1, 2)])
+
+    def test_centers(self):
+        src = np.zeros((3, 3), dtype=bool)
+        src[0, 0] = src[2, 1] = True
+        xy = resample.source_centers(src, BIG["die_xy"], BIG["center_xy"],
+                                     SMALL["die_xy"], SMALL["center_xy"])
+        # The middle of the 2 x 2 block each source die covers.
+        np.testing.assert_allclose(xy, [[1.5, 1.5], [3.5, 5.5]])
+
+    def test_double_size(self):
+        # The other way: one 5 mm die is a quarter of a 10 mm die.
+        src = np.zeros((6, 6), dtype=bool)
+        src[0, 0] = True
+        fraction = resample_grid(src, SMALL, BIG)
+        self.assertAlmostEqual(fraction[0, 0], 0.25)
+        self.assertEqual(fraction.sum(), 0.25)
+        self.assertEqual(resample.coverage_to_map(fraction), [])
+        self.assertEqual(
+            resample.coverage_to_map(fraction, resample.THRESHOLDS["any"]),
+            [(1, 1)])
+
+
+class TestOffset(unittest.TestCase):
+    """ Shifting the source wafer """
+
+    def setUp(self):
+        self.src = np.zeros((3, 3), dtype=bool)
+        self.src[1, 1] = True
+
+    def test_whole_die(self):
+        # +X is toward higher columns, +Y toward lower rows.
+        fraction = resample_grid(self.src, BIG, BIG, offset=(10, 10))
+        self.assertEqual(resample.coverage_to_map(fraction), [(1, 3)])
+
+    def test_half_die(self):
+        fraction = resample_grid(self.src, BIG, BIG, offset=(5, 0))
+        np.testing.assert_allclose(fraction[1], [0, 0.5, 0.5])
+        self.assertEqual(resample.coverage_to_map(fraction), [(2, 2), (2, 3)])
+        full = resample.THRESHOLDS["full"]
+        self.assertEqual(resample.coverage_to_map(fraction, full), [])
+
+    def test_off_grid(self):
+        fraction = resample_grid(self.src, BIG, BIG, offset=(40, 0))
+        self.assertFalse(fraction.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
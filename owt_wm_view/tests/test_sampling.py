@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_sampling.py
+@created:       Mon Oct 19 14:16:27 2026
+
+Description:
+    Unit tests for sampling.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import unittest
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+from .. import sampling
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestBlockedDistances(unittest.TestCase):
+    """ Blocked distance helpers must match the full distance matrix """
+
+    def setUp(self):
+        self.block = sampling.METRIC_BLOCK
+        sampling.METRIC_BLOCK = 64          # force many small blocks
+        rng = np.random.default_rng(0)
+        self.x = rng.uniform(-75, 75, 300)
+        self.y = rng.uniform(-75, 75, 300)
+
+    def tearDown(self):
+        sampling.METRIC_BLOCK = self.block
+
+    def test_nearest_distance(self):
+        site_x = self.x[::7]
+        site_y = self.y[::7]
+        full = np.hypot(self.x[:, None] - site_x[None, :],
+                        self.y[:, None] - site_y[None, :]).min(axis=1)
+        result = sampling.nearest_distance(self.x, self.y, site_x, site_y)
+        np.testing.assert_allclose(result, full)
+
+    def test_min_spacing(self):
+        full = np.hypot(self.x[:, None] - self.x[None, :],
+                        self.y[:, None] - self.y[None, :])
+        np.fill_diagonal(full, np.inf)
+        self.assertAlmostEqual(sampling.min_spacing(self.x, self.y),
+                               full.min())
+        self.assertEqual(sampling.min_spacing(self.x[:1], self.y[:1]),
+                         float("inf"))
+
+    def test_snap_distinct(self):
+        sampler = sampling.Sampler(np.arange(1, 21), np.ones(20, dtype=int),
+                                   (5, 5), (10.5, 1), 150)
+        # Every site is on die 10; each must get a different die.
+        idx = sampler.snap(np.zeros(5), np.zeros(5))
+        self.assertEqual(len(set(idx.tolist())), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_selection.py
+@created:       Mon Oct 19 18:10:37 2026
+
+Description:
+    Unit tests for selection.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import math
+import unittest
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+from .. import selection
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def grid(n=5):
+    """ Die centers of an n x n grid at 0, 1, ... n - 1 """
+    return np.meshgrid(np.arange(n, dtype=float), np.arange(n, dtype=float))
+
+
+def selected_xy(x, y, mask):
+    """ Returns the sorted (x, y) of the selected die """
+    return sorted(zip(x[mask].astype(int).tolist(),
+                      y[mask].astype(int).tolist()))
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestRectSelect(unittest.TestCase):
+    """ Rectangles include their edges, in any corner order """
+
+    def test_inclusive(self):
+        x, y = grid()
+        mask = selection.rect_select(x, y, (1, 1), (3, 2))
+        self.assertEqual(mask.shape, (5, 5))
+        self.assertEqual(selected_xy(x, y, mask),
+                         [(1, 1), (1, 2), (2, 1), (2, 2), (3, 1), (3, 2)])
+
+    def test_corner_order(self):
+        x, y = grid()
+        expected = selection.rect_select(x, y, (0.5, 3.5), (2.5, 0.5))
+        for corners in [((2.5, 0.5), (0.5, 3.5)),
+                        ((0.5, 0.5), (2.5, 3.5)),
+                        ((2.5, 3.5), (0.5, 0.5))]:
+            np.testing.assert_array_equal(
+                selection.rect_select(x, y, *corners), expected)
+        self.assertEqual(expected.sum(), 6)
+
+    def test_empty(self):
+        x, y = grid()
+        self.assertFalse(selection.rect_select(x, y, (5, 5), (6, 6)).any())
+
+
+class TestLassoSelect(unittest.TestCase):
+    """ Die centers inside a polygon, by the even-odd rule """
+
+    def test_square(self):
+        x, y = grid()
+        mask = selection.lasso_select(
+            x, y, [(0.5, 0.5), (2.5, 0.5), (2.5, 2.5), (0.5, 2.5)])
+        self.assertEqual(selected_xy(x, y, mask),
+                         [(1, 1), (1, 2), (2, 1), (2, 2)])
+
+    def test_concave(self):
+        # An L: the top row and the left column. (2, 2) is inside the
+        # bounding box but not the polygon.
+        x, y = grid()
+        mask = selection.lasso_select(
+            x, y, [(-0.5, -0.5), (4.5, -0.5), (4.5, 0.5), (0.5, 0.5),
+                   (0.5, 4.5), (-0.5, 4.5)])
+        expected = (x == 0) | (y == 0)
+        np.testing.assert_array_equal(mask, expected)
+
+    def test_bowtie(self):
+        # Self-intersecting: the edges cross at (2, 2), leaving a left and
+        # a right triangle. Die on the diagonals are on the boundary and
+        # aren't checked.
+        x, y = grid()
+        mask = selection.lasso_select(
+            x, y, [(-0.5, -0.5), (4.5, 4.5), (4.5, -0.5), (-0.5, 4.5)])
+        left = (x < y) & (x < 4 - y)
+        right = (x > y) & (x > 4 - y)
+        check = (x != y) & (x != 4 - y)
+        np.testing.assert_array_equal(mask[check], (left | right)[check])
+        self.assertTrue(mask[2, 0] and mask[2, 4])
+        self.assertFalse(mask[0, 2] or mask[4, 2])
+
+    def test_even_odd(self):
+        # A pentagram winds twice around its center, so the even-odd rule
+        # leaves the center pentagon out but keeps the points.
+        x, y = grid(201)
+        x = (x - 100) / 100
+        y = (y - 100) / 100
+        angles = [math.radians(90 + 144 * _k) for _k in range(5)]
+        star = [(math.cos(_a), math.sin(_a)) for _a in angles]
+        mask = selection.lasso_select(x, y, star)
+        self.assertFalse(mask[100, 100])        # (0, 0)
+        self.assertTrue(mask[180, 100])         # (0, 0.8), top point
+        self.assertFalse(mask[0, 0])
+        # Every selected die is inside the circumscribed circle.
+        self.assertTrue((np.hypot(x, y)[mask] <= 1).all())
+
+    def test_repeated_loop(self):
+        # Going around the same square twice crosses every edge twice.
+        x, y = grid()
+        square = [(0.5, 0.5), (2.5, 0.5), (2.5, 2.5), (0.5, 2.5)]
+        self.assertFalse(selection.lasso_select(x, y, square * 2).any())
+
+    def test_degenerate(self):
+        x, y = grid()
+        self.assertFalse(selection.lasso_select(x, y, []).any())
+        self.assertFalse(selection.lasso_select(
+            x, y, [(0, 0), (4, 4)]).any())
+
+
+class TestRingSelect(unittest.TestCase):
+    """ Die with a radius in a closed range """
+
+    def test_ring(self):
+        x, y = grid()
+        radius = np.hypot(x - 2, y - 2)
+        mask = selection.ring_select(radius, 1, 1.5)
+        # The 4 neighbours at 1 and the 4 diagonals at 1.414.
+        self.assertEqual(mask.sum(), 8)
+        self.assertFalse(mask[2, 2])
+        self.assertTrue(selection.ring_select(radius, 0, 0)[2, 2])
+        self.assertFalse(selection.ring_select(radius, 3, 2).any())
+
+
+class TestApplyEdit(unittest.TestCase):
+    """ Add, remove and invert a selection """
+
+    def setUp(self):
+        self.current = np.array([[True, True], [False, False]])
+        self.selected = np.array([[True, False], [True, False]])
+
+    def test_modes(self):
+        cases = {selection.ADD: [[True, True], [True, False]],
+                 selection.REMOVE: [[False, True], [False, False]],
+                 selection.INVERT: [[False, True], [True, False]],
+                 }
+        for mode, expected in cases.items():
+            np.testing.assert_array_equal(
+                selection.apply_edit(self.current, self.selected, mode),
+                expected)
+        # The current map isn't changed in place.
+        self.assertEqual(self.current.sum(), 2)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            selection.apply_edit(self.current, self.selected, "xor")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_server.py
+@created:       Mon Oct 19 17:41:26 2026
+
+Description:
+    Unit tests for server.py
+
+    The HTTP tests run a real ThreadPoolHTTPServer on a free port against
+    a temporary mask mirror.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import http.client
+import json
+import os
+import os.path as osp
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+# Package / Application
+from .. import core
+from .. import mask_mirror
+from .. import server
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+MAPS = {"Every": [(1, 1), (1, 2), (2, 1), (2, 2), (3, 3)],
+        "Center": [(2, 2)],
+        }
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def write_mask(mirror, name, text="[Mask]\n"):
+    """ Writes a stand-in mask file into the mirror """
+    with open(osp.join(mirror.mirror_dir, name + ".ini"), 'w') as openf:
+        openf.write(text)
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class MirrorTestCase(unittest.TestCase):
+    """ A temporary mirror with masks A and B, loaded by ``self.load`` """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.mirror = mask_mirror.MaskMirror([], osp.join(self.tmp, "mirror"))
+        write_mask(self.mirror, "A")
+        write_mask(self.mirror, "B")
+        # Outside the mirror: must never be reachable.
+        with open(osp.join(self.tmp, "secret.ini"), 'w') as openf:
+            openf.write("[Mask]\n")
+        self.loaded = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def load(self, name):
+        """ mask_class for MaskStore: a 3 x 3 mask with MAPS """
+        self.loaded.append(name)
+        mask = core.Mask.placeholder((5, 5), (2, 2), 150, 3, 3)
+        mask.mask = name
+        for map_name, rc_list in MAPS.items():
+            mask.add_map(map_name, rc_list)
+        return mask
+
+
+class TestMaskStore(MirrorTestCase):
+    """ Loaded masks are reused until their file changes """
+
+    def test_reload_on_change(self):
+        store = server.MaskStore(self.load, self.mirror)
+        first = store.get("A")
+        self.assertIs(store.get("A"), first)
+        write_mask(self.mirror, "A", "[Mask]\n; changed\n")
+        self.assertIsNot(store.get("A"), first)
+        self.assertEqual(self.loaded, ["A", "A"])
+
+    def test_lru(self):
+        write_mask(self.mirror, "C")
+        store = server.MaskStore(self.load, self.mirror, max_masks=2)
+        for name in ["A", "B", "A", "C"]:
+            store.get(name)
+        self.assertEqual(self.loaded, ["A", "B", "C"])
+        self.assertEqual(list(store._masks), ["A", "C"])
+        # B was least recently used, so it's loaded again; A isn't.
+        store.get("B")
+        store.get("C")
+        self.assertEqual(self.loaded, ["A", "B", "C", "B"])
+
+    def test_bad_names(self):
+        store = server.MaskStore(self.load, self.mirror)
+        for name in ["../secret", "..", "", "a/b", "a\\b"]:
+            with self.assertRaises(ValueError):
+                store.get(name)
+        with self.assertRaises(FileNotFoundError):
+            store.get("secret")
+        self.assertEqual(self.loaded, [])
+
+
+class TestRenderCache(unittest.TestCase):
+    """ One render per key, shared between threads and reused from disk """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.renders = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def slow_render(self):
+        self.renders += 1
+        time.sleep(0.2)
+        return b"png"
+
+    def test_single_flight(self):
+        cache = server.RenderCache()
+        results = []
+
+        def get():
+            results.append(cache.get("key", self.slow_render))
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(results, [b"png"] * 8)
+
+    def test_disk_reuse(self):
+        server.RenderCache(self.tmp).get("key", self.slow_render)
+        self.assertEqual(len(os.listdir(self.tmp)), 1)
+        # A new cache (e.g. after a restart) reads the file instead.
+        data = server.RenderCache(self.tmp).get("key", self.fail)
+        self.assertEqual(data, b"png")
+        self.assertEqual(self.renders, 1)
+
+    def test_memory_limit(self):
+        cache = server.RenderCache(max_bytes=10)
+        for key in "abc":
+            cache.get(key, lambda: b"12345")
+        self.assertEqual(list(cache._memory), ["b", "c"])
+
+
+class TestHTTP(MirrorTestCase):
+    """ Routes, validation and connection handling over real sockets """
+
+    def setUp(self):
+        MirrorTestCase.setUp(self)
+        self.cache_dir = osp.join(self.tmp, "cache")
+        self.server = server.ThreadPoolHTTPServer(("127.0.0.1", 0),
+                                                  server.MapRequestHandler,
+                                                  workers=4)
+        self.server.store = server.MaskStore(self.load, self.mirror)
+        self.server.cache = server.RenderCache(self.cache_dir)
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       kwargs={"poll_interval": 0.05})
+        self.thread.start()
+        self.conn = self.connect()
+
+    def tearDown(self):
+        self.conn.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        MirrorTestCase.tearDown(self)
+
+    def connect(self):
+        return http.client.HTTPConnection("127.0.0.1",
+                                          self.server.server_port,
+                                          timeout=5)
+
+    def get(self, path, headers=None, conn=None):
+        conn = conn or self.conn
+        conn.request("GET", path, headers=headers or {})
+        resp = conn.getresponse()
+        return resp, resp.read()
+
+    def test_routes(self):
+        resp, body = self.get("/masks")
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(json.loads(body), ["A", "B"])
+
+        resp, body = self.get("/masks/A")
+        self.assertEqual(json.loads(body)["maps"], sorted(MAPS))
+
+        resp, body = self.get("/masks/A/maps/Center")
+        self.assertEqual(json.loads(body)["die"], [[2, 2]])
+
+        resp, body = self.get("/masks/A/maps/Every.png?px=1")
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.getheader("Content-Type"), "image/png")
+        self.assertTrue(body.startswith(b"\x89PNG"))
+
+        for path in ["/masks/Z", "/masks/A/maps/Nope", "/masks/A/maps/x.png",
+                     "/other"]:
+            resp, _ = self.get(path)
+            self.assertEqual(resp.status, 404, path)
+        resp, _ = self.get("/masks/A/maps/Every.png?px=0")
+        self.assertEqual(resp.status, 400)
+
+    def test_traversal(self):
+        paths = {"/masks/..%2Fsecret": 400,
+                 "/masks/..%2F..%2Fetc%2Fpasswd": 400,
+                 "/masks/..%2F..%2Fetc/maps/passwd": 400,
+                 "/masks/..%2Fsecret/maps/Every.png": 400,
+                 "/masks/%2e%2e": 400,
+                 "/masks/..%5Csecret": 400,
+                 "/masks/../secret": 404,
+                 "/masks/../../etc/passwd": 404,
+                 }
+        for path, status in paths.items():
+            resp, body = self.get(path)
+            self.assertEqual(resp.status, status, path)
+            self.assertIn("error", json.loads(body))
+        self.assertEqual(self.loaded, [])
+
+    def test_not_modified(self):
+        for path in ["/masks/A", "/masks/A/maps/Every",
+                     "/masks/A/maps/Every.png?px=1"]:
+            resp, _ = self.get(path)
+            etag = resp.getheader("ETag")
+            self.assertTrue(etag)
+
+            resp, body = self.get(path, {"If-None-Match": etag})
+            self.assertEqual(resp.status, 304, path)
+            self.assertEqual(body, b"")
+
+            resp, _ = self.get(path, {"If-None-Match": '"other"'})
+            self.assertEqual(resp.status, 200, path)
+
+        # Changing the mask file changes every tag.
+        write_mask(self.mirror, "A", "[Mask]\n; changed\n")
+        resp, _ = self.get("/masks/A", {"If-None-Match": etag})
+        self.assertEqual(resp.status, 200)
+        self.assertNotEqual(resp.getheader("ETag"), etag)
+
+    def test_png_cached(self):
+        _, first = self.get("/masks/A/maps/Every.png?px=1")
+        _, second = self.get("/masks/A/maps/Every.png?px=1")
+        self.assertEqual(first, second)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.get("/masks/A/maps/Every.png?px=2")
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        self.assertEqual(self.loaded, ["A"])
+
+    def test_keep_alive_timeout(self):
+        timeout = server.MapRequestHandler.timeout
+        server.MapRequestHandler.timeout = 0.2
+        try:
+            conn = self.connect()
+            self.get("/masks", conn=conn)
+            sock = conn.sock
+            self.get("/masks", conn=conn)
+            self.assertIs(conn.sock, sock)      # same connection reused
+            # Idle past the timeout: the server closes its end.
+            time.sleep(0.5)
+            sock.settimeout(2)
+            self.assertEqual(sock.recv(1), b"")
+            conn.close()
+        finally:
+            server.MapRequestHandler.timeout = timeout
+
+
+if __name__ == "__main__":
+    unittest.main()
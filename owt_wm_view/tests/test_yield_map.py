@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          test_yield_map.py
+@created:       Mon Oct 19 17:04:52 2026
+
+Description:
+    Unit tests for yield_map.py
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import os.path as osp
+import shutil
+import tempfile
+import unittest
+import warnings
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+from .. import yield_map
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+ROWS = 3
+COLS = 4
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TestYieldAccumulator(unittest.TestCase):
+    """ Per-die pass and test counts """
+
+    def setUp(self):
+        self.acc = yield_map.YieldAccumulator(ROWS, COLS)
+
+    def test_stack(self):
+        self.acc.add_wafer([1, 2], [1, 1], [1, 0])
+        self.acc.add_wafer([1, 2], [1, 1], [1, 1])
+        frac = self.acc.yield_fraction()
+        self.assertEqual(frac.shape, (ROWS, COLS))
+        self.assertEqual(frac[0, 0], 1.0)
+        self.assertEqual(frac[0, 1], 0.5)
+        self.assertTrue(np.isnan(frac[2, 3]))
+        self.assertEqual(self.acc.wafer_count, 2)
+        self.assertEqual(sorted(self.acc.to_xyd()),
+                         [(1, 1, 1.0), (2, 1, 0.5)])
+
+    def test_retest(self):
+        # Die (3, 2) fails then passes on retest; the pass counts.
+        self.acc.add_wafer([3, 1, 3], [2, 1, 2], [0, 0, 1])
+        frac = self.acc.yield_fraction()
+        self.assertEqual(frac[1, 2], 1.0)
+        self.assertEqual(self.acc.tested[1 * COLS + 2], 1)
+        # And the other way around.
+        self.acc.add_wafer([3, 3], [2, 2], [1, 0])
+        self.assertEqual(self.acc.yield_fraction()[1, 2], 0.5)
+        self.assertEqual(self.acc.tested.sum(), 3)
+
+    def test_out_of_grid(self):
+        self.acc.add_wafer([0, COLS + 1, 1, 2, 4],
+                           [1, 1, 0, ROWS + 1, 3],
+                           [1, 1, 1, 1, 0])
+        self.assertEqual(self.acc.tested.sum(), 1)
+        self.assertEqual(self.acc.to_xyd(), [(4, 3, 0.0)])
+
+    def test_empty_wafer(self):
+        self.acc.add_wafer([], [], [])
+        self.assertEqual(self.acc.wafer_count, 1)
+        self.assertEqual(self.acc.tested.sum(), 0)
+        self.assertEqual(self.acc.to_xyd(), [])
+
+
+class TestAccumulateFiles(unittest.TestCase):
+    """ Wafer result files streamed into an accumulator """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _write(self, name, text):
+        path = osp.join(self.tmp, name)
+        with open(path, "w") as openf:
+            openf.write(text)
+        return path
+
+    def test_files(self):
+        paths = [self._write("a.csv", "X,Y,Pass,Bin\n1,1,1,1\n2,1,0,7\n"),
+                 self._write("b.csv", "X,Y,Pass\n1,1,0\n1,1,1\n9,9,1\n"),
+                 ]
+        done = []
+        acc = yield_map.accumulate_files(paths, ROWS, COLS,
+                                         lambda n, path: done.append(n))
+        self.assertEqual(done, [1, 2])
+        self.assertEqual(acc.wafer_count, 2)
+        self.assertEqual(sorted(acc.to_xyd()), [(1, 1, 1.0), (2, 1, 0.0)])
+
+    def test_empty_file(self):
+        paths = [self._write("header.csv", "X,Y,Pass\n"),
+                 self._write("blank.csv", ""),
+                 ]
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            acc = yield_map.accumulate_files(paths, ROWS, COLS)
+        self.assertEqual(acc.wafer_count, 2)
+        self.assertEqual(acc.to_xyd(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          tiles.py
+@created:       Thu Oct 22 13:55:06 2026
+
+Description:
+    Tile pyramid for drawing the die layer of large wafer maps.
+
+    The wafer is cut into TILE_PX square tiles at a few discrete zoom
+    levels, each twice the scale of the one below. A tile is addressed by
+    ``(level, tx, ty)`` and covers the image-space square::
+
+        tx * size <= x < (tx + 1) * size        size = tile_size(level)
+        ty * size <= y < (ty + 1) * size
+
+    in mm from the wafer center, X right and Y *down* (like image rows,
+    see ``render.render_window``). Tiles of one level nest exactly inside
+    the tiles of every coarser level.
+
+    Tiles are rendered with ``render.render_window`` on one worker thread,
+    newest request first. This module doesn't use wx; converting the
+    rendered arrays to bitmaps and drawing them is up to the caller.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import logging
+import math
+import threading
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+try:
+    # Imports used by unit test runners
+    from . import render
+except SystemError:
+    try:
+        # Imports used by Spyder
+        import render
+    except ImportError:
+         # Imports used by cx_freeze
+        from owt_wm_view import render
+
+
+# ---------------------------------------------------------------------------
+### Module Constants
+# ---------------------------------------------------------------------------
+TILE_PX = 256
+BASE_PX_PER_MM = 1.0            # scale of level 0
+N_LEVELS = 8                    # levels 0 to 7: 1 to 128 px/mm
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class TileSource(object):
+    """
+    Everything needed to render the tiles of one map.
+
+    The arrays must not be changed after the source is created; the
+    worker thread reads them without locking.
+
+    Parameters:
+    -----------
+    grid : (rows, cols) bool array
+        Die in the map, indexed ``[row - 1, col - 1]``.
+    die_xy, center_xy : (float, float)
+        The mask's die size and grid center.
+    dia : float
+        Wafer diameter in mm.
+    values, colormap : arrays, optional
+        Per-die colors; see ``render.render_window``.
+    """
+    def __init__(self, grid, die_xy, center_xy, dia, values=None,
+                 colormap=None):
+        self.grid = grid
+        self.die_xy = die_xy
+        self.center_xy = center_xy
+        self.dia = dia
+        self.values = values
+        self.colormap = colormap
+
+    def render(self, key):
+        """ Returns the (TILE_PX, TILE_PX, 3) uint8 image of a tile """
+        level, t_x, t_y = key
+        size = tile_size(level)
+        return render.render_window(self.grid,
+                                    self.die_xy,
+                                    self.center_xy,
+                                    self.dia,
+                                    level_scale(level),
+                                    (t_x * size, t_y * size),
+                                    (TILE_PX, TILE_PX),
+                                    self.values,
+                                    self.colormap,
+                                    outline=False,
+                                    )
+
+
+class TileRenderer(object):
+    """
+    Renders tiles on a worker thread.
+
+    Each ``request`` replaces the list of wanted tiles, so tiles that
+    scrolled out of view before they were rendered are dropped. Finished
+    tiles are passed to ``on_tile(key, generation, rgb)`` on the worker
+    thread; ``generation`` is the value of ``set_source`` that the tile
+    was rendered for.
+    """
+    def __init__(self, on_tile):
+        self.on_tile = on_tile
+        self.generation = 0
+        self._source = None
+        self._wanted = []
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def set_source(self, source):
+        """ Switches to a new TileSource and drops every pending tile """
+        with self._cond:
+            self.generation += 1
+            self._source = source
+            self._wanted = []
+            return self.generation
+
+    def request(self, keys):
+        """ Sets the tiles to render, most wanted first """
+        with self._cond:
+            self._wanted = list(keys)
+            if self._wanted:
+                self._cond.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run,
+                                            name="TileRenderer",
+                                            daemon=True,
+                                            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._wanted or self._source is None:
+                    self._cond.wait()
+                key = self._wanted.pop(0)
+                source = self._source
+                generation = self.generation
+            try:
+                rgb = source.render(key)
+            except Exception:
+                logging.exception("Unable to render tile %s", key)
+                continue
+            self.on_tile(key, generation, rgb)
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def level_scale(level):
+    """ Returns the scale (px/mm) of a zoom level """
+    return BASE_PX_PER_MM * 2 ** level
+
+
+def tile_size(level):
+    """ Returns the width (mm) of a tile at a zoom level """
+    return TILE_PX / level_scale(level)
+
+
+def level_for_scale(px_per_mm):
+    """
+    Returns the zoom level to draw at a display scale.
+
+    That's the coarsest level at least as fine as the display, so tiles
+    are only ever shrunk (by up to 2x) unless the display is finer than
+    the finest level.
+    """
+    if px_per_mm <= BASE_PX_PER_MM:
+        return 0
+    level = int(math.ceil(math.log2(px_per_mm / BASE_PX_PER_MM) - 1e-9))
+    return min(level, N_LEVELS - 1)
+
+
+def parent_tile(key, level):
+    """ Returns the tile at a coarser ``level`` that contains ``key`` """
+    child_level, t_x, t_y = key
+    factor = 2 ** (child_level - level)
+    return (level, t_x // factor, t_y // factor)
+
+
+def visible_tiles(level, x_range, y_range, dia):
+    """
+    Returns the tiles of a level that cover a window, center out.
+
+    Parameters:
+    -----------
+    level : int
+    x_range, y_range : (float, float)
+        The window, in mm from the wafer center (Y down).
+    dia : float
+        Wafer diameter in mm; nothing outside the wafer's square (plus
+        ``render.MARGIN_MM``) is returned.
+    """
+    half = dia / 2 + render.MARGIN_MM
+    x_min = max(min(x_range), -half)
+    x_max = min(max(x_range), half)
+    y_min = max(min(y_range), -half)
+    y_max = min(max(y_range), half)
+    if x_min >= x_max or y_min >= y_max:
+        return []
+
+    size = tile_size(level)
+    t_x = np.arange(math.floor(x_min / size), math.floor(x_max / size) + 1)
+    t_y = np.arange(math.floor(y_min / size), math.floor(y_max / size) + 1)
+    t_x, t_y = np.meshgrid(t_x, t_y)
+    t_x = t_x.ravel()
+    t_y = t_y.ravel()
+    dist = np.hypot((t_x + 0.5) * size - (x_min + x_max) / 2,
+                    (t_y + 0.5) * size - (y_min + y_max) / 2)
+    order = np.argsort(dist, kind='stable')
+    return [(level, _x, _y)
+            for _x, _y in zip(t_x[order].tolist(), t_y[order].tolist())]
+
+
+def all_tiles(level, dia):
+    """ Returns every tile of a level that touches the wafer's square """
+    half = dia / 2 + render.MARGIN_MM
+    return visible_tiles(level, (-half, half), (-half, half), dia)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          yield_map.py
+@created:       Mon Oct 19 09:12:41 2026
+
+Description:
+    Stacked multi-wafer yield accumulation.
+
+    Pass/fail results are streamed in one wafer at a time and accumulated
+    into per-die counters over the mask's Rows x Cols grid. Only the two
+    counter arrays are ever held in memory, so any number of wafers can be
+    combined.
+
+    Wafer result files are plain CSV with a single header line and (at
+    least) the columns ``X, Y, Pass``. X and Y are the 1-indexed grid
+    coordinates (same as the xyd list used by the viewer) and Pass is
+    1 for a passing die and 0 for a failing die.
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import warnings
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class YieldAccumulator(object):
+    """
+    Accumulates per-die pass and test counts across many wafers.
+
+    Parameters:
+    -----------
+    rows : int
+        The number of rows on the mask (the ``Rows`` mask value).
+    cols : int
+        The number of columns on the mask (the ``Cols`` mask value).
+    """
+    def __init__(self, rows, cols):
+        self.rows = int(rows)
+        self.cols = int(cols)
+        self.size = self.rows * self.cols
+        self.tested = np.zeros(self.size, dtype=np.int64)
+        self.passed = np.zeros(self.size, dtype=np.int64)
+        self.wafer_count = 0
+
+    def add_wafer(self, x, y, passed):
+        """
+        Adds a single wafer's results to the counters.
+
+        Die outside of the Rows x Cols grid are ignored. If a die shows up
+        more than once (a retest), only the last result is counted.
+
+        Parameters:
+        -----------
+        x, y : array-like of int
+            The 1-indexed grid coordinates of each tested die.
+        passed : array-like of bool or int
+            Non-zero if the die passed.
+
+        Returns:
+        --------
+        None
+        """
+        x = np.asarray(x, dtype=np.intp)
+        y = np.asarray(y, dtype=np.intp)
+        passed = np.asarray(passed) != 0
+
+        in_grid = (x >= 1) & (x <= self.cols) & (y >= 1) & (y <= self.rows)
+        flat = (y[in_grid] - 1) * self.cols + (x[in_grid] - 1)
+        passed = passed[in_grid]
+
+        # Keep the last result for each die: reverse and take the first.
+        flat, first = np.unique(flat[::-1], return_index=True)
+        passed = passed[::-1][first]
+
+        self.tested += np.bincount(flat, minlength=self.size)
+        self.passed += np.bincount(flat[passed], minlength=self.size)
+        self.wafer_count += 1
+
+    def yield_fraction(self):
+        """
+        Returns the per-die yield as a (rows, cols) float array.
+
+        Die that were never tested are NaN.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac = self.passed / self.tested
+        frac[self.tested == 0] = np.nan
+        return frac.reshape(self.rows, self.cols)
+
+    def to_xyd(self):
+        """
+        Returns the yield as an xyd list for ``wm_core.WaferMapPanel``.
+
+        Only die that were tested at least once are included.
+        """
+        frac = self.yield_fraction()
+        rows, cols = np.nonzero(~np.isnan(frac))
+        return [(int(_c) + 1, int(_r) + 1, float(frac[_r, _c]))
+                for _r, _c in zip(rows, cols)]
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def read_wafer_results(path):
+    """
+    Reads a single wafer result file.
+
+    Parameters:
+    -----------
+    path : str
+        Path to a CSV file with ``X, Y, Pass`` as the first three columns.
+
+    Returns:
+    --------
+    (x, y, passed) : tuple of 1D numpy arrays
+        Empty if the file has no results.
+    """
+    with warnings.catch_warnings():
+        # A file with no results is a wafer with nothing tested.
+        warnings.filterwarnings("ignore", "loadtxt: input contained no data")
+        data = np.loadtxt(path,
+                          delimiter=",",
+                          skiprows=1,
+                          usecols=(0, 1, 2),
+                          dtype=np.int64,
+                          ndmin=2,
+                          )
+    return data[:, 0], data[:, 1], data[:, 2]
+
+
+def accumulate_files(paths, rows, cols, progress=None):
+    """
+    Streams wafer result files into a new YieldAccumulator.
+
+    Files are read and accumulated one at a time so that memory use does
+    not depend on the number of wafers.
+
+    Parameters:
+    -----------
+    paths : iterable of str
+        The wafer result files.
+    rows, cols : int
+        The mask grid size.
+    progress : callable, optional
+        Called as ``progress(n_done, path)`` after each file.
+
+    Returns:
+    --------
+    acc : YieldAccumulator
+    """
+    acc = YieldAccumulator(rows, cols)
+    for n, path in enumerate(paths, 1):
+        acc.add_wafer(*read_wafer_results(path))
+        if progress is not None:
+            progress(n, path)
+    return acc
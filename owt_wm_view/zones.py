@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+@name:          zones.py
+@created:       Mon Oct 19 20:31:48 2026
+
+Description:
+    Concentric-ring and angular-sector zone analysis.
+
+    All functions work on whole arrays of die coordinates. Die positions
+    are the physical offsets from ``geometry.die_offsets``; angles are
+    degrees counter-clockwise from +X, in [0, 360).
+"""
+
+# ---------------------------------------------------------------------------
+### Imports
+# ---------------------------------------------------------------------------
+# Standard Library
+import math
+
+# Third-Party
+import numpy as np
+
+# Package / Application
+
+
+# ---------------------------------------------------------------------------
+### Classes
+# ---------------------------------------------------------------------------
+class ZoneAnalysis(object):
+    """
+    Ring, sector and ring x sector zone assignment for a set of die.
+
+    Parameters:
+    -----------
+    radius : (n,) float array
+        Distance of each die from the wafer center.
+    angle : (n,) float array
+        Angle of each die in degrees.
+    dia : float
+        Wafer diameter in mm.
+    n_rings, n_sectors : int
+        Number of equal-area rings and of angular sectors.
+    """
+    def __init__(self, radius, angle, dia, n_rings, n_sectors):
+        self.n_rings = n_rings
+        self.n_sectors = n_sectors
+        self.ring_edges = equal_area_edges(dia, n_rings)
+        self.sector_edges = sector_edges(n_sectors)
+        self.radius = np.asarray(radius, dtype=float)
+        self.angle = np.asarray(angle, dtype=float)
+        self.ring_idx = bin_index(self.radius, self.ring_edges)
+        self.sector_idx = bin_index(self.angle, self.sector_edges)
+
+    def ring_counts(self):
+        """ Returns the die count in each ring """
+        keep = self.ring_idx >= 0
+        return np.bincount(self.ring_idx[keep], minlength=self.n_rings)
+
+    def sector_counts(self):
+        """ Returns the die count in each sector """
+        keep = self.sector_idx >= 0
+        return np.bincount(self.sector_idx[keep], minlength=self.n_sectors)
+
+    def matrix(self):
+        """ Returns the (n_rings, n_sectors) die count matrix """
+        return zone_matrix(self.ring_idx, self.sector_idx,
+                           self.n_rings, self.n_sectors)
+
+    def die_in(self, ring=None, sector=None):
+        """ Returns a bool array of the die in a ring, a sector, or both """
+        mask = np.ones(self.radius.shape, dtype=bool)
+        if ring is not None:
+            mask &= self.ring_idx == ring
+        if sector is not None:
+            mask &= self.sector_idx == sector
+        return mask
+
+
+# ---------------------------------------------------------------------------
+### Functions
+# ---------------------------------------------------------------------------
+def equal_area_edges(dia, n_rings):
+    """
+    Returns ring edges that split a wafer into ``n_rings`` equal areas.
+
+    Returns:
+    --------
+    edges : (n_rings + 1,) float array
+        From 0 to ``dia / 2``.
+    """
+    return (dia / 2) * np.sqrt(np.arange(n_rings + 1) / n_rings)
+
+
+def fixed_area_edges(dia, area):
+    """
+    Returns ring edges with each ring having ``area`` mm^2.
+
+    The last edge is the first one at or beyond the wafer edge, so the
+    outer ring may extend past the wafer.
+    """
+    n_rings = max(int(math.ceil(math.pi * (dia / 2)**2 / area - 1e-9)), 1)
+    return np.sqrt(np.arange(n_rings + 1) * area / math.pi)
+
+
+def sector_edges(n_sectors):
+    """ Returns the sector edges in degrees, 0 to 360 """
+    return np.linspace(0, 360, n_sectors + 1)
+
+
+def die_angle(dx, dy):
+    """ Returns the angle of each die, degrees in [0, 360) """
+    return np.degrees(np.arctan2(dy, dx)) % 360
+
+
+def bin_index(values, edges):
+    """
+    Returns the bin of each value for the given (sorted) edges.
+
+    Bins are ``edges[i] <= v < edges[i + 1]``, except that the last bin
+    also includes its upper edge. Values outside all bins get -1.
+    """
+    values = np.asarray(values, dtype=float)
+    idx = np.searchsorted(edges, values, side='right') - 1
+    n_bins = len(edges) - 1
+    idx[values == edges[-1]] = n_bins - 1
+    idx[(idx < 0) | (idx >= n_bins)] = -1
+    return idx
+
+
+def zone_matrix(ring_idx, sector_idx, n_rings, n_sectors, weights=None):
+    """
+    Counts die in every (ring, sector) zone.
+
+    Die with a ring or sector index of -1 are ignored.
+
+    Returns:
+    --------
+    matrix : (n_rings, n_sectors) array
+        Die counts, or summed ``weights`` if given.
+    """
+    ring_idx = np.asarray(ring_idx)
+    sector_idx = np.asarray(sector_idx)
+    keep = (ring_idx >= 0) & (sector_idx >= 0)
+    flat = ring_idx[keep] * n_sectors + sector_idx[keep]
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)[keep]
+    counts = np.bincount(flat, weights=weights, minlength=n_rings * n_sectors)
+    return counts.reshape(n_rings, n_sectors)